@@ -1,18 +1,24 @@
 """
 Build Index Script for Resonance Archive System.
 
-Phase 1 統合スクリプト: VaultScanner → MultilevelVectorizer → ChromaDBIndexer
+Phase 1 統合スクリプト: VaultScanner → IndexPipeline (MultilevelVectorizer → ChromaDBIndexer)
 """
 import logging
+import os
 import time
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import psutil
 from tqdm import tqdm
 
 from src.phase1_archive_sync.vault_scanner import VaultScanner
 from src.phase1_archive_sync.multilevel_vectorizer import MultilevelVectorizer
 from src.phase1_archive_sync.chromadb_indexer import ChromaDBIndexer
+from src.phase1_archive_sync.index_manifest import IndexManifest
+from src.phase1_archive_sync.index_pipeline import IndexPipeline, PipelineConfig
+from src.phase2_realtime_analysis.numpy_vector_index import NumpyVectorIndex
+from src.utils.embedding_cache import EmbeddingCache
+from src.utils.ollama_client import OllamaClient
 
 logger = logging.getLogger(__name__)
 
@@ -20,7 +26,12 @@ logger = logging.getLogger(__name__)
 def build_index(
     vault_root: str,
     db_path: str = "./.chroma_db",
-    show_progress: bool = True
+    show_progress: bool = True,
+    incremental: bool = True,
+    pipeline_config: Optional[PipelineConfig] = None,
+    summaries_only: bool = False,
+    split_levels: Optional[bool] = None,
+    snapshot_dir: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     Phase 1全体のインデックス構築を実行
@@ -29,14 +40,24 @@ def build_index(
         vault_root: Obsidian Vaultのルートパス
         db_path: ChromaDB永続化ディレクトリパス (default: ./.chroma_db)
         show_progress: 進捗表示の有効/無効 (default: True)
+        incremental: 未変更ファイルをスキップし、新規/変更ファイルのみ処理する (default: True)
+        pipeline_config: 各ステージの並列度設定 (default: PipelineConfig())
+        summaries_only: 未生成のLevel 1要約のみを生成する (default: False)
+        split_levels: 要約とチャンクを別コレクションに格納する。既存の単一コレクションは移行される。
+            Noneの場合はDBの既存の構成に従う (default: None)
+        snapshot_dir: 指定時、構築後のベクトルをメモリマップ可能なスナップショットとして書き出す (default: None)
 
     Returns:
         統計情報:
             - files_scanned: スキャンされたファイル数
             - files_processed: 処理されたファイル数
+            - files_skipped: 未変更のためスキップされたファイル数
+            - files_removed: Vaultから削除されたファイル数
+            - vectors_deleted: 削除されたベクトル数（削除/変更ファイル分）
             - vectors_generated: 生成されたベクトル総数
             - level1_count: Level 1ベクトル数（要約）
             - level2_count: Level 2ベクトル数（チャンク）
+            - summaries_pending: 要約が未生成のファイル数
             - elapsed_time: 処理時間（秒）
             - memory_peak_mb: ピークメモリ使用量（MB）
     """
@@ -47,8 +68,12 @@ def build_index(
     # Statistics
     files_scanned = 0
     files_processed = 0
+    files_skipped = 0
+    files_removed = 0
+    vectors_deleted = 0
     level1_count = 0
     level2_count = 0
+    summaries_pending = 0
 
     try:
         # Step 1: Scan vault
@@ -70,69 +95,100 @@ def build_index(
             return {
                 'files_scanned': 0,
                 'files_processed': 0,
+                'files_skipped': 0,
+                'files_removed': 0,
+                'vectors_deleted': 0,
                 'vectors_generated': 0,
                 'level1_count': 0,
                 'level2_count': 0,
+                'summaries_pending': 0,
                 'elapsed_time': time.time() - start_time,
                 'memory_peak_mb': memory_peak
             }
 
         # Step 2: Initialize components
-        vectorizer = MultilevelVectorizer()
-        indexer = ChromaDBIndexer(persist_directory=db_path)
+        pipeline_config = pipeline_config or PipelineConfig()
+        # One pooled client shared by all embedding and summary workers
+        ollama_client = OllamaClient(
+            pool_maxsize=pipeline_config.embed_workers + pipeline_config.summary_workers
+        )
+        embedding_cache = EmbeddingCache(os.path.join(db_path, EmbeddingCache.CACHE_FILENAME))
+        vectorizer = MultilevelVectorizer(ollama_client=ollama_client, embedding_cache=embedding_cache)
+        indexer = ChromaDBIndexer(persist_directory=db_path, split_levels=split_levels)
+
+        manifest = IndexManifest(os.path.join(db_path, IndexManifest.MANIFEST_FILENAME))
+        manifest.load()
+
+        # Step 3: Remove vectors of files that no longer exist in the vault
+        relative_paths = {
+            file_path: str(Path(file_path).relative_to(vault_root)) for file_path in file_paths
+        }
+        if not summaries_only:
+            current_paths = set(relative_paths.values())
+            for removed_path in sorted(manifest.paths() - current_paths):
+                entry = manifest.remove(removed_path)
+                vectors_deleted += indexer.delete_vectors(entry.chunk_ids)
+                files_removed += 1
+
+        # Step 4: Process new/changed files (or pending summaries) through the concurrent pipeline
+        if summaries_only:
+            total = sum(
+                1 for relative_path in relative_paths.values()
+                if manifest.get(relative_path) and manifest.get(relative_path).summary_pending
+            )
+            description = "Generating summaries"
+        else:
+            total = files_scanned
+            description = "Vectorizing files"
 
-        # Step 3: Process files
         if show_progress:
             print("🔄 Processing files and generating vectors...\n")
 
-        all_records = []
-        iterator = tqdm(file_paths, desc="Vectorizing files", disable=not show_progress)
-
-        for file_path in iterator:
-            try:
-                # Read file
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    text = f.read()
-
-                # Get relative path from vault root
-                relative_path = str(Path(file_path).relative_to(vault_root))
-
-                # Vectorize
-                records = vectorizer.vectorize(text=text, file_path=relative_path)
-
-                if records:
-                    all_records.extend(records)
-                    files_processed += 1
-
-                    # Count by level
-                    for record in records:
-                        if record.metadata['level'] == 1:
-                            level1_count += 1
-                        else:
-                            level2_count += 1
-
-                    # Update memory peak
-                    current_memory = process.memory_info().rss / 1024 / 1024
-                    memory_peak = max(memory_peak, current_memory)
-
-            except Exception:
-                logger.exception(f"Error processing {file_path}")
-                continue
-
-        # Step 4: Batch insert to ChromaDB
-        if all_records:
-            if show_progress:
-                print(f"\n💾 Indexing {len(all_records)} vectors to ChromaDB...\n")
-
-            result = indexer.add_vectors_batch(
-                records=all_records,
-                show_progress=show_progress
-            )
-
-            if show_progress:
-                print(f"\n✅ Successfully indexed {result['success']} vectors")
-                if result['failed'] > 0:
-                    print(f"⚠️  Failed to index {result['failed']} vectors")
+        progress = tqdm(total=total, desc=description, disable=not show_progress)
+
+        def on_file_done() -> None:
+            nonlocal memory_peak
+            progress.update(1)
+            # Update memory peak
+            current_memory = process.memory_info().rss / 1024 / 1024
+            memory_peak = max(memory_peak, current_memory)
+
+        pipeline = IndexPipeline(
+            vectorizer=vectorizer,
+            indexer=indexer,
+            manifest=manifest,
+            config=pipeline_config,
+            incremental=incremental,
+            on_file_done=on_file_done
+        )
+        try:
+            if summaries_only:
+                pipeline_stats = pipeline.run_summaries(relative_paths)
+            else:
+                pipeline_stats = pipeline.run(relative_paths)
+        finally:
+            progress.close()
+            # Step 5: Persist vectors, then record indexed files (also after a partial run)
+            indexer.close()
+            manifest.save()
+            embedding_cache.close()
+            ollama_client.close()
+
+        files_processed = pipeline_stats['files_processed']
+        files_skipped = pipeline_stats['files_skipped']
+        vectors_deleted += pipeline_stats['vectors_deleted']
+        level1_count = pipeline_stats['level1_count']
+        level2_count = pipeline_stats['level2_count']
+        summaries_pending = pipeline_stats['summaries_pending']
+
+        if show_progress and pipeline_stats['vectors_failed'] > 0:
+            print(f"\n⚠️  Failed to index {pipeline_stats['vectors_failed']} vectors")
+
+        # Step 6: Export a snapshot for fast realtime searcher start-up
+        if snapshot_dir:
+            vector_index = NumpyVectorIndex()
+            vector_index.load(indexer)
+            vector_index.save_snapshot(snapshot_dir)
 
         # Final statistics
         elapsed_time = time.time() - start_time
@@ -144,19 +200,35 @@ def build_index(
             print(f"{'='*60}")
             print(f"Files scanned:       {files_scanned}")
             print(f"Files processed:     {files_processed}")
+            print(f"Files skipped:       {files_skipped}")
+            print(f"Files removed:       {files_removed}")
+            print(f"Vectors deleted:     {vectors_deleted}")
+            print(f"Embedding cache:     {embedding_cache.hits} hits / {embedding_cache.misses} misses")
             print(f"Vectors generated:   {vectors_generated}")
             print(f"  - Level 1 (summary): {level1_count}")
             print(f"  - Level 2 (chunks):  {level2_count}")
+            print(f"Summaries pending:   {summaries_pending}")
             print(f"Elapsed time:        {elapsed_time:.2f} seconds")
             print(f"Memory peak:         {memory_peak:.2f} MB")
+            print("Stage throughput:")
+            for stage in pipeline_stats['stages']:
+                print(
+                    f"  - {stage.name:<9} x{stage.workers}: "
+                    f"{stage.items_per_second(pipeline_stats['elapsed_time']):6.2f} files/s, "
+                    f"{stage.utilization(pipeline_stats['elapsed_time']):5.1%} busy"
+                )
             print(f"{'='*60}\n")
 
         return {
             'files_scanned': files_scanned,
             'files_processed': files_processed,
+            'files_skipped': files_skipped,
+            'files_removed': files_removed,
+            'vectors_deleted': vectors_deleted,
             'vectors_generated': vectors_generated,
             'level1_count': level1_count,
             'level2_count': level2_count,
+            'summaries_pending': summaries_pending,
             'elapsed_time': elapsed_time,
             'memory_peak_mb': memory_peak
         }
@@ -166,9 +238,13 @@ def build_index(
         return {
             'files_scanned': files_scanned,
             'files_processed': files_processed,
+            'files_skipped': files_skipped,
+            'files_removed': files_removed,
+            'vectors_deleted': vectors_deleted,
             'vectors_generated': level1_count + level2_count,
             'level1_count': level1_count,
             'level2_count': level2_count,
+            'summaries_pending': summaries_pending,
             'elapsed_time': time.time() - start_time,
             'memory_peak_mb': memory_peak
         }
@@ -180,5 +256,21 @@ if __name__ == "__main__":
     # Simple CLI interface
     vault_root = sys.argv[1] if len(sys.argv) > 1 else "."
     db_path = sys.argv[2] if len(sys.argv) > 2 else "./.chroma_db"
-
-    build_index(vault_root=vault_root, db_path=db_path, show_progress=True)
+    options = sys.argv[3:]
+    incremental = "--full" not in options
+    # --defer-summaries: index chunks only; --summaries: generate the deferred summaries
+    pipeline_config = PipelineConfig(defer_summaries="--defer-summaries" in options)
+    # --split-levels: per-level collections (migrates an existing single collection);
+    # without it, the layout the database already has is kept
+    # --snapshot: export a memory-mappable snapshot to <db_path>/snapshot
+
+    build_index(
+        vault_root=vault_root,
+        db_path=db_path,
+        show_progress=True,
+        incremental=incremental,
+        pipeline_config=pipeline_config,
+        summaries_only="--summaries" in options,
+        split_levels=True if "--split-levels" in options else None,
+        snapshot_dir=os.path.join(db_path, "snapshot") if "--snapshot" in options else None
+    )
@@ -5,7 +5,9 @@ This module provides a wrapper around ChromaDB for vector storage and retrieval.
 """
 import logging
 import os
-from typing import List, Dict, Any, Optional, TYPE_CHECKING
+import threading
+import time
+from typing import Iterable, List, Dict, Any, Optional, TYPE_CHECKING
 import chromadb
 from chromadb.config import Settings
 from tqdm import tqdm
@@ -17,16 +19,70 @@ logger = logging.getLogger(__name__)
 
 
 class ChromaDBIndexer:
-    """ChromaDB indexer for storing and retrieving semantic vectors."""
-
-    def __init__(self, persist_directory: str = "./.chroma_db"):
+    """
+    ChromaDB indexer for storing and retrieving semantic vectors.
+
+    Persistence is write-behind: chromadb 0.3.x rewrites the whole parquet
+    store on every persist(), so writes are persisted when nothing has been
+    persisted for persist_interval_seconds, after persist_every_batches
+    unpersisted writes, and on flush()/close(). Use the indexer as a context
+    manager (or call close()) to persist the trailing writes.
+
+    With split_levels, summaries and chunks live in separate collections so
+    that each level is searched in its own, smaller HNSW index without a
+    metadata filter.
+
+    A chromadb 0.3.x client shares one duckdb connection and is not
+    thread-safe; every call into the client holds client_lock, and other
+    readers of the collections (SimilaritySearcher, NumpyVectorIndex) take
+    the same lock. Listeners are notified while the lock is still held, so
+    a reader holding it sees the collections and their mirrors agree.
+    """
+
+    LEGACY_COLLECTION = "resonance_archive"
+    LEVEL_COLLECTIONS = {
+        "summary": "resonance_archive_summary",
+        "chunk": "resonance_archive_chunk",
+    }
+
+    def __init__(
+        self,
+        persist_directory: str = "./.chroma_db",
+        persist_every_batches: int = 10,
+        persist_interval_seconds: float = 30.0,
+        split_levels: Optional[bool] = None,
+        migration_batch_size: int = 500
+    ):
         """
         Initialize ChromaDB indexer with persistence.
 
         Args:
             persist_directory: Directory path for ChromaDB persistence (default: ./.chroma_db)
+            persist_every_batches: Persist after this many unpersisted writes (default: 10)
+            persist_interval_seconds: Persist a write if the last persist is older than this (default: 30.0)
+            split_levels: Store summaries and chunks in separate collections; vectors of an
+                existing resonance_archive collection are moved over. None uses the
+                layout the database already has, per-level if its collections exist
+                (default: None)
+            migration_batch_size: Vectors moved per step of that migration (default: 500)
+
+        Raises:
+            ValueError: If split_levels is False but the database has per-level collections
+
+        Note:
+            With split_levels, collection is None and level_collections maps
+            "summary"/"chunk" to their collections; otherwise level_collections
+            is empty and everything lives in collection.
         """
         self.persist_directory = persist_directory
+        self.persist_every_batches = persist_every_batches
+        self.persist_interval_seconds = persist_interval_seconds
+        self.persist_count = 0
+        self._dirty_batches = 0
+        self._last_persist_time: Optional[float] = None
+
+        # Serializes all access to the ChromaDB client (reentrant for nested calls)
+        self.client_lock = threading.RLock()
 
         # Create directory if it doesn't exist
         os.makedirs(persist_directory, exist_ok=True)
@@ -38,11 +94,38 @@ class ChromaDBIndexer:
             persist_directory=persist_directory
         ))
 
-        # Get or create collection
-        self.collection = self.client.get_or_create_collection(
-            name="resonance_archive",
-            metadata={"description": "Semantic vectors for Obsidian vault archive"}
-        )
+        # The layout is detected from the stored collections, so a run that
+        # omits split_levels does not start an empty single collection
+        names = {collection.name for collection in self.client.list_collections()}
+        has_level_collections = any(name in names for name in self.LEVEL_COLLECTIONS.values())
+        if split_levels is None:
+            split_levels = has_level_collections
+        elif not split_levels and has_level_collections:
+            raise ValueError(
+                f"{persist_directory} stores vectors in per-level collections; "
+                "open it with split_levels=True"
+            )
+
+        self.split_levels = split_levels
+        self.level_collections: Dict[str, Any] = {}
+        self._listeners: List[Any] = []
+        self.migrated_count = 0
+
+        if not split_levels:
+            # Get or create collection
+            self.collection = self.client.get_or_create_collection(
+                name=self.LEGACY_COLLECTION,
+                metadata={"description": "Semantic vectors for Obsidian vault archive"}
+            )
+            return
+
+        self.collection = None
+        for level, name in self.LEVEL_COLLECTIONS.items():
+            self.level_collections[level] = self.client.get_or_create_collection(
+                name=name,
+                metadata={"description": f"Level {level} vectors for Obsidian vault archive"}
+            )
+        self.migrated_count = self._migrate_legacy_collection(migration_batch_size)
 
     def add_vector(
         self,
@@ -63,13 +146,14 @@ class ChromaDBIndexer:
                 - char_count: Character count (for summary type)
                 - chunk_index: Chunk index (for chunk type)
         """
-        self.collection.add(
-            ids=[id],
-            embeddings=[vector],
-            metadatas=[metadata]
-        )
-        # Persist data to disk
-        self.client.persist()
+        with self.client_lock:
+            self._collection_for(metadata).add(
+                ids=[id],
+                embeddings=[vector],
+                metadatas=[metadata]
+            )
+            self._mark_written()
+            self._notify('upsert', [id], [vector], [metadata])
 
     def search(
         self,
@@ -86,26 +170,69 @@ class ChromaDBIndexer:
         Returns:
             List of result dictionaries with keys: id, distance, metadata
         """
-        results = self.collection.query(
-            query_embeddings=[query_vector],
-            n_results=top_k
-        )
-
-        # Format results
         formatted_results = []
-        if results["ids"] and len(results["ids"]) > 0:
-            for i in range(len(results["ids"][0])):
-                formatted_results.append({
-                    "id": results["ids"][0][i],
-                    "distance": results["distances"][0][i] if "distances" in results else None,
-                    "metadata": results["metadatas"][0][i] if "metadatas" in results else {}
-                })
+        with self.client_lock:
+            for collection in self.all_collections():
+                # chromadb 0.3.x raises if n_results exceeds the collection size
+                n_results = min(top_k, collection.count())
+                if n_results == 0:
+                    continue
+
+                results = collection.query(
+                    query_embeddings=[query_vector],
+                    n_results=n_results
+                )
+
+                # Format results
+                if results["ids"] and len(results["ids"]) > 0:
+                    for i in range(len(results["ids"][0])):
+                        formatted_results.append({
+                            "id": results["ids"][0][i],
+                            "distance": results["distances"][0][i] if "distances" in results else None,
+                            "metadata": results["metadatas"][0][i] if "metadatas" in results else {}
+                        })
+
+        # Merge levels by distance when they are stored separately
+        formatted_results.sort(key=lambda result: result["distance"])
+        return formatted_results[:top_k]
+
+    def count(self) -> int:
+        """
+        Count stored vectors.
+
+        Returns:
+            Number of vectors across all collections in use
+        """
+        with self.client_lock:
+            return sum(collection.count() for collection in self.all_collections())
+
+    def delete_vectors(self, ids: List[str]) -> int:
+        """
+        Delete vectors by ID.
 
-        return formatted_results
+        Args:
+            ids: List of vector IDs to delete
+
+        Returns:
+            Number of IDs requested for deletion
+
+        Note:
+            An empty list is a no-op (ChromaDB treats ids=None/[] as "delete all").
+        """
+        if not ids:
+            return 0
+
+        # IDs do not encode the level, so split collections are all asked
+        with self.client_lock:
+            for collection in self.all_collections():
+                collection.delete(ids=ids)
+            self._mark_written()
+            self._notify('delete', ids)
+        return len(ids)
 
     def add_vectors_batch(
         self,
-        records: List['EmbeddingRecord'],
+        records: Iterable['EmbeddingRecord'],
         batch_size: int = 100,
         show_progress: bool = True
     ) -> Dict[str, Any]:
@@ -113,7 +240,9 @@ class ChromaDBIndexer:
         Add multiple vectors in batches with progress tracking.
 
         Args:
-            records: List of EmbeddingRecord objects to index
+            records: EmbeddingRecord objects to index. Any iterable is accepted;
+                     records are consumed lazily, so a generator streams into
+                     ChromaDB with at most batch_size records held here
             batch_size: Number of vectors to add per batch (default: 100)
             show_progress: Show tqdm progress bar (default: True)
 
@@ -205,10 +334,161 @@ class ChromaDBIndexer:
             embeddings: List of embedding vectors
             metadatas: List of metadata dictionaries
         """
-        self.collection.add(
-            ids=ids,
-            embeddings=embeddings,
-            metadatas=metadatas
+        if not self.split_levels:
+            # upsert keeps re-runs of an interrupted build idempotent
+            # (chunk IDs are content-addressed)
+            with self.client_lock:
+                self.collection.upsert(
+                    ids=ids,
+                    embeddings=embeddings,
+                    metadatas=metadatas
+                )
+                self._mark_written()
+                self._notify('upsert', ids, embeddings, metadatas)
+            return
+
+        # Partition the batch by level, keeping one upsert per collection
+        partitions: Dict[str, Dict[str, list]] = {}
+        for id, embedding, metadata in zip(ids, embeddings, metadatas):
+            level = self._level_of(metadata)
+            partition = partitions.setdefault(level, {'ids': [], 'embeddings': [], 'metadatas': []})
+            partition['ids'].append(id)
+            partition['embeddings'].append(embedding)
+            partition['metadatas'].append(metadata)
+
+        with self.client_lock:
+            for level, partition in partitions.items():
+                self.level_collections[level].upsert(**partition)
+            self._mark_written()
+            self._notify('upsert', ids, embeddings, metadatas)
+
+    def add_listener(self, listener) -> None:
+        """
+        Register an object notified of every write, e.g. an in-memory mirror.
+
+        Args:
+            listener: Object with upsert(ids, embeddings, metadatas) and delete(ids)
+        """
+        self._listeners.append(listener)
+
+    def flush(self) -> None:
+        """Persist all unpersisted writes to disk."""
+        with self.client_lock:
+            if self._dirty_batches == 0:
+                return
+
+            self.client.persist()
+            self._dirty_batches = 0
+            self._last_persist_time = time.monotonic()
+            self.persist_count += 1
+
+    def close(self) -> None:
+        """Persist pending writes. The indexer stays usable afterwards."""
+        self.flush()
+
+    def __enter__(self) -> 'ChromaDBIndexer':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def _notify(self, method: str, *args) -> None:
+        """
+        Forward a completed write to the listeners (caller holds client_lock).
+
+        Args:
+            method: Listener method name ('upsert' or 'delete')
+            *args: Arguments of the write
+        """
+        for listener in self._listeners:
+            try:
+                getattr(listener, method)(*args)
+            except Exception:
+                logger.exception(f"Indexer listener {listener!r} failed on {method}")
+
+    def all_collections(self) -> List[Any]:
+        """Return the collections in use (the per-level ones, or the single one)."""
+        if self.split_levels:
+            return list(self.level_collections.values())
+        return [self.collection]
+
+    def _level_of(self, metadata: Dict[str, Any]) -> str:
+        """
+        Get the level of a vector from its metadata.
+
+        Args:
+            metadata: Vector metadata
+
+        Returns:
+            "summary" or "chunk"
+
+        Raises:
+            ValueError: If metadata type is not a known level
+        """
+        level = metadata.get("type")
+        if level not in self.LEVEL_COLLECTIONS:
+            raise ValueError(f"Unknown vector type: {level!r}")
+        return level
+
+    def _collection_for(self, metadata: Dict[str, Any]):
+        """
+        Get the collection a vector is stored in.
+
+        Args:
+            metadata: Vector metadata
+
+        Returns:
+            ChromaDB collection
+        """
+        if not self.split_levels:
+            return self.collection
+        return self.level_collections[self._level_of(metadata)]
+
+    def _migrate_legacy_collection(self, batch_size: int) -> int:
+        """
+        Move vectors from the single legacy collection into the per-level collections.
+
+        Args:
+            batch_size: Vectors moved per step
+
+        Returns:
+            Number of vectors moved
+
+        Note:
+            Each step upserts a batch into the level collections, persists, and
+            only then deletes it from the legacy collection, so an interrupted
+            migration resumes on the next start without losing vectors. The
+            empty legacy collection is dropped at the end.
+        """
+        names = {collection.name for collection in self.client.list_collections()}
+        if self.LEGACY_COLLECTION not in names:
+            return 0
+
+        legacy = self.client.get_collection(name=self.LEGACY_COLLECTION)
+        moved = 0
+        while True:
+            batch = legacy.get(limit=batch_size, include=["embeddings", "metadatas"])
+            if not batch["ids"]:
+                break
+
+            self._insert_batch(batch["ids"], batch["embeddings"], batch["metadatas"])
+            self.flush()
+            legacy.delete(ids=batch["ids"])
+            moved += len(batch["ids"])
+
+        self.client.delete_collection(name=self.LEGACY_COLLECTION)
+        self._mark_written()
+        self.flush()
+        logger.info(f"Migrated {moved} vectors into per-level collections")
+        return moved
+
+    def _mark_written(self) -> None:
+        """Record a write and persist it if the persistence policy requires."""
+        self._dirty_batches += 1
+
+        interval_elapsed = (
+            self._last_persist_time is None or
+            time.monotonic() - self._last_persist_time >= self.persist_interval_seconds
         )
-        # Persist data to disk
-        self.client.persist()
+        if interval_elapsed or self._dirty_batches >= self.persist_every_batches:
+            self.flush()
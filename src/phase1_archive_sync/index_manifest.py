@@ -0,0 +1,157 @@
+"""
+Index Manifest for Resonance Archive System.
+
+Tracks which vault files have been indexed (path, mtime, size, content hash and
+emitted chunk IDs) so that index rebuilds only process new or changed files.
+"""
+import hashlib
+import json
+import logging
+import os
+from dataclasses import dataclass, field, asdict
+from typing import Dict, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ManifestEntry:
+    """Represents the indexed state of a single vault file."""
+    path: str  # File path relative to vault root
+    mtime: float  # os.stat().st_mtime at indexing time
+    size: int  # File size in bytes at indexing time
+    content_hash: str  # SHA256 hex digest of the file content
+    chunk_ids: List[str] = field(default_factory=list)  # Vector IDs emitted for this file
+    summary_pending: bool = False  # Chunks are indexed but the Level 1 summary is not yet
+
+
+class IndexManifest:
+    """Persistent manifest of indexed files stored as JSON next to the ChromaDB data."""
+
+    MANIFEST_FILENAME = "index_manifest.json"
+    VERSION = 1
+
+    def __init__(self, manifest_path: str):
+        """
+        Initialize IndexManifest.
+
+        Args:
+            manifest_path: Path of the manifest JSON file
+        """
+        self.manifest_path = manifest_path
+        self.entries: Dict[str, ManifestEntry] = {}
+
+    def load(self) -> None:
+        """
+        Load manifest entries from disk.
+
+        Note:
+            A missing or unreadable manifest is treated as empty, which makes
+            the next build process every file.
+        """
+        self.entries = {}
+        if not os.path.exists(self.manifest_path):
+            return
+
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+
+            if data.get('version') != self.VERSION:
+                logger.warning(
+                    f"Unsupported manifest version {data.get('version')}, ignoring {self.manifest_path}"
+                )
+                return
+
+            for path, entry in data.get('files', {}).items():
+                self.entries[path] = ManifestEntry(**entry)
+
+        except (OSError, ValueError, TypeError):
+            logger.exception(f"Failed to load manifest {self.manifest_path}, starting fresh")
+            self.entries = {}
+
+    def save(self) -> None:
+        """Write manifest entries to disk atomically (temp file + rename)."""
+        directory = os.path.dirname(self.manifest_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        data = {
+            'version': self.VERSION,
+            'files': {path: asdict(entry) for path, entry in sorted(self.entries.items())}
+        }
+
+        tmp_path = f"{self.manifest_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, self.manifest_path)
+
+    def get(self, path: str) -> Optional[ManifestEntry]:
+        """
+        Get manifest entry for a file.
+
+        Args:
+            path: File path relative to vault root
+
+        Returns:
+            ManifestEntry or None if the file has not been indexed
+        """
+        return self.entries.get(path)
+
+    def update(self, entry: ManifestEntry) -> None:
+        """
+        Add or replace the manifest entry for a file.
+
+        Args:
+            entry: ManifestEntry to store
+        """
+        self.entries[entry.path] = entry
+
+    def remove(self, path: str) -> Optional[ManifestEntry]:
+        """
+        Remove the manifest entry for a file.
+
+        Args:
+            path: File path relative to vault root
+
+        Returns:
+            Removed ManifestEntry or None if not present
+        """
+        return self.entries.pop(path, None)
+
+    def paths(self) -> Set[str]:
+        """
+        Get all indexed file paths.
+
+        Returns:
+            Set of file paths relative to vault root
+        """
+        return set(self.entries)
+
+    def is_unchanged(self, path: str, mtime: float, size: int) -> bool:
+        """
+        Check whether a file is unchanged based on stat information only.
+
+        Args:
+            path: File path relative to vault root
+            mtime: Current modification time
+            size: Current file size in bytes
+
+        Returns:
+            True if the stored mtime and size both match
+        """
+        entry = self.entries.get(path)
+        return entry is not None and entry.mtime == mtime and entry.size == size
+
+    @staticmethod
+    def compute_hash(content: bytes) -> str:
+        """
+        Compute SHA256 hash of file content.
+
+        Args:
+            content: Raw file content
+
+        Returns:
+            Hex digest of SHA256 hash
+        """
+        return hashlib.sha256(content).hexdigest()
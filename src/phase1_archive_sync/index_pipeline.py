@@ -0,0 +1,616 @@
+"""
+Index Pipeline for Resonance Archive System.
+
+Runs index construction as a bounded producer/consumer pipeline so that file
+reading, semantic splitting, Ollama inference and ChromaDB writes overlap:
+
+    reader → splitter → embedding workers ─────────────→ writer
+                                  └→ summary queue → summary workers ─┘
+
+Level 2 chunk vectors go to the writer as soon as they are embedded; Level 1
+summaries are generated by a separate LLM worker pool and backfilled, or
+deferred to a later summaries pass (IndexPipeline.run_summaries).
+"""
+import logging
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from src.phase1_archive_sync.chromadb_indexer import ChromaDBIndexer
+from src.phase1_archive_sync.index_manifest import IndexManifest, ManifestEntry
+from src.phase1_archive_sync.multilevel_vectorizer import EmbeddingRecord, MultilevelVectorizer
+from src.phase1_archive_sync.semantic_splitter import Chunk
+
+logger = logging.getLogger(__name__)
+
+# Marks the end of a stage's input
+_STOP = object()
+
+
+@dataclass
+class PipelineConfig:
+    """Concurrency settings for IndexPipeline stages."""
+    reader_workers: int = 1
+    splitter_workers: int = 1
+    embed_workers: int = 2
+    summary_workers: int = 1
+    defer_summaries: bool = False  # Leave Level 1 summaries to a later run_summaries() pass
+    queue_size: int = 8  # Maximum files buffered between two stages
+    write_batch_size: int = 100  # Vectors buffered by the writer before inserting into ChromaDB
+    checkpoint_every_batches: int = 10  # Save the manifest after this many written batches
+
+    def __post_init__(self) -> None:
+        """
+        Validate the settings.
+
+        Raises:
+            ValueError: If a worker count, queue size or batch setting is below 1
+                (no workers would block run() forever; queue_size 0 would make
+                the queues unbounded)
+        """
+        for name in (
+            "reader_workers", "splitter_workers", "embed_workers", "summary_workers",
+            "queue_size", "write_batch_size", "checkpoint_every_batches"
+        ):
+            value = getattr(self, name)
+            if value < 1:
+                raise ValueError(f"PipelineConfig.{name} must be at least 1, got {value}")
+
+
+@dataclass
+class StageStats:
+    """Throughput statistics of a single pipeline stage."""
+    name: str
+    workers: int
+    items: int = 0
+    busy_seconds: float = 0.0  # Summed over all workers of the stage
+
+    def items_per_second(self, elapsed_seconds: float) -> float:
+        """
+        Calculate stage throughput over the pipeline's wall-clock time.
+
+        Args:
+            elapsed_seconds: Wall-clock time of the whole pipeline run
+
+        Returns:
+            Processed items per second
+        """
+        return self.items / elapsed_seconds if elapsed_seconds > 0 else 0.0
+
+    def utilization(self, elapsed_seconds: float) -> float:
+        """
+        Calculate the fraction of worker time spent processing items.
+
+        Args:
+            elapsed_seconds: Wall-clock time of the whole pipeline run
+
+        Returns:
+            Utilization between 0.0 and 1.0
+        """
+        capacity = elapsed_seconds * self.workers
+        return min(self.busy_seconds / capacity, 1.0) if capacity > 0 else 0.0
+
+
+@dataclass
+class FileTask:
+    """A vault file travelling through the pipeline."""
+    file_path: str  # Absolute path
+    relative_path: str  # Path relative to vault root
+    mtime: float = 0.0
+    size: int = 0
+    content_hash: str = ""
+    text: str = ""
+    previous_entry: Optional[ManifestEntry] = None
+    current_time: str = ""
+    chunks: List[Chunk] = field(default_factory=list)
+    records: List[EmbeddingRecord] = field(default_factory=list)
+    summary_pending: bool = False  # A Level 1 summary is still to be generated
+
+
+@dataclass
+class SummaryTask:
+    """A Level 1 summary to generate for an already indexed file."""
+    file_path: str  # Absolute path
+    relative_path: str  # Path relative to vault root
+    content_hash: str  # Content hash the summary must match
+    chunk_count: int
+    current_time: str
+    record: Optional[EmbeddingRecord] = None
+
+
+class IndexPipeline:
+    """Bounded multi-stage pipeline that vectorizes and indexes vault files."""
+
+    def __init__(
+        self,
+        vectorizer: MultilevelVectorizer,
+        indexer: ChromaDBIndexer,
+        manifest: IndexManifest,
+        config: Optional[PipelineConfig] = None,
+        incremental: bool = True,
+        on_file_done: Optional[Callable[[], None]] = None
+    ):
+        """
+        Initialize IndexPipeline.
+
+        Args:
+            vectorizer: MultilevelVectorizer used by the splitter/embedding/summary stages
+            indexer: ChromaDBIndexer written to by the writer stage
+            manifest: IndexManifest consulted by the reader and updated by the writer
+            config: Stage concurrency settings (default: PipelineConfig())
+            incremental: Skip files unchanged since the manifest was written (default: True)
+            on_file_done: Called once per input file when it leaves the pipeline (progress)
+        """
+        self.vectorizer = vectorizer
+        self.indexer = indexer
+        self.manifest = manifest
+        self.config = config or PipelineConfig()
+        self.incremental = incremental
+        self.on_file_done = on_file_done
+
+        self._lock = threading.Lock()
+        self.stage_stats: Dict[str, StageStats] = {}
+        self._reset_counters()
+
+    def _reset_counters(self) -> None:
+        """Reset per-run counters."""
+        self.files_processed = 0
+        self.files_skipped = 0
+        self.files_failed = 0
+        self.vectors_deleted = 0
+        self.level1_count = 0
+        self.level2_count = 0
+        self.summaries_failed = 0
+        self.insert_failed = 0
+        self.batches_written = 0
+        self._summaries_only = False
+        self._pending_records: List[EmbeddingRecord] = []
+        self._pending_tasks: List[Union[FileTask, SummaryTask]] = []
+
+    def run(self, relative_paths: Dict[str, str]) -> Dict[str, Any]:
+        """
+        Process files through all pipeline stages.
+
+        Args:
+            relative_paths: Mapping of absolute file path to path relative to vault root
+
+        Returns:
+            Statistics dictionary with keys: files_processed, files_skipped,
+            files_failed, vectors_deleted, level1_count, level2_count,
+            summaries_failed, summaries_pending, vectors_failed,
+            batches_written, elapsed_time, stages
+        """
+        self._reset_counters()
+        config = self.config
+
+        tasks = [
+            FileTask(file_path=file_path, relative_path=relative_path)
+            for file_path, relative_path in relative_paths.items()
+        ]
+        return self._run_stages([
+            ("reader", self._read, config.reader_workers, config.queue_size),
+            ("splitter", self._split, config.splitter_workers, config.queue_size),
+            ("embed", self._embed, config.embed_workers, config.queue_size),
+            # Unbounded: summary tasks are small and must never stall chunk embedding
+            ("summary", self._summarize, config.summary_workers, 0),
+            ("writer", self._write, 1, config.queue_size),  # ChromaDB writes stay on a single thread
+        ], tasks)
+
+    def run_summaries(self, relative_paths: Dict[str, str]) -> Dict[str, Any]:
+        """
+        Generate Level 1 summaries still pending in the manifest.
+
+        Args:
+            relative_paths: Mapping of absolute file path to path relative to vault root
+
+        Returns:
+            Statistics dictionary (same keys as run())
+
+        Note:
+            Files changed since their chunks were indexed are skipped; the next
+            run() reindexes them together with their summary.
+        """
+        self._reset_counters()
+        self._summaries_only = True
+        config = self.config
+
+        tasks = []
+        for file_path, relative_path in relative_paths.items():
+            entry = self.manifest.get(relative_path)
+            if entry and entry.summary_pending:
+                tasks.append(SummaryTask(
+                    file_path=file_path,
+                    relative_path=relative_path,
+                    content_hash=entry.content_hash,
+                    chunk_count=len(entry.chunk_ids),
+                    current_time=datetime.now(timezone.utc).isoformat()
+                ))
+
+        return self._run_stages([
+            ("summary", self._summarize, config.summary_workers, config.queue_size),
+            ("writer", self._write, 1, config.queue_size),
+        ], tasks)
+
+    def _run_stages(
+        self,
+        stages: List[tuple],
+        tasks: List[Union[FileTask, SummaryTask]]
+    ) -> Dict[str, Any]:
+        """
+        Start stage workers, feed tasks to the first stage and wait for completion.
+
+        Args:
+            stages: List of (name, handler, workers, queue_size) in pipeline order
+            tasks: Input tasks for the first stage
+
+        Returns:
+            Statistics dictionary
+        """
+        start_time = time.time()
+        self.stage_stats = {
+            name: StageStats(name=name, workers=workers) for name, _, workers, _ in stages
+        }
+        self._queues = {name: queue.Queue(maxsize=size) for name, _, _, size in stages}
+
+        # Stop markers flow in stage order: a stage stops after all earlier stages
+        # have finished, so every item emitted upstream is consumed first
+        runners = []
+        for i, (name, handler, workers, _) in enumerate(stages):
+            next_stage = stages[i + 1] if i + 1 < len(stages) else None
+            runner = threading.Thread(
+                target=self._run_stage,
+                args=(
+                    name, handler, workers,
+                    self._queues[next_stage[0]] if next_stage else None,
+                    next_stage[2] if next_stage else 0
+                ),
+                name=f"index-{name}",
+                daemon=True
+            )
+            runner.start()
+            runners.append(runner)
+
+        # Feed the first stage
+        first_name, _, first_workers, _ = stages[0]
+        for task in tasks:
+            self._queues[first_name].put(task)
+        for _ in range(first_workers):
+            self._queues[first_name].put(_STOP)
+
+        for runner in runners:
+            runner.join()
+
+        # Write what is left in the writer buffer
+        self._flush_writes()
+
+        return {
+            'files_processed': self.files_processed,
+            'files_skipped': self.files_skipped,
+            'files_failed': self.files_failed,
+            'vectors_deleted': self.vectors_deleted,
+            'level1_count': self.level1_count,
+            'level2_count': self.level2_count,
+            'summaries_failed': self.summaries_failed,
+            'summaries_pending': sum(
+                1 for path in self.manifest.paths() if self.manifest.get(path).summary_pending
+            ),
+            'vectors_failed': self.insert_failed,
+            'batches_written': self.batches_written,
+            'elapsed_time': time.time() - start_time,
+            'stages': list(self.stage_stats.values())
+        }
+
+    def _run_stage(
+        self,
+        name: str,
+        handler: Callable[[Any], None],
+        workers: int,
+        next_queue: Optional[queue.Queue],
+        next_workers: int
+    ) -> None:
+        """
+        Run the workers of one stage and signal the next stage when all are done.
+
+        Args:
+            name: Stage name
+            handler: Function processing one task; emits results via _emit()
+            workers: Number of worker threads
+            next_queue: Queue of the next stage in stop order (None for the last stage)
+            next_workers: Number of workers of the next stage
+        """
+        threads = [
+            threading.Thread(
+                target=self._worker,
+                args=(name, handler),
+                name=f"index-{name}-{i}",
+                daemon=True
+            )
+            for i in range(workers)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        if next_queue is not None:
+            for _ in range(next_workers):
+                next_queue.put(_STOP)
+
+    def _worker(self, name: str, handler: Callable[[Any], None]) -> None:
+        """
+        Consume tasks until the stop marker is received.
+
+        Args:
+            name: Stage name
+            handler: Function processing one task
+        """
+        stats = self.stage_stats[name]
+        input_queue = self._queues[name]
+
+        while True:
+            task = input_queue.get()
+            if task is _STOP:
+                break
+
+            started = time.perf_counter()
+            try:
+                handler(task)
+            except Exception:
+                logger.exception(f"Error in {name} stage for {task.file_path}")
+                with self._lock:
+                    if isinstance(task, SummaryTask):
+                        self.summaries_failed += 1
+                    else:
+                        self.files_failed += 1
+                self._task_done(task)
+
+            with self._lock:
+                stats.items += 1
+                stats.busy_seconds += time.perf_counter() - started
+
+    def _emit(self, stage: str, task: Union[FileTask, SummaryTask]) -> None:
+        """
+        Hand a task to a stage.
+
+        Args:
+            stage: Name of the receiving stage
+            task: Task to enqueue
+        """
+        self._queues[stage].put(task)
+
+    def _task_done(self, task: Union[FileTask, SummaryTask]) -> None:
+        """
+        Report that an input task has left the pipeline.
+
+        Args:
+            task: Finished task; only tasks fed to the first stage report progress
+        """
+        if self.on_file_done is not None and isinstance(task, SummaryTask) == self._summaries_only:
+            self.on_file_done()
+
+    def _read(self, task: FileTask) -> None:
+        """
+        Reader stage: skip unchanged files, otherwise load and hash content.
+
+        Args:
+            task: FileTask with file_path and relative_path set
+        """
+        # Cheap check: unchanged mtime and size means no read is needed
+        stat = os.stat(task.file_path)
+        with self._lock:
+            unchanged = self.incremental and self.manifest.is_unchanged(
+                task.relative_path, stat.st_mtime, stat.st_size
+            )
+            if unchanged:
+                self.files_skipped += 1
+        if unchanged:
+            self._task_done(task)
+            return
+
+        # Read file
+        with open(task.file_path, 'rb') as f:
+            content = f.read()
+        content_hash = IndexManifest.compute_hash(content)
+
+        with self._lock:
+            previous_entry = self.manifest.get(task.relative_path)
+
+            # Touched but identical content: refresh stat info only
+            if self.incremental and previous_entry and previous_entry.content_hash == content_hash:
+                previous_entry.mtime = stat.st_mtime
+                previous_entry.size = stat.st_size
+                self.files_skipped += 1
+                unchanged = True
+        if unchanged:
+            self._task_done(task)
+            return
+
+        task.mtime = stat.st_mtime
+        task.size = stat.st_size
+        task.content_hash = content_hash
+        task.previous_entry = previous_entry
+        task.text = content.decode('utf-8')
+        task.current_time = datetime.now(timezone.utc).isoformat()
+        self._emit("splitter", task)
+
+    def _split(self, task: FileTask) -> None:
+        """
+        Splitter stage: split text into semantic chunks.
+
+        Args:
+            task: FileTask with text loaded
+        """
+        if task.text.strip():
+            task.chunks = self.vectorizer.split_chunks(task.text, task.relative_path)
+        else:
+            logger.error(f"Empty file: {task.relative_path}")
+        self._emit("embed", task)
+
+    def _embed(self, task: FileTask) -> None:
+        """
+        Embedding stage: generate Level 2 chunk records and queue the summary.
+
+        Args:
+            task: FileTask with chunks set
+        """
+        task.records = self.vectorizer.vectorize_chunks(
+            task.chunks, task.relative_path, task.current_time
+        )
+        task.chunks = []
+        chunk_count = len(task.records)
+        task.summary_pending = chunk_count > 0 and self.vectorizer.needs_summary(
+            task.text, chunk_count
+        )
+        task.text = ""
+
+        # Chunks go to the writer first so the file's manifest entry exists
+        # before its summary arrives
+        self._emit("writer", task)
+
+        if task.summary_pending and not self.config.defer_summaries:
+            self._emit("summary", SummaryTask(
+                file_path=task.file_path,
+                relative_path=task.relative_path,
+                content_hash=task.content_hash,
+                chunk_count=chunk_count,
+                current_time=task.current_time
+            ))
+
+    def _summarize(self, task: SummaryTask) -> None:
+        """
+        Summary stage: generate the Level 1 summary record of a file.
+
+        The file is re-read instead of keeping its text in the queue, so
+        pending summaries cost almost no memory.
+
+        Args:
+            task: SummaryTask of an indexed file
+        """
+        with open(task.file_path, 'rb') as f:
+            content = f.read()
+
+        if IndexManifest.compute_hash(content) != task.content_hash:
+            logger.info(f"{task.relative_path} changed since indexing, summary left to next build")
+            self._task_done(task)
+            return
+
+        task.record = self.vectorizer.vectorize_summary(
+            content.decode('utf-8'), task.relative_path, task.chunk_count, task.current_time
+        )
+        if task.record is None:
+            with self._lock:
+                self.summaries_failed += 1
+            self._task_done(task)
+            return
+
+        self._emit("writer", task)
+
+    def _write(self, task: Union[FileTask, SummaryTask]) -> None:
+        """
+        Writer stage: drop a file's previous vectors and buffer new records.
+
+        Records are inserted into ChromaDB in write_batch_size batches as they
+        arrive, so memory use is bounded by the batch size rather than the
+        vault size.
+
+        Args:
+            task: FileTask with Level 2 records, or SummaryTask with its record
+        """
+        if isinstance(task, SummaryTask):
+            with self._lock:
+                self.level1_count += 1
+            self._pending_records.append(task.record)
+        else:
+            # Drop vectors of the previous version of this file
+            if task.previous_entry:
+                deleted = self.indexer.delete_vectors(task.previous_entry.chunk_ids)
+                with self._lock:
+                    self.vectors_deleted += deleted
+                    self.manifest.remove(task.relative_path)
+
+            if not task.records:
+                self._task_done(task)
+                return
+
+            with self._lock:
+                self.files_processed += 1
+                self.level2_count += len(task.records)
+            self._pending_records.extend(task.records)
+
+        self._pending_tasks.append(task)
+        if len(self._pending_records) >= self.config.write_batch_size:
+            self._flush_writes()
+
+        self._task_done(task)
+
+    def _flush_writes(self) -> None:
+        """
+        Insert buffered records and record their files in the manifest.
+
+        Note:
+            The manifest is checkpointed every checkpoint_every_batches batches
+            so that an interrupted build keeps the files written so far.
+        """
+        if not self._pending_records:
+            return
+
+        records = self._pending_records
+        tasks = self._pending_tasks
+        self._pending_records = []
+        self._pending_tasks = []
+
+        result = self.indexer.add_vectors_batch(
+            records=records,
+            batch_size=self.config.write_batch_size,
+            show_progress=False
+        )
+
+        with self._lock:
+            self.insert_failed += result['failed']
+            self.batches_written += 1
+
+            # Files of a batch with failed vectors are left out of the manifest so they are retried
+            if result['failed'] > 0:
+                logger.warning(
+                    f"{result['failed']} vectors failed to index; "
+                    f"{len(tasks)} files will be reprocessed next run"
+                )
+            else:
+                for task in tasks:
+                    if isinstance(task, SummaryTask):
+                        self._record_summary(task)
+                        continue
+                    self.manifest.update(ManifestEntry(
+                        path=task.relative_path,
+                        mtime=task.mtime,
+                        size=task.size,
+                        content_hash=task.content_hash,
+                        chunk_ids=[record.id for record in task.records],
+                        summary_pending=task.summary_pending
+                    ))
+                    task.records = []
+
+            if self.batches_written % self.config.checkpoint_every_batches == 0:
+                # Vectors must be on disk before the manifest claims their files
+                self.indexer.flush()
+                self.manifest.save()
+
+    def _record_summary(self, task: SummaryTask) -> None:
+        """
+        Attach a written summary to its file's manifest entry (caller holds the lock).
+
+        Args:
+            task: SummaryTask whose record has been written
+        """
+        entry = self.manifest.get(task.relative_path)
+        if entry is None or entry.content_hash != task.content_hash:
+            # The file's chunks were not recorded; drop the orphaned summary vector
+            self.indexer.delete_vectors([task.record.id])
+            return
+
+        entry.chunk_ids.insert(0, task.record.id)
+        entry.summary_pending = False
@@ -13,7 +13,8 @@ from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import List, Dict, Any, Optional
 
-from src.phase1_archive_sync.semantic_splitter import SemanticSplitter
+from src.phase1_archive_sync.semantic_splitter import Chunk, SemanticSplitter
+from src.utils.embedding_cache import EmbeddingCache
 from src.utils.ollama_client import OllamaClient
 
 logger = logging.getLogger(__name__)
@@ -31,12 +32,16 @@ class EmbeddingRecord:
 class MultilevelVectorizer:
     """Generates multi-level embeddings for documents."""
 
+    EMBEDDING_MODEL = "mxbai-embed-large"
+
     def __init__(
         self,
         ollama_client: Optional[OllamaClient] = None,
         semantic_splitter: Optional[SemanticSplitter] = None,
         summary_threshold_chars: int = 2000,
-        summary_threshold_chunks: int = 5
+        summary_threshold_chunks: int = 5,
+        embedding_cache: Optional[EmbeddingCache] = None,
+        embed_batch_size: int = 32
     ):
         """
         Initialize MultilevelVectorizer.
@@ -46,9 +51,13 @@ class MultilevelVectorizer:
             semantic_splitter: SemanticSplitter instance (default: create new)
             summary_threshold_chars: Minimum chars to trigger summary (default: 2000)
             summary_threshold_chunks: Minimum chunks to trigger summary (default: 5)
+            embedding_cache: EmbeddingCache consulted before calling Ollama (default: no cache)
+            embed_batch_size: Maximum chunks per Ollama embed request (default: 32)
         """
         self.ollama_client = ollama_client or OllamaClient()
         self.semantic_splitter = semantic_splitter or SemanticSplitter()
+        self.embedding_cache = embedding_cache
+        self.embed_batch_size = embed_batch_size
         self.summary_threshold_chars = summary_threshold_chars
         self.summary_threshold_chunks = summary_threshold_chunks
 
@@ -68,60 +77,19 @@ class MultilevelVectorizer:
             logger.error(f"Empty file: {file_path}")
             return []
 
-        records = []
         current_time = datetime.now(timezone.utc).isoformat()
 
         try:
             # Level 2: Chunk-level vectors
-            chunks = self.semantic_splitter.split(text)
-            level2_records = []
-
-            for chunk in chunks:
-                # Skip empty chunks
-                if not chunk.text.strip():
-                    logger.warning(f"Skipping empty chunk in {file_path}")
-                    continue
-
-                # Vectorize chunk with retry
-                vector = self._vectorize_with_retry(chunk.text)
-                if vector is None:
-                    logger.error(f"Failed to vectorize chunk in {file_path}")
-                    continue
-
-                # Generate metadata
-                content_hash = self._compute_hash(chunk.text)
-                chunk_id = f"{file_path}#{chunk.seq}#{content_hash[:8]}"
-
-                metadata = {
-                    'level': 2,
-                    'chunk_id': chunk_id,
-                    'type': 'chunk',
-                    'file': file_path,
-                    'date': self._extract_date_from_path(file_path),
-                    'seq': chunk.seq,
-                    'char_count': len(chunk.text),
-                    'content_hash': content_hash,
-                    'created_at': current_time,
-                    'updated_at': current_time
-                }
-
-                record = EmbeddingRecord(
-                    id=chunk_id,
-                    text=chunk.text,
-                    vector=vector,
-                    metadata=metadata
-                )
-                level2_records.append(record)
-
-            records.extend(level2_records)
+            chunks = self.split_chunks(text, file_path)
+            records = self.vectorize_chunks(chunks, file_path, current_time)
 
             # Level 1: Summary vector (if needed)
-            if self._should_generate_summary(text, len(level2_records)):
-                summary_record = self._generate_summary_record(
-                    text, file_path, current_time
-                )
-                if summary_record:
-                    records.insert(0, summary_record)  # Insert at beginning
+            summary_record = self.vectorize_summary(
+                text, file_path, len(records), current_time
+            )
+            if summary_record:
+                records.insert(0, summary_record)  # Insert at beginning
 
             return records
 
@@ -129,9 +97,109 @@ class MultilevelVectorizer:
             logger.error(f"Error vectorizing {file_path}: {e}")
             return []
 
-    def _should_generate_summary(self, text: str, chunk_count: int) -> bool:
+    def split_chunks(self, text: str, file_path: str) -> List[Chunk]:
+        """
+        Split text into non-empty semantic chunks.
+
+        Args:
+            text: Input text
+            file_path: File path (relative to vault root, used for logging)
+
+        Returns:
+            List of Chunk objects with empty chunks removed
+        """
+        chunks = []
+        for chunk in self.semantic_splitter.split(text):
+            # Skip empty chunks
+            if not chunk.text.strip():
+                logger.warning(f"Skipping empty chunk in {file_path}")
+                continue
+            chunks.append(chunk)
+        return chunks
+
+    def vectorize_chunks(
+        self,
+        chunks: List[Chunk],
+        file_path: str,
+        current_time: Optional[str] = None
+    ) -> List[EmbeddingRecord]:
+        """
+        Generate Level 2 records for already split chunks.
+
+        Args:
+            chunks: Chunks returned by split_chunks()
+            file_path: File path (relative to vault root)
+            current_time: Timestamp for created_at/updated_at (default: now)
+
+        Returns:
+            List of Level 2 EmbeddingRecord objects (failed chunks are skipped)
+        """
+        current_time = current_time or datetime.now(timezone.utc).isoformat()
+
+        # Vectorize all chunks of the file (cache first, then batched Ollama requests)
+        content_hashes = [self._compute_hash(chunk.text) for chunk in chunks]
+        vectors = self._vectorize_many([chunk.text for chunk in chunks], content_hashes)
+        level2_records = []
+
+        for chunk, content_hash, vector in zip(chunks, content_hashes, vectors):
+            if vector is None:
+                logger.error(f"Failed to vectorize chunk in {file_path}")
+                continue
+
+            # Generate metadata
+            chunk_id = f"{file_path}#{chunk.seq}#{content_hash[:8]}"
+
+            metadata = {
+                'level': 2,
+                'chunk_id': chunk_id,
+                'type': 'chunk',
+                'file': file_path,
+                'date': self._extract_date_from_path(file_path),
+                'seq': chunk.seq,
+                'char_count': len(chunk.text),
+                'content_hash': content_hash,
+                'created_at': current_time,
+                'updated_at': current_time
+            }
+
+            record = EmbeddingRecord(
+                id=chunk_id,
+                text=chunk.text,
+                vector=vector,
+                metadata=metadata
+            )
+            level2_records.append(record)
+
+        return level2_records
+
+    def vectorize_summary(
+        self,
+        text: str,
+        file_path: str,
+        chunk_count: int,
+        current_time: Optional[str] = None
+    ) -> Optional[EmbeddingRecord]:
         """
-        Determine if summary should be generated.
+        Generate the Level 1 summary record if the document needs one.
+
+        Args:
+            text: Input text
+            file_path: File path (relative to vault root)
+            chunk_count: Number of Level 2 records generated for the document
+            current_time: Timestamp for created_at/updated_at (default: now)
+
+        Returns:
+            EmbeddingRecord, or None if no summary is needed or generation failed
+        """
+        if not self.needs_summary(text, chunk_count):
+            return None
+
+        current_time = current_time or datetime.now(timezone.utc).isoformat()
+        return self._generate_summary_record(text, file_path, current_time)
+
+    def needs_summary(self, text: str, chunk_count: int) -> bool:
+        """
+        Determine if a Level 1 summary should be generated.
 
         Args:
             text: Input text
@@ -169,14 +237,14 @@ class MultilevelVectorizer:
                 logger.error(f"Failed to generate summary for {file_path}")
                 return None
 
-            # Vectorize summary with retry
-            vector = self._vectorize_with_retry(summary)
+            # Vectorize summary (cache first, then Ollama with retry)
+            content_hash = self._compute_hash(summary)
+            vector = self._vectorize_cached(summary, content_hash)
             if vector is None:
                 logger.error(f"Failed to vectorize summary for {file_path}")
                 return None
 
             # Generate metadata
-            content_hash = self._compute_hash(summary)
             chunk_id = f"{file_path}#0#{content_hash[:8]}"
 
             metadata = {
@@ -242,6 +310,80 @@ class MultilevelVectorizer:
             logger.error(f"Summary generation failed: {e}")
             return None
 
+    def _vectorize_cached(self, text: str, content_hash: str) -> Optional[List[float]]:
+        """
+        Vectorize text, reusing a cached vector for identical content.
+
+        Args:
+            text: Text to vectorize
+            content_hash: SHA256 hex digest of text
+
+        Returns:
+            Vector or None if failed
+        """
+        return self._vectorize_many([text], [content_hash])[0]
+
+    def _vectorize_many(
+        self,
+        texts: List[str],
+        content_hashes: List[str]
+    ) -> List[Optional[List[float]]]:
+        """
+        Vectorize multiple texts with cache lookup and batched Ollama requests.
+
+        Args:
+            texts: Texts to vectorize
+            content_hashes: SHA256 hex digests aligned with texts
+
+        Returns:
+            List of vectors aligned with texts (None for texts that failed)
+
+        Implementation:
+            - Cached vectors are reused without calling Ollama; their access
+              times are written in one transaction per batch
+            - Cache misses are embedded via embed_batch in embed_batch_size slices
+            - Texts missing from a batch response fall back to _vectorize_with_retry
+        """
+        vectors: List[Optional[List[float]]] = [None] * len(texts)
+
+        # Cache lookup
+        missing = []
+        for i, content_hash in enumerate(content_hashes):
+            if self.embedding_cache is not None:
+                vectors[i] = self.embedding_cache.get(self.EMBEDDING_MODEL, content_hash)
+            if vectors[i] is None:
+                missing.append(i)
+        if self.embedding_cache is not None:
+            # Commit the access times of this batch's hits together
+            self.embedding_cache.flush()
+
+        if not missing:
+            return vectors
+
+        # Batched embedding of cache misses
+        try:
+            batch_vectors = self.ollama_client.embed_batch(
+                model=self.EMBEDDING_MODEL,
+                texts=[texts[i] for i in missing],
+                max_batch=self.embed_batch_size
+            )
+        except Exception as e:
+            logger.warning(f"Batch vectorization failed, falling back to single requests: {e}")
+            batch_vectors = [None] * len(missing)
+
+        for i, vector in zip(missing, batch_vectors):
+            if not vector or len(vector) != 1024:
+                # Retry this text on its own
+                vector = self._vectorize_with_retry(texts[i])
+            if vector is None:
+                continue
+
+            vectors[i] = vector
+            if self.embedding_cache is not None:
+                self.embedding_cache.put(self.EMBEDDING_MODEL, content_hashes[i], vector)
+
+        return vectors
+
     def _vectorize_with_retry(
         self,
         text: str,
@@ -260,7 +402,7 @@ class MultilevelVectorizer:
         for attempt in range(max_retries):
             try:
                 vector = self.ollama_client.embed(
-                    model="mxbai-embed-large",
+                    model=self.EMBEDDING_MODEL,
                     text=text
                 )
                 if vector and len(vector) == 1024:
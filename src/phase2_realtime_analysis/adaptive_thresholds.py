@@ -0,0 +1,462 @@
+"""
+Adaptive Thresholds for Resonance Archive System.
+
+Learns the writer's pause and delta distributions online and derives timing
+and delta thresholds that fire for a target number of analyses per hour,
+corrected by the trigger rate actually observed.
+"""
+import json
+import logging
+import math
+import os
+import threading
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class StreamingQuantile:
+    """
+    Estimates one quantile of a stream in constant memory (P² algorithm).
+
+    Five markers track the minimum, the maximum, the target quantile and the
+    two quantiles halfway to it; marker heights are adjusted with piecewise
+    parabolic interpolation as observations arrive.
+    """
+
+    def __init__(self, quantile: float):
+        """
+        Initialize StreamingQuantile.
+
+        Args:
+            quantile: Quantile to estimate, between 0 and 1
+        """
+        self.quantile = quantile
+        self.count = 0
+        self.heights: List[float] = []
+        self.positions = [1.0, 2.0, 3.0, 4.0, 5.0]
+        self.desired = [1.0, 1 + 2 * quantile, 1 + 4 * quantile, 3 + 2 * quantile, 5.0]
+        self.increments = [0.0, quantile / 2, quantile, (1 + quantile) / 2, 1.0]
+
+    def add(self, value: float) -> None:
+        """
+        Add an observation.
+
+        Args:
+            value: Observed value
+        """
+        self.count += 1
+        heights = self.heights
+
+        if len(heights) < 5:
+            heights.append(value)
+            heights.sort()
+            return
+
+        if value < heights[0]:
+            heights[0] = value
+            cell = 0
+        elif value >= heights[4]:
+            heights[4] = value
+            cell = 3
+        else:
+            cell = next(i for i in range(4) if heights[i] <= value < heights[i + 1])
+
+        for i in range(cell + 1, 5):
+            self.positions[i] += 1
+        for i in range(5):
+            self.desired[i] += self.increments[i]
+
+        for i in range(1, 4):
+            offset = self.desired[i] - self.positions[i]
+            if (offset >= 1 and self.positions[i + 1] - self.positions[i] > 1) or \
+                    (offset <= -1 and self.positions[i - 1] - self.positions[i] < -1):
+                step = 1 if offset > 0 else -1
+                height = self._parabolic(i, step)
+                if not heights[i - 1] < height < heights[i + 1]:
+                    height = self._linear(i, step)
+                heights[i] = height
+                self.positions[i] += step
+
+    def value(self) -> Optional[float]:
+        """
+        Get the current estimate.
+
+        Returns:
+            Estimated quantile, or None before the first observation
+        """
+        if not self.heights:
+            return None
+        if self.count < 5:
+            return self.heights[int(round(self.quantile * (len(self.heights) - 1)))]
+        return self.heights[2]
+
+    def to_dict(self) -> Dict:
+        """Serialize the estimator state."""
+        return {
+            'quantile': self.quantile,
+            'count': self.count,
+            'heights': self.heights,
+            'positions': self.positions,
+            'desired': self.desired
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'StreamingQuantile':
+        """Restore an estimator serialized with to_dict()."""
+        estimator = cls(data['quantile'])
+        estimator.count = data['count']
+        estimator.heights = list(data['heights'])
+        estimator.positions = list(data['positions'])
+        estimator.desired = list(data['desired'])
+        return estimator
+
+    def _parabolic(self, i: int, step: int) -> float:
+        """Piecewise-parabolic height prediction for marker i moved by step."""
+        n, q = self.positions, self.heights
+        return q[i] + step / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + step) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - step) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+        )
+
+    def _linear(self, i: int, step: int) -> float:
+        """Linear height prediction for marker i moved by step."""
+        n, q = self.positions, self.heights
+        return q[i] + step * (q[i + step] - q[i]) / (n[i + step] - n[i])
+
+
+class QuantileSketch:
+    """A fixed set of StreamingQuantile estimators for one metric."""
+
+    QUANTILES = (0.5, 0.75, 0.9, 0.95, 0.99)
+
+    def __init__(self):
+        """Initialize QuantileSketch."""
+        self.estimators = [StreamingQuantile(q) for q in self.QUANTILES]
+
+    @property
+    def count(self) -> int:
+        """Number of observations."""
+        return self.estimators[0].count
+
+    def add(self, value: float) -> None:
+        """
+        Add an observation to every estimator.
+
+        Args:
+            value: Observed value
+        """
+        for estimator in self.estimators:
+            estimator.add(value)
+
+    def value(self, quantile: float) -> Optional[float]:
+        """
+        Estimate any quantile by interpolating between the tracked ones.
+
+        Args:
+            quantile: Quantile between 0 and 1; values outside the tracked
+                range are clamped to it
+
+        Returns:
+            Estimated quantile, or None before the first observation
+        """
+        values = [estimator.value() for estimator in self.estimators]
+        if values[0] is None:
+            return None
+
+        # Separate estimators are not guaranteed to be ordered; make them monotone
+        for i in range(1, len(values)):
+            values[i] = max(values[i], values[i - 1])
+
+        quantiles = self.QUANTILES
+        if quantile <= quantiles[0]:
+            return values[0]
+        if quantile >= quantiles[-1]:
+            return values[-1]
+
+        upper = next(i for i, q in enumerate(quantiles) if q >= quantile)
+        lower = upper - 1
+        weight = (quantile - quantiles[lower]) / (quantiles[upper] - quantiles[lower])
+        return values[lower] + weight * (values[upper] - values[lower])
+
+    def to_dict(self) -> List[Dict]:
+        """Serialize all estimators."""
+        return [estimator.to_dict() for estimator in self.estimators]
+
+    @classmethod
+    def from_dict(cls, data: List[Dict]) -> 'QuantileSketch':
+        """Restore a sketch serialized with to_dict()."""
+        sketch = cls()
+        estimators = [StreamingQuantile.from_dict(entry) for entry in data]
+        if [e.quantile for e in estimators] != list(cls.QUANTILES):
+            raise ValueError("Quantile set does not match")
+        sketch.estimators = estimators
+        return sketch
+
+
+class AdaptiveThresholds:
+    """Learns timing and delta thresholds from the writer's own save history."""
+
+    STATE_FILENAME = "adaptive_thresholds.json"
+    VERSION = 1
+
+    # Gaps longer than this are breaks rather than writing rhythm
+    MAX_INTERVAL_SECONDS = 3600.0
+
+    # Trigger-rate feedback: per-window correction step is (target / actual) ** FEEDBACK_GAIN,
+    # limited to MAX_FEEDBACK_STEP either way; the overall correction stays within CORRECTION_RANGE
+    FEEDBACK_GAIN = 0.5
+    MAX_FEEDBACK_STEP = 2.0
+    CORRECTION_RANGE = (0.05, 20.0)
+
+    def __init__(
+        self,
+        state_path: str = os.path.join(".pod201", STATE_FILENAME),
+        target_analyses_per_hour: float = 6.0,
+        min_samples: int = 20,
+        smoothing: float = 0.05,
+        save_every: int = 20,
+        feedback_window_seconds: float = 1800.0
+    ):
+        """
+        Initialize AdaptiveThresholds.
+
+        Args:
+            state_path: Path of the learned state JSON file
+                (default: .pod201/adaptive_thresholds.json)
+            target_analyses_per_hour: Desired trigger rate while writing (default: 6.0)
+            min_samples: Saves observed before learned thresholds are used (default: 20)
+            smoothing: Weight of the newest interval in the save-rate average (default: 0.05)
+            save_every: Observations between automatic saves of the state (default: 20)
+            feedback_window_seconds: Writing time (sum of capped save intervals) over
+                which the actual trigger rate is measured (default: 1800.0)
+
+        Note:
+            Thresholds are set so that roughly the fraction
+            target_analyses_per_hour / saves_per_hour of saves exceeds the
+            medium pause/delta threshold, and half of that the long/large one.
+            Several signals are combined into one trigger decision, so that
+            fraction is then scaled by a correction learned from the triggers
+            reported with record_trigger().
+            Memory use is constant: five markers per tracked quantile.
+        """
+        self.state_path = state_path
+        self.target_analyses_per_hour = target_analyses_per_hour
+        self.min_samples = min_samples
+        self.smoothing = smoothing
+        self.save_every = save_every
+        self.feedback_window_seconds = feedback_window_seconds
+
+        self._lock = threading.Lock()
+        self.pauses = QuantileSketch()
+        self.deltas = QuantileSketch()
+        self.mean_interval: Optional[float] = None  # Smoothed seconds between saves
+        self.correction = 1.0  # Trigger-rate feedback factor on the fire fraction
+        self._window_seconds = 0.0  # Writing time in the current feedback window
+        self._window_triggers = 0  # Triggers in the current feedback window
+        self._unsaved = 0
+
+    def record_save(self, elapsed_seconds: Optional[float], char_delta: int, detector) -> bool:
+        """
+        Learn from one save and set the updated thresholds on a detector.
+
+        Call exactly once per save, before the detector evaluates it, and
+        report every save that triggers analysis with record_trigger(); the
+        save intervals seen here are the time base of the rate feedback.
+
+        Args:
+            elapsed_seconds: Seconds since the previous save (None for the first save)
+            char_delta: Characters added by the save (non-positive values are ignored)
+            detector: TimingDeltaSignalDetector that evaluates the save
+
+        Returns:
+            True if learned thresholds were applied, False if still learning
+        """
+        self.observe(elapsed_seconds, char_delta)
+
+        if elapsed_seconds is not None and elapsed_seconds >= 0:
+            with self._lock:
+                self._window_seconds += min(elapsed_seconds, self.MAX_INTERVAL_SECONDS)
+                if self._window_seconds >= self.feedback_window_seconds:
+                    self._apply_feedback()
+
+        return self.apply(detector)
+
+    def record_trigger(self) -> None:
+        """Count a save that triggered analysis (feedback for the fire fraction)."""
+        with self._lock:
+            self._window_triggers += 1
+
+    def observe(self, elapsed_seconds: Optional[float], char_delta: int) -> None:
+        """
+        Learn from one save (distributions only; see record_save()).
+
+        Args:
+            elapsed_seconds: Seconds since the previous save (None for the first save)
+            char_delta: Characters added by the save (non-positive values are ignored)
+        """
+        with self._lock:
+            if elapsed_seconds is not None and elapsed_seconds >= 0:
+                self.pauses.add(elapsed_seconds)
+                interval = min(elapsed_seconds, self.MAX_INTERVAL_SECONDS)
+                if self.mean_interval is None:
+                    self.mean_interval = interval
+                else:
+                    self.mean_interval += self.smoothing * (interval - self.mean_interval)
+
+            if char_delta > 0:
+                self.deltas.add(char_delta)
+
+            self._unsaved += 1
+            due = self.save_every and self._unsaved >= self.save_every
+
+        if due:
+            try:
+                self.save()
+            except OSError:
+                logger.exception(f"Failed to save adaptive thresholds {self.state_path}")
+
+    def fire_fraction(self) -> Optional[float]:
+        """
+        Fraction of saves that should trigger analysis to meet the target rate.
+
+        Returns:
+            Fraction between 0.01 and 0.5, or None before any interval was observed
+        """
+        if not self.mean_interval:
+            return None
+        saves_per_hour = 3600.0 / self.mean_interval
+        fraction = self.target_analyses_per_hour / saves_per_hour * self.correction
+        return min(0.5, max(0.01, fraction))
+
+    def actual_rate(self) -> Optional[float]:
+        """
+        Trigger rate measured in the current feedback window.
+
+        Returns:
+            Triggers per hour of writing time, or None before any interval was observed
+        """
+        with self._lock:
+            if self._window_seconds <= 0:
+                return None
+            return self._window_triggers * 3600.0 / self._window_seconds
+
+    def _apply_feedback(self) -> None:
+        """
+        Scale the correction toward the target rate and start a new window (caller holds the lock).
+        """
+        actual = self._window_triggers * 3600.0 / self._window_seconds
+        if actual > 0:
+            step = (self.target_analyses_per_hour / actual) ** self.FEEDBACK_GAIN
+        else:
+            step = self.MAX_FEEDBACK_STEP
+        step = min(self.MAX_FEEDBACK_STEP, max(1 / self.MAX_FEEDBACK_STEP, step))
+
+        low, high = self.CORRECTION_RANGE
+        self.correction = min(high, max(low, self.correction * step))
+        self._window_seconds = 0.0
+        self._window_triggers = 0
+
+    def thresholds(self) -> Optional[Dict[str, float]]:
+        """
+        Derive detector thresholds from the learned distributions.
+
+        Returns:
+            Dictionary of TimingDeltaSignalDetector threshold attribute names to
+            values, or None until min_samples pauses and deltas were observed
+        """
+        with self._lock:
+            if self.pauses.count < self.min_samples or self.deltas.count < self.min_samples:
+                return None
+            fraction = self.fire_fraction()
+            if fraction is None:
+                return None
+
+            medium_pause = self.pauses.value(1 - fraction)
+            long_pause = max(self.pauses.value(1 - fraction / 2), medium_pause)
+            small_delta = max(1, math.ceil(self.deltas.value(1 - 2 * fraction)))
+            medium_delta = max(small_delta, math.ceil(self.deltas.value(1 - fraction)))
+            large_delta = max(medium_delta, math.ceil(self.deltas.value(1 - fraction / 2)))
+
+        return {
+            'LONG_PAUSE_SECONDS': long_pause,
+            'MEDIUM_PAUSE_SECONDS': medium_pause,
+            'LARGE_DELTA_CHARS': large_delta,
+            'MEDIUM_DELTA_CHARS': medium_delta,
+            'SMALL_DELTA_CHARS': small_delta,
+        }
+
+    def apply(self, detector) -> bool:
+        """
+        Set learned thresholds on a detector instance.
+
+        Args:
+            detector: TimingDeltaSignalDetector (class defaults are left untouched)
+
+        Returns:
+            True if learned thresholds were applied, False if still learning
+        """
+        thresholds = self.thresholds()
+        if thresholds is None:
+            return False
+
+        for name, value in thresholds.items():
+            setattr(detector, name, value)
+        return True
+
+    def load(self) -> None:
+        """
+        Load learned state from disk.
+
+        Note:
+            A missing or unreadable file leaves the state empty.
+        """
+        if not os.path.exists(self.state_path):
+            return
+
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+
+            if data.get('version') != self.VERSION:
+                logger.warning(
+                    f"Unsupported adaptive thresholds version {data.get('version')}, "
+                    f"ignoring {self.state_path}"
+                )
+                return
+
+            pauses = QuantileSketch.from_dict(data['pauses'])
+            deltas = QuantileSketch.from_dict(data['deltas'])
+            mean_interval = data.get('mean_interval')
+            correction = float(data.get('correction', 1.0))
+
+        except (OSError, ValueError, TypeError, KeyError):
+            logger.exception(f"Failed to load adaptive thresholds {self.state_path}, starting fresh")
+            return
+
+        with self._lock:
+            self.pauses = pauses
+            self.deltas = deltas
+            self.mean_interval = mean_interval
+            self.correction = correction
+
+    def save(self) -> None:
+        """Write learned state to disk atomically (temp file + rename)."""
+        with self._lock:
+            data = {
+                'version': self.VERSION,
+                'pauses': self.pauses.to_dict(),
+                'deltas': self.deltas.to_dict(),
+                'mean_interval': self.mean_interval,
+                'correction': self.correction
+            }
+            self._unsaved = 0
+
+        directory = os.path.dirname(self.state_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.state_path)
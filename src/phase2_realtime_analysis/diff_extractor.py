@@ -4,24 +4,48 @@ Diff Extractor for Resonance Archive System.
 Extracts diff text from file changes and vectorizes it for similarity search.
 """
 import logging
+import os
 import time
+from collections import Counter
+from dataclasses import dataclass
 from typing import Optional, List
 from src.utils.ollama_client import OllamaClient
+from src.utils.query_vector_cache import QueryVectorCache
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class DiffSpan:
+    """A span of new text in the current version of a document."""
+    start: int  # Offset in current_text (inclusive)
+    end: int  # Offset in current_text (exclusive)
+    text: str  # current_text[start:end]
+    kind: str  # 'insert' (pure insertion) or 'replace' (modified text)
+
+
 class DiffExtractor:
     """Extracts and vectorizes diff text from file changes."""
 
-    def __init__(self, ollama_client: Optional[OllamaClient] = None):
+    EMBEDDING_MODEL = "mxbai-embed-large"
+
+    # Characters compared per step when trimming the common prefix/suffix
+    COMPARE_BLOCK_CHARS = 4096
+
+    def __init__(
+        self,
+        ollama_client: Optional[OllamaClient] = None,
+        query_cache: Optional[QueryVectorCache] = None
+    ):
         """
         Initialize DiffExtractor.
 
         Args:
             ollama_client: OllamaClient instance (default: create new)
+            query_cache: QueryVectorCache consulted before calling Ollama (default: no cache)
         """
         self.ollama_client = ollama_client or OllamaClient()
+        self.query_cache = query_cache
 
     def extract_diff(
         self,
@@ -36,23 +60,146 @@ class DiffExtractor:
             current_text: Current text
 
         Returns:
-            Diff text (added portion). Empty string if deletion or no change.
+            Newly written text; spans of a multi-part edit are joined with
+            newlines. Empty string if text was only deleted or nothing changed.
 
         Implementation:
             - If previous_text is None or empty: return current_text
-            - If current_text is shorter: return empty string (deletion)
-            - Otherwise: return current_text[len(previous_text):]
+            - Otherwise: join the spans returned by extract_spans()
         """
         # Handle None or empty previous_text
         if not previous_text:
             return current_text
 
-        # Handle deletion or no change
-        if len(current_text) <= len(previous_text):
-            return ""
+        return self.join_spans(self.extract_spans(previous_text, current_text))
+
+    @staticmethod
+    def join_spans(spans: List[DiffSpan]) -> str:
+        """
+        Join spans into the diff text returned by extract_diff().
+
+        Args:
+            spans: Spans from extract_spans()
+
+        Returns:
+            Span texts joined with newlines
+        """
+        return "\n".join(span.text for span in spans)
+
+    def extract_spans(
+        self,
+        previous_text: Optional[str],
+        current_text: str
+    ) -> List[DiffSpan]:
+        """
+        Find inserted and modified spans of current_text.
 
-        # Extract added portion
-        return current_text[len(previous_text):]
+        Args:
+            previous_text: Previous text (None for first save)
+            current_text: Current text
+
+        Returns:
+            Spans in document order (empty if text was only deleted or nothing changed)
+
+        Implementation:
+            - Trims the common prefix and suffix, so appends and single edits
+              anywhere in the document cost one pass over the text
+            - Pure insertion (nothing removed in between): one 'insert' span
+            - Otherwise the middle is diffed line by line in linear time: lines
+              of the current middle that do not occur in the previous middle
+              are new, and adjacent new lines are merged into 'replace' spans
+        """
+        if not previous_text:
+            if not current_text:
+                return []
+            return [DiffSpan(0, len(current_text), current_text, 'insert')]
+
+        prefix = self._common_prefix_length(previous_text, current_text)
+        suffix = self._common_suffix_length(
+            previous_text[prefix:], current_text[prefix:]
+        )
+        previous_middle = previous_text[prefix:len(previous_text) - suffix]
+        current_end = len(current_text) - suffix
+        current_middle = current_text[prefix:current_end]
+
+        # No change or pure deletion
+        if not current_middle:
+            return []
+
+        # Pure insertion
+        if not previous_middle:
+            return [DiffSpan(prefix, current_end, current_middle, 'insert')]
+
+        # Modification: keep only lines that are not in the previous middle
+        previous_lines = Counter(previous_middle.splitlines(keepends=True))
+        spans: List[DiffSpan] = []
+        offset = prefix
+        for line in current_middle.splitlines(keepends=True):
+            if previous_lines[line] > 0:
+                previous_lines[line] -= 1
+            elif line.strip():
+                if spans and spans[-1].end == offset:
+                    spans[-1].end += len(line)
+                    spans[-1].text += line
+                else:
+                    spans.append(DiffSpan(offset, offset + len(line), line, 'replace'))
+            offset += len(line)
+
+        return spans
+
+    def _common_prefix_length(self, a: str, b: str) -> int:
+        """
+        Length of the common prefix of two strings.
+
+        Args:
+            a: First string
+            b: Second string
+
+        Returns:
+            Number of leading characters shared by a and b
+
+        Implementation:
+            Compares COMPARE_BLOCK_CHARS-sized slices front to back (in C) and
+            locates the mismatch inside the first differing block, so the
+            strings are scanned once with block-sized copies
+        """
+        if b.startswith(a):
+            return len(a)
+
+        limit = min(len(a), len(b))
+        start = 0
+        while start < limit:
+            end = min(start + self.COMPARE_BLOCK_CHARS, limit)
+            block_a, block_b = a[start:end], b[start:end]
+            if block_a != block_b:
+                return start + len(os.path.commonprefix([block_a, block_b]))
+            start = end
+        return limit
+
+    def _common_suffix_length(self, a: str, b: str) -> int:
+        """
+        Length of the common suffix of two strings.
+
+        Args:
+            a: First string
+            b: Second string
+
+        Returns:
+            Number of trailing characters shared by a and b
+
+        Implementation:
+            Same block scan as _common_prefix_length(), back to front
+        """
+        limit = min(len(a), len(b))
+        matched = 0
+        while matched < limit:
+            size = min(self.COMPARE_BLOCK_CHARS, limit - matched)
+            block_a = a[len(a) - matched - size:len(a) - matched]
+            block_b = b[len(b) - matched - size:len(b) - matched]
+            if block_a != block_b:
+                return matched + len(os.path.commonprefix([block_a[::-1], block_b[::-1]]))
+            matched += size
+        return limit
 
     def vectorize_diff(
         self,
@@ -71,6 +218,7 @@ class DiffExtractor:
 
         Implementation:
             - Return None if diff_text is empty or whitespace-only
+            - Return the cached vector if the query cache has one
             - Use OllamaClient with mxbai-embed-large model
             - Retry up to max_retries with exponential backoff
             - Return None and log error if all retries fail
@@ -79,16 +227,23 @@ class DiffExtractor:
         if not diff_text or not diff_text.strip():
             return None
 
+        if self.query_cache is not None:
+            vector = self.query_cache.get(self.EMBEDDING_MODEL, diff_text)
+            if vector is not None:
+                return vector
+
         # Retry with exponential backoff
         for attempt in range(max_retries):
             try:
                 vector = self.ollama_client.embed(
-                    model="mxbai-embed-large",
+                    model=self.EMBEDDING_MODEL,
                     text=diff_text
                 )
 
                 # Validate vector dimension
                 if vector and len(vector) == 1024:
+                    if self.query_cache is not None:
+                        self.query_cache.put(self.EMBEDDING_MODEL, diff_text, vector)
                     return vector
 
                 logger.warning(
@@ -0,0 +1,162 @@
+"""
+Event Coalescer for Resonance Archive System.
+
+Collapses bursts of file events into a single callback per path once the file
+has been stable for the debounce period, and limits how many callbacks run
+at the same time for one file.
+"""
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class EventCoalescer:
+    """Per-path debouncing scheduler for file system events."""
+
+    def __init__(
+        self,
+        callback: Callable[[Any], None],
+        debounce_seconds: float = 2.0,
+        max_in_flight_per_path: int = 1,
+        max_workers: int = 4
+    ):
+        """
+        Initialize EventCoalescer.
+
+        Args:
+            callback: Function called with the latest event of a settled burst
+            debounce_seconds: Quiet period required after the last event of a path (default: 2.0)
+            max_in_flight_per_path: Maximum concurrent callbacks for one path (default: 1)
+            max_workers: Threads running callbacks (default: 4)
+
+        Note:
+            Events arriving while a path is at its in-flight limit are held and
+            coalesced into one follow-up callback after the running one finishes.
+        """
+        self.callback = callback
+        self.debounce_seconds = debounce_seconds
+        self.max_in_flight_per_path = max_in_flight_per_path
+        self.max_workers = max_workers
+
+        # Counters
+        self.events_received = 0
+        self.events_coalesced = 0  # Merged into an event already waiting for the same path
+        self.events_dispatched = 0
+        self.events_dropped = 0  # Still pending when the coalescer was stopped
+
+        self._condition = threading.Condition()
+        self._pending: Dict[str, Any] = {}  # Latest event per path
+        self._deadlines: Dict[str, float] = {}  # Dispatch time (monotonic) per path
+        self._in_flight: Dict[str, int] = {}
+        self._stopped = False
+        self._thread: Optional[threading.Thread] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def start(self) -> None:
+        """Start the scheduler thread."""
+        self._stopped = False
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="event-callback"
+        )
+        self._thread = threading.Thread(
+            target=self._run,
+            name="event-coalescer",
+            daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop scheduling, drop pending events and wait for running callbacks."""
+        with self._condition:
+            self._stopped = True
+            self.events_dropped += len(self._pending)
+            self._pending.clear()
+            self._deadlines.clear()
+            self._condition.notify()
+
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def submit(self, event: Any) -> None:
+        """
+        Record an event; the callback runs after the path settles.
+
+        Args:
+            event: FileSystemEvent (or any object with src_path)
+        """
+        path = event.src_path
+        with self._condition:
+            self.events_received += 1
+            if self._stopped:
+                self.events_dropped += 1
+                return
+
+            if path in self._pending:
+                self.events_coalesced += 1
+            self._pending[path] = event
+            # Every event restarts the quiet period of its path
+            self._deadlines[path] = time.monotonic() + self.debounce_seconds
+            self._condition.notify()
+
+    def _run(self) -> None:
+        """Scheduler loop: dispatch paths whose quiet period has elapsed."""
+        with self._condition:
+            while not self._stopped:
+                now = time.monotonic()
+                for path in [p for p, deadline in self._deadlines.items() if deadline <= now]:
+                    self._dispatch(path)
+
+                timeout = None
+                if self._deadlines:
+                    timeout = max(0.0, min(self._deadlines.values()) - now)
+                self._condition.wait(timeout)
+
+    def _dispatch(self, path: str) -> None:
+        """
+        Hand the pending event of a path to the callback pool (caller holds the lock).
+
+        Args:
+            path: File path whose deadline has passed
+        """
+        del self._deadlines[path]
+
+        if self._in_flight.get(path, 0) >= self.max_in_flight_per_path:
+            # Keep the event pending; _invoke reschedules it when a slot frees up
+            return
+
+        event = self._pending.pop(path)
+        self._in_flight[path] = self._in_flight.get(path, 0) + 1
+        self.events_dispatched += 1
+        self._executor.submit(self._invoke, path, event)
+
+    def _invoke(self, path: str, event: Any) -> None:
+        """
+        Run the callback and release the path's in-flight slot.
+
+        Args:
+            path: File path
+            event: Latest event of the settled burst
+        """
+        try:
+            self.callback(event)
+        except Exception:
+            logger.exception(f"Error in file event callback for {path}")
+        finally:
+            with self._condition:
+                self._in_flight[path] -= 1
+                if not self._in_flight[path]:
+                    del self._in_flight[path]
+
+                # Events held back while this callback ran are due immediately
+                if path in self._pending and path not in self._deadlines:
+                    self._deadlines[path] = time.monotonic()
+                self._condition.notify()
@@ -0,0 +1,107 @@
+"""
+File Fingerprint for Resonance Archive System.
+
+Detects saves that did not change a file's content, using a cheap
+(size, mtime) check first and a fast content hash only when the stat differs.
+"""
+import hashlib
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class FileFingerprint:
+    """Identifies one version of a file's content."""
+    size: int  # File size in bytes
+    mtime_ns: int  # os.stat().st_mtime_ns
+    digest: str  # BLAKE2b hex digest of the content
+
+
+class FingerprintTracker:
+    """Remembers the last seen fingerprint of each file."""
+
+    def __init__(self):
+        """Initialize FingerprintTracker."""
+        self.unchanged_by_stat = 0  # No-op saves dropped without reading the file
+        self.unchanged_by_hash = 0  # No-op saves dropped after hashing the content
+
+        self._lock = threading.Lock()
+        self._fingerprints: Dict[str, FileFingerprint] = {}
+
+    @staticmethod
+    def compute_digest(content: bytes) -> str:
+        """
+        Compute a fast content digest.
+
+        Args:
+            content: File content
+
+        Returns:
+            BLAKE2b (128-bit) hex digest
+        """
+        return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+    def get(self, path: str) -> Optional[FileFingerprint]:
+        """
+        Get the last recorded fingerprint of a file.
+
+        Args:
+            path: File path
+
+        Returns:
+            FileFingerprint or None if the file has not been seen
+        """
+        with self._lock:
+            return self._fingerprints.get(path)
+
+    def has_changed(self, path: str) -> bool:
+        """
+        Check whether a file's content changed since the last call, and record it.
+
+        Args:
+            path: File path
+
+        Returns:
+            True if the file is new or its content changed; False if unchanged
+            or missing
+
+        Implementation:
+            - Same size and mtime as before: unchanged, the file is not read
+            - Otherwise the content is hashed; an equal digest means a no-op save
+        """
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            with self._lock:
+                self._fingerprints.pop(path, None)
+            return False
+
+        with self._lock:
+            previous = self._fingerprints.get(path)
+            if previous and previous.size == stat.st_size and previous.mtime_ns == stat.st_mtime_ns:
+                self.unchanged_by_stat += 1
+                return False
+
+        try:
+            with open(path, 'rb') as f:
+                digest = self.compute_digest(f.read())
+        except OSError:
+            logger.warning(f"Failed to read {path} for fingerprinting")
+            return False
+
+        with self._lock:
+            self._fingerprints[path] = FileFingerprint(
+                size=stat.st_size,
+                mtime_ns=stat.st_mtime_ns,
+                digest=digest
+            )
+            if previous and previous.digest == digest:
+                self.unchanged_by_hash += 1
+                return False
+
+        return True
@@ -0,0 +1,142 @@
+"""
+File State Reader for Resonance Archive System.
+
+Reads diary files incrementally: when a file only grew by appending, only the
+appended bytes are decoded, and the rest of the text is reused from the
+previous read.
+"""
+import hashlib
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class FileState:
+    """Remembered content of a file as of its last read."""
+    size: int  # Byte size covered by text
+    digest: bytes  # BLAKE2b digest of those bytes
+    text: str  # Decoded content
+
+
+@dataclass
+class FileRead:
+    """Result of reading a file through FileStateReader."""
+    text: str  # Full current text
+    previous_text: Optional[str]  # Text as of the previous read (None on first read)
+    appended: Optional[str]  # Text appended since the previous read; None after a full read
+    full_read: bool  # True if the whole file was decoded
+    size: int  # Byte size of the file content
+    digest: bytes  # BLAKE2b digest of the file content
+
+
+class FileStateReader:
+    """Reads files, decoding only the appended tail of append-only edits."""
+
+    DIGEST_SIZE = 16
+
+    def __init__(self):
+        """
+        Initialize FileStateReader.
+
+        Note:
+            The whole previous content is verified by hashing the file's first
+            size bytes and comparing with the digest stored after the last
+            read, so any edit before the old end (even one that keeps the
+            length) falls back to a full decode. Hashing the bytes is far
+            cheaper than decoding and re-diffing the text.
+        """
+        # Counters
+        self.tail_reads = 0
+        self.full_reads = 0
+        self.bytes_read = 0
+        self.bytes_decoded = 0
+
+        self._lock = threading.Lock()
+        self._states: Dict[str, FileState] = {}
+
+    def read(self, path: str) -> FileRead:
+        """
+        Read the current text of a file.
+
+        Args:
+            path: File path
+
+        Returns:
+            FileRead with the full text and what changed since the previous read
+
+        Raises:
+            OSError: If the file cannot be read
+            UnicodeDecodeError: If the file is not valid UTF-8
+        """
+        with self._lock:
+            previous = self._states.get(path)
+
+        with open(path, 'rb') as f:
+            content = f.read()
+
+        if previous is not None and len(content) >= previous.size:
+            # Incremental hash: the prefix digest is extended with the appended bytes
+            hasher = hashlib.blake2b(memoryview(content)[:previous.size], digest_size=self.DIGEST_SIZE)
+            if hasher.digest() == previous.digest:
+                appended_bytes = content[previous.size:]
+                try:
+                    appended = appended_bytes.decode('utf-8')
+                except UnicodeDecodeError:
+                    # Tail starts or ends inside a character (file mid-write); read in full
+                    appended = None
+
+                if appended is not None:
+                    hasher.update(appended_bytes)
+                    state = FileState(
+                        size=len(content),
+                        digest=hasher.digest(),
+                        text=previous.text + appended
+                    )
+                    with self._lock:
+                        self._states[path] = state
+                        self.tail_reads += 1
+                        self.bytes_read += len(content)
+                        self.bytes_decoded += len(appended_bytes)
+                    return FileRead(
+                        text=state.text,
+                        previous_text=previous.text,
+                        appended=appended,
+                        full_read=False,
+                        size=state.size,
+                        digest=state.digest
+                    )
+
+        text = content.decode('utf-8')
+        state = FileState(
+            size=len(content),
+            digest=hashlib.blake2b(content, digest_size=self.DIGEST_SIZE).digest(),
+            text=text
+        )
+        with self._lock:
+            self._states[path] = state
+            self.full_reads += 1
+            self.bytes_read += len(content)
+            self.bytes_decoded += len(content)
+
+        return FileRead(
+            text=text,
+            previous_text=previous.text if previous else None,
+            appended=None,
+            full_read=True,
+            size=state.size,
+            digest=state.digest
+        )
+
+    def forget(self, path: str) -> None:
+        """
+        Drop the remembered state of a file (e.g. after it was deleted).
+
+        Args:
+            path: File path
+        """
+        with self._lock:
+            self._states.pop(path, None)
@@ -7,13 +7,21 @@ import logging
 from pathlib import Path
 from typing import Callable
 from watchdog.observers import Observer
-from watchdog.events import FileSystemEventHandler
+from watchdog.events import FileModifiedEvent, FileSystemEventHandler
+
+from src.phase2_realtime_analysis.event_coalescer import EventCoalescer
+from src.phase2_realtime_analysis.file_fingerprint import FingerprintTracker
 
 logger = logging.getLogger(__name__)
 
 
 class DiaryFileHandler(FileSystemEventHandler):
-    """Event handler for diary file modifications."""
+    """
+    Event handler for diary file modifications.
+
+    Editors that save atomically write a temporary file and rename it over the
+    diary file, so created and moved events are reported as modifications too.
+    """
 
     def __init__(self, callback: Callable):
         """
@@ -39,28 +47,80 @@ class DiaryFileHandler(FileSystemEventHandler):
                 logger.debug(f"File modified: {event.src_path}")
                 self.callback(event)
 
+    def on_created(self, event):
+        """
+        Handle file creation events as modifications.
+
+        Args:
+            event: FileSystemEvent from Watchdog
+        """
+        self.on_modified(event)
+
+    def on_moved(self, event):
+        """
+        Handle renames onto a diary file (atomic save) as modifications.
+
+        Args:
+            event: FileSystemMovedEvent from Watchdog
+        """
+        if not event.is_directory and event.dest_path.endswith('.md'):
+            logger.debug(f"File replaced: {event.dest_path}")
+            self.callback(FileModifiedEvent(event.dest_path))
+
 
 class FileWatcher:
     """Watches diary files for changes using Watchdog."""
 
-    def __init__(self, vault_root: str, on_change_callback: Callable):
+    def __init__(
+        self,
+        vault_root: str,
+        on_change_callback: Callable,
+        debounce_seconds: float = 2.0,
+        max_in_flight_per_path: int = 1
+    ):
         """
         Initialize FileWatcher.
 
         Args:
             vault_root: Root directory of the Obsidian vault
             on_change_callback: Callback function to execute when files change
+            debounce_seconds: Seconds a file must stay unchanged before the callback runs
+                (default: 2.0)
+            max_in_flight_per_path: Maximum concurrent callbacks for one file (default: 1)
         """
         self.vault_root = vault_root
         self.diary_dir = str(Path(vault_root) / "01_diary")
         self.callback = on_change_callback
 
+        # Drop saves that did not change the file before any analysis happens
+        self.fingerprints = FingerprintTracker()
+
+        # Collapse editor save bursts into one callback per file
+        self.coalescer = EventCoalescer(
+            callback=self._on_settled,
+            debounce_seconds=debounce_seconds,
+            max_in_flight_per_path=max_in_flight_per_path
+        )
+
         # Create event handler
-        self.event_handler = DiaryFileHandler(callback=on_change_callback)
+        self.event_handler = DiaryFileHandler(callback=self.coalescer.submit)
 
         # Create observer (not started yet)
         self.observer = Observer()
 
+    def _on_settled(self, event):
+        """
+        Forward a debounced event unless the file content is unchanged.
+
+        Args:
+            event: Latest FileSystemEvent of a settled burst
+        """
+        if not self.fingerprints.has_changed(event.src_path):
+            logger.debug(f"Unchanged save ignored: {event.src_path}")
+            return
+
+        self.callback(event)
+
     def start(self):
         """Start watching the diary directory."""
         logger.info(f"Starting file watcher on: {self.diary_dir}")
@@ -72,7 +132,8 @@ class FileWatcher:
             recursive=True
         )
 
-        # Start observer thread
+        # Start event scheduler and observer thread
+        self.coalescer.start()
         self.observer.start()
 
     def stop(self):
@@ -80,3 +141,11 @@ class FileWatcher:
         logger.info("Stopping file watcher")
         self.observer.stop()
         self.observer.join()
+        self.coalescer.stop()
+        logger.info(
+            f"File events: {self.coalescer.events_received} received, "
+            f"{self.coalescer.events_coalesced} coalesced, "
+            f"{self.coalescer.events_dispatched} dispatched, "
+            f"{self.coalescer.events_dropped} dropped, "
+            f"{self.fingerprints.unchanged_by_stat + self.fingerprints.unchanged_by_hash} unchanged"
+        )
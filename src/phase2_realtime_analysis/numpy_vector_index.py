@@ -0,0 +1,423 @@
+"""
+NumPy Vector Index for Resonance Archive System.
+
+Keeps an in-memory float32 mirror of the ChromaDB vectors and answers
+similarity queries with one exact matrix-vector product. The mirror can be
+saved as a memory-mappable snapshot for fast cold starts.
+"""
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class NumpyVectorIndex:
+    """
+    Exact-search mirror of the vector store.
+
+    Distances are squared L2, the same metric as ChromaDB's default "l2"
+    space, so results are interchangeable with the Chroma query path.
+    Register the index with ChromaDBIndexer.add_listener() to keep it in
+    sync with writes.
+    """
+
+    LEVELS = ("summary", "chunk")
+
+    # Snapshot layout: <root>/CURRENT names the live <root>/snapshot-<ns>/ directory
+    SNAPSHOT_POINTER = "CURRENT"
+    SNAPSHOT_VERSION = 1
+
+    # Rows of a float16 snapshot converted to float32 per step of a search
+    UPCAST_BLOCK_ROWS = 4096
+
+    def __init__(self, dimension: int = 1024, initial_capacity: int = 1024):
+        """
+        Initialize NumpyVectorIndex.
+
+        Args:
+            dimension: Vector dimension (default: 1024)
+            initial_capacity: Rows allocated up front; capacity doubles when full (default: 1024)
+        """
+        self.dimension = dimension
+        self.snapshot_path: Optional[str] = None  # Snapshot directory this index was opened from
+
+        self._lock = threading.Lock()
+        self._vectors = np.empty((initial_capacity, dimension), dtype=np.float32)
+        self._squared_norms = np.empty(initial_capacity, dtype=np.float32)
+        self._levels = np.empty(initial_capacity, dtype=np.int8)  # Index into LEVELS, -1 if unknown
+        self._ids: List[str] = []
+        self._metadatas: List[Dict[str, Any]] = []
+        self._rows: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        """Return the number of mirrored vectors."""
+        return len(self._ids)
+
+    def load(self, indexer, page_size: int = 5000) -> int:
+        """
+        Replace the mirror with every vector stored by an indexer.
+
+        Args:
+            indexer: ChromaDBIndexer (single or per-level collections)
+            page_size: Vectors fetched per ChromaDB get() call (default: 5000)
+
+        Returns:
+            Number of vectors loaded
+
+        Note:
+            Register the index as a listener before loading. The whole load
+            holds the indexer's client_lock, and the indexer notifies listeners
+            under that lock, so every write lands either in the loaded pages or
+            in a notification after the load; a page can never put back rows
+            that a concurrent delete removed. Writes wait for the load.
+        """
+        with indexer.client_lock:
+            with self._lock:
+                self._ids = []
+                self._metadatas = []
+                self._rows = {}
+
+            for collection in indexer.all_collections():
+                offset = 0
+                while True:
+                    page = collection.get(
+                        limit=page_size,
+                        offset=offset,
+                        include=["embeddings", "metadatas"]
+                    )
+                    if not page["ids"]:
+                        break
+                    self.upsert(page["ids"], page["embeddings"], page["metadatas"])
+                    offset += len(page["ids"])
+
+        logger.info(f"Loaded {len(self)} vectors into the NumPy index")
+        return len(self)
+
+    def upsert(
+        self,
+        ids: Sequence[str],
+        embeddings: Sequence[Sequence[float]],
+        metadatas: Sequence[Dict[str, Any]]
+    ) -> None:
+        """
+        Insert or replace vectors (indexer write listener).
+
+        Args:
+            ids: Vector IDs
+            embeddings: Vectors aligned with ids
+            metadatas: Metadata aligned with ids
+        """
+        matrix = np.asarray(embeddings, dtype=np.float32).reshape(len(ids), self.dimension)
+        with self._lock:
+            for id, vector, metadata in zip(ids, matrix, metadatas):
+                row = self._rows.get(id)
+                if row is None:
+                    row = len(self._ids)
+                    self._ensure_capacity(row + 1)
+                    self._rows[id] = row
+                    self._ids.append(id)
+                    self._metadatas.append(metadata)
+                else:
+                    self._metadatas[row] = metadata
+
+                self._vectors[row] = vector
+                self._squared_norms[row] = float(np.dot(vector, vector))
+                level = metadata.get("type") if metadata else None
+                self._levels[row] = self.LEVELS.index(level) if level in self.LEVELS else -1
+
+    def delete(self, ids: Sequence[str]) -> None:
+        """
+        Remove vectors (indexer write listener).
+
+        Args:
+            ids: Vector IDs; unknown IDs are ignored
+        """
+        with self._lock:
+            for id in ids:
+                row = self._rows.pop(id, None)
+                if row is None:
+                    continue
+
+                # Move the last row into the hole to keep the matrix contiguous
+                last = len(self._ids) - 1
+                if row != last:
+                    moved_id = self._ids[last]
+                    self._vectors[row] = self._vectors[last]
+                    self._squared_norms[row] = self._squared_norms[last]
+                    self._levels[row] = self._levels[last]
+                    self._ids[row] = moved_id
+                    self._metadatas[row] = self._metadatas[last]
+                    self._rows[moved_id] = row
+                self._ids.pop()
+                self._metadatas.pop()
+
+    def search(
+        self,
+        query_vector: Sequence[float],
+        top_k: int,
+        level: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Find the nearest vectors by exact search.
+
+        Args:
+            query_vector: Query embedding vector
+            top_k: Number of results
+            level: "summary" or "chunk" to search one level (default: all)
+
+        Returns:
+            List of result dictionaries with keys: id, distance, metadata,
+            sorted by distance (ascending)
+
+        Implementation:
+            - Squared L2 distance from precomputed norms and one matrix-vector product
+            - A float16 snapshot is up-cast block by block, never as a whole
+            - argpartition selects top_k before sorting only those
+        """
+        if level is not None:
+            return self.search_levels(query_vector, {level: top_k})[level]
+
+        query = np.asarray(query_vector, dtype=np.float32)
+        with self._lock:
+            count = len(self._ids)
+            return self._nearest(np.arange(count), self._distances(count, query), top_k)
+
+    def search_levels(
+        self,
+        query_vector: Sequence[float],
+        top_ks: Dict[str, int]
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Find the nearest vectors of several levels with one pass over the matrix.
+
+        Args:
+            query_vector: Query embedding vector
+            top_ks: Number of results per level, e.g. {"summary": 5, "chunk": 10}
+
+        Returns:
+            Results per level, as returned by search()
+
+        Implementation:
+            - One matrix-vector product for all rows; each level then selects
+              its nearest rows through its level mask
+        """
+        query = np.asarray(query_vector, dtype=np.float32)
+        with self._lock:
+            count = len(self._ids)
+            distances = self._distances(count, query)
+            levels = self._levels[:count]
+            return {
+                level: self._nearest(
+                    np.flatnonzero(levels == self.LEVELS.index(level)), distances, top_k
+                )
+                for level, top_k in top_ks.items()
+            }
+
+    def save_snapshot(self, root: str, dtype: str = "float32", keep: int = 2) -> str:
+        """
+        Write the index as a memory-mappable snapshot and make it current.
+
+        Args:
+            root: Snapshot root directory
+            dtype: Stored vector type, "float32" or "float16" (half the size;
+                queries then up-cast it block by block) (default: float32)
+            keep: Snapshots kept on disk, including the new one (default: 2)
+
+        Returns:
+            Path of the new snapshot directory
+
+        Implementation:
+            - vectors.npy, norms.npy and levels.npy are plain .npy files that
+              np.load(mmap_mode=...) maps without reading them
+            - sidecar.json holds IDs and metadata in row order
+            - The snapshot is written to a fresh directory, then CURRENT is
+              replaced atomically, so readers see the old or the new snapshot
+        """
+        if dtype not in ("float32", "float16"):
+            raise ValueError(f"Unsupported snapshot dtype: {dtype}")
+
+        with self._lock:
+            count = len(self._ids)
+            vectors = self._vectors[:count].astype(dtype)
+            norms = np.array(self._squared_norms[:count])
+            levels = np.array(self._levels[:count])
+            sidecar = {
+                'version': self.SNAPSHOT_VERSION,
+                'dimension': self.dimension,
+                'dtype': dtype,
+                'ids': list(self._ids),
+                'metadatas': list(self._metadatas)
+            }
+
+        os.makedirs(root, exist_ok=True)
+        name = f"snapshot-{time.time_ns()}"
+        directory = os.path.join(root, name)
+        os.makedirs(directory)
+        np.save(os.path.join(directory, "vectors.npy"), vectors)
+        np.save(os.path.join(directory, "norms.npy"), norms)
+        np.save(os.path.join(directory, "levels.npy"), levels)
+        with open(os.path.join(directory, "sidecar.json"), 'w', encoding='utf-8') as f:
+            json.dump(sidecar, f, ensure_ascii=False)
+
+        pointer = os.path.join(root, self.SNAPSHOT_POINTER)
+        with open(f"{pointer}.tmp", 'w', encoding='utf-8') as f:
+            f.write(name)
+        os.replace(f"{pointer}.tmp", pointer)
+
+        # Older snapshots may still be mapped by running readers; on POSIX
+        # their pages stay valid after the files are removed
+        snapshots = sorted(entry for entry in os.listdir(root) if entry.startswith("snapshot-"))
+        for old in snapshots[:-keep]:
+            shutil.rmtree(os.path.join(root, old), ignore_errors=True)
+
+        logger.info(f"Saved snapshot of {count} vectors to {directory}")
+        return directory
+
+    @classmethod
+    def current_snapshot(cls, root: str) -> Optional[str]:
+        """
+        Get the current snapshot directory.
+
+        Args:
+            root: Snapshot root directory
+
+        Returns:
+            Path of the snapshot CURRENT points to, or None if there is none
+        """
+        try:
+            with open(os.path.join(root, cls.SNAPSHOT_POINTER), 'r', encoding='utf-8') as f:
+                name = f.read().strip()
+        except FileNotFoundError:
+            return None
+        return os.path.join(root, name)
+
+    @classmethod
+    def load_snapshot(cls, root: str) -> 'NumpyVectorIndex':
+        """
+        Open the current snapshot without reading the vectors into memory.
+
+        Args:
+            root: Snapshot root directory
+
+        Returns:
+            NumpyVectorIndex backed by copy-on-write memory maps; later
+            upserts and deletes change only this process's copy
+
+        Raises:
+            FileNotFoundError: If root has no snapshot
+            ValueError: If the snapshot version is not supported
+        """
+        directory = cls.current_snapshot(root)
+        if directory is None:
+            raise FileNotFoundError(f"No vector snapshot in {root}")
+
+        with open(os.path.join(directory, "sidecar.json"), 'r', encoding='utf-8') as f:
+            sidecar = json.load(f)
+        if sidecar.get('version') != cls.SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported snapshot version {sidecar.get('version')}")
+
+        index = cls(dimension=sidecar['dimension'], initial_capacity=0)
+        index._vectors = np.load(os.path.join(directory, "vectors.npy"), mmap_mode='c')
+        index._squared_norms = np.load(os.path.join(directory, "norms.npy"), mmap_mode='c')
+        index._levels = np.load(os.path.join(directory, "levels.npy"), mmap_mode='c')
+        index._ids = sidecar['ids']
+        index._metadatas = sidecar['metadatas']
+        index._rows = {id: row for row, id in enumerate(index._ids)}
+        index.snapshot_path = directory
+        return index
+
+    def _distances(self, count: int, query: np.ndarray) -> np.ndarray:
+        """
+        Squared L2 distances of the first count vectors to a query (caller holds the lock).
+
+        Args:
+            count: Number of rows
+            query: float32 query vector
+
+        Returns:
+            float32 array of count distances
+        """
+        distances = self._squared_norms[:count] - 2.0 * self._products(count, query)
+        distances += float(np.dot(query, query))
+        return distances
+
+    def _nearest(
+        self,
+        candidates: np.ndarray,
+        distances: np.ndarray,
+        top_k: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Format the top_k candidate rows nearest to the query (caller holds the lock).
+
+        Args:
+            candidates: Row numbers to choose from
+            distances: Distances of all rows
+            top_k: Number of results
+
+        Returns:
+            List of result dictionaries, sorted by distance (ascending)
+        """
+        k = min(top_k, len(candidates))
+        if k == 0:
+            return []
+
+        candidate_distances = distances[candidates]
+        nearest = np.argpartition(candidate_distances, k - 1)[:k]
+        nearest = nearest[np.argsort(candidate_distances[nearest])]
+
+        return [
+            {
+                "id": self._ids[candidates[i]],
+                "distance": max(float(candidate_distances[i]), 0.0),
+                "metadata": self._metadatas[candidates[i]]
+            }
+            for i in nearest
+        ]
+
+    def _products(self, count: int, query: np.ndarray) -> np.ndarray:
+        """
+        Dot products of the first count vectors with a query (caller holds the lock).
+
+        Args:
+            count: Number of rows
+            query: float32 query vector
+
+        Returns:
+            float32 array of count products
+
+        Note:
+            Mixing float16 rows with a float32 query would make NumPy convert
+            the whole mapped matrix for every query; converting
+            UPCAST_BLOCK_ROWS rows at a time keeps float32 BLAS precision and
+            speed with a bounded temporary.
+        """
+        vectors = self._vectors
+        if vectors.dtype == np.float32:
+            return vectors[:count] @ query
+
+        products = np.empty(count, dtype=np.float32)
+        for start in range(0, count, self.UPCAST_BLOCK_ROWS):
+            end = min(start + self.UPCAST_BLOCK_ROWS, count)
+            products[start:end] = vectors[start:end].astype(np.float32) @ query
+        return products
+
+    def _ensure_capacity(self, rows: int) -> None:
+        """Grow the arrays (doubling) to hold at least rows vectors (caller holds the lock)."""
+        capacity = len(self._vectors)
+        if rows <= capacity:
+            return
+
+        capacity = max(capacity, 1)
+        while capacity < rows:
+            capacity *= 2
+        self._vectors = np.resize(self._vectors, (capacity, self.dimension))
+        self._squared_norms = np.resize(self._squared_norms, capacity)
+        self._levels = np.resize(self._levels, capacity)
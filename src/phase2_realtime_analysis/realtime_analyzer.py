@@ -0,0 +1,612 @@
+"""
+Realtime Analyzer for Resonance Archive System.
+
+Runs the realtime flow (diff extraction → diff embedding → similarity search →
+Pod201 report) on an asyncio event loop in a background thread, so Watchdog
+event delivery is never blocked by Ollama requests.
+"""
+import asyncio
+import logging
+import threading
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from src.phase2_realtime_analysis.adaptive_thresholds import AdaptiveThresholds
+from src.phase2_realtime_analysis.diff_extractor import DiffExtractor, DiffSpan
+from src.phase2_realtime_analysis.file_state_reader import FileRead, FileStateReader
+from src.phase2_realtime_analysis.realtime_state import RealtimeStateStore
+from src.phase2_realtime_analysis.semantic_change_gate import SemanticChangeGate
+from src.phase2_realtime_analysis.structural_signal_detector import StructuralSignal, StructuralSignalDetector
+from src.phase2_realtime_analysis.timing_delta_signal_detector import TimingDeltaSignalDetector
+from src.phase2_realtime_analysis.trigger_decision_engine import TriggerDecisionEngine
+from src.phase2_realtime_analysis.trigger_rate_limiter import TriggerRateLimiter
+from src.utils.async_ollama_client import AsyncOllamaClient
+from src.utils.query_vector_cache import QueryVectorCache
+
+logger = logging.getLogger(__name__)
+
+
+class RealtimeAnalyzer:
+    """Analyzes diary changes asynchronously, cancelling stale analyses."""
+
+    EMBEDDING_MODEL = "mxbai-embed-large"
+
+    def __init__(
+        self,
+        ollama_client: AsyncOllamaClient,
+        similarity_searcher,
+        result_integrator,
+        report_generator,
+        diff_extractor: Optional[DiffExtractor] = None,
+        on_report: Optional[Callable[[str, str], None]] = None,
+        on_token: Optional[Callable[[str, str], None]] = None,
+        max_retries: int = 3,
+        file_reader: Optional[FileStateReader] = None,
+        state_store: Optional[RealtimeStateStore] = None,
+        rate_limiter: Optional[TriggerRateLimiter] = None,
+        change_gate: Optional[SemanticChangeGate] = None,
+        query_cache: Optional[QueryVectorCache] = None,
+        trigger_engine: Optional[TriggerDecisionEngine] = None,
+        adaptive_thresholds: Optional[AdaptiveThresholds] = None
+    ):
+        """
+        Initialize RealtimeAnalyzer.
+
+        Args:
+            ollama_client: AsyncOllamaClient used for diff embeddings
+            similarity_searcher: SimilaritySearcher instance
+            result_integrator: ResultIntegrator instance
+            report_generator: Pod201ReportGenerator constructed with an AsyncOllamaClient
+            diff_extractor: DiffExtractor used to extract added text (default: create new)
+            on_report: Called with (file_path, report) when an analysis completes
+            on_token: Called with (file_path, fragment) while the report streams in;
+                a cancelled analysis stops streaming part way
+            max_retries: Maximum embedding attempts per analysis (default: 3)
+            file_reader: FileStateReader used to read changed files (default: create new)
+            state_store: Loaded RealtimeStateStore that persists analyzed state across
+                restarts (default: state is kept in memory only)
+            rate_limiter: TriggerRateLimiter bounding how often analyses start
+                (default: no limit)
+            change_gate: SemanticChangeGate that skips search and report generation
+                for diffs that add nothing new (default: always analyze)
+            query_cache: QueryVectorCache consulted before embedding a diff; share it
+                with the DiffExtractor and other query-side callers (default: no cache)
+            trigger_engine: TriggerDecisionEngine that decides from timing, delta and
+                structural signals whether a save is analyzed (default: analyze every save)
+            adaptive_thresholds: Loaded AdaptiveThresholds that learns from every save
+                and sets the timing/delta thresholds; triggers are reported back to it
+                as rate feedback (default: fixed thresholds)
+        """
+        self.ollama_client = ollama_client
+        self.similarity_searcher = similarity_searcher
+        self.result_integrator = result_integrator
+        self.report_generator = report_generator
+        self.diff_extractor = diff_extractor or DiffExtractor()
+        self.on_report = on_report
+        self.on_token = on_token
+        self.max_retries = max_retries
+        self.file_reader = file_reader or FileStateReader()
+        self.state_store = state_store
+        self.rate_limiter = rate_limiter
+        self.change_gate = change_gate
+        self.query_cache = query_cache
+        self.trigger_engine = trigger_engine
+        self.adaptive_thresholds = adaptive_thresholds
+        self.timing_detector = TimingDeltaSignalDetector()
+        self.structural_detector = StructuralSignalDetector()
+
+        self.analyses_completed = 0
+        self.analyses_cancelled = 0
+        self.analyses_deferred = 0  # Postponed by the rate limiter
+        self.analyses_superseded = 0  # Deferred requests replaced by a newer one
+        self.analyses_not_triggered = 0  # Saves below the trigger engine's threshold
+
+        # Text of each file as of its last completed analysis
+        self._analyzed_texts: Dict[str, str] = {}
+        # (last read text, analyzed text, offset) per file while the last read
+        # text is the analyzed text with only appends after offset
+        self._append_bases: Dict[str, Tuple[str, Optional[str], int]] = {}
+        # Time of each file's latest save event
+        self._save_times: Dict[str, float] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        # Save evaluations in progress, run one at a time per file
+        self._evaluations: Set[asyncio.Task] = set()
+        self._evaluation_locks: Dict[str, asyncio.Lock] = {}
+        # Latest triggered save per file: (read, save time, diff base, diff text)
+        self._pending: Dict[str, Tuple[FileRead, float, Optional[str], str]] = {}
+        # Rate-limited requests waiting for a start slot, latest per file
+        self._deferred: Dict[str, asyncio.TimerHandle] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start the event loop thread."""
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever,
+            name="realtime-analyzer",
+            daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Cancel in-flight analyses, close the client and stop the event loop."""
+        if self._loop is None:
+            return
+
+        asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._loop = None
+        self._thread = None
+
+    def on_file_event(self, event) -> None:
+        """
+        FileWatcher callback: schedule analysis of the changed file.
+
+        Args:
+            event: FileSystemEvent from Watchdog
+        """
+        self.submit(event.src_path)
+
+    def submit(self, file_path: str) -> None:
+        """
+        Schedule analysis of a file; returns immediately.
+
+        Thread-safe. Every save is evaluated, timed from when it was submitted,
+        and only saves the trigger engine accepts start an analysis. An analysis still in flight for the same
+        file is then cancelled, since its result would already be stale. With
+        a rate limiter, a triggered save without a free start slot waits for
+        one; a newer triggered save for the same file replaces the waiting one.
+
+        Args:
+            file_path: Path of the changed file
+        """
+        if self._loop is None:
+            raise RuntimeError("RealtimeAnalyzer is not started")
+
+        self._loop.call_soon_threadsafe(self._schedule, file_path, time.time())
+
+    def _schedule(self, file_path: str, save_time: Optional[float] = None) -> asyncio.Task:
+        """
+        Start evaluating a save on the event loop thread.
+
+        Args:
+            file_path: Path of the changed file
+            save_time: Time the save was submitted (default: now)
+
+        Returns:
+            Evaluation task
+        """
+        if save_time is None:
+            save_time = time.time()
+        previous_save_time = self._record_save_time(file_path, save_time)
+        task = self._loop.create_task(self._evaluate_save(file_path, save_time, previous_save_time))
+        self._evaluations.add(task)
+        task.add_done_callback(self._evaluations.discard)
+        return task
+
+    def _record_save_time(self, file_path: str, save_time: float) -> Optional[float]:
+        """
+        Record a save event before any evaluation, rate limiting or deferral.
+
+        Args:
+            file_path: Path of the changed file
+            save_time: Time of the save
+
+        Returns:
+            Time of the file's previous save, or None for its first one
+        """
+        previous_save_time = self._save_times.get(file_path)
+        if previous_save_time is None and self.state_store is not None:
+            # After a restart the pause is measured from the last analyzed save
+            state = self.state_store.get(file_path)
+            if state is not None:
+                previous_save_time = state.timestamp
+        self._save_times[file_path] = save_time
+        return previous_save_time
+
+    async def _evaluate_save(
+        self,
+        file_path: str,
+        save_time: float,
+        previous_save_time: Optional[float]
+    ) -> None:
+        """
+        Evaluate a save and start an analysis if it triggers.
+
+        Args:
+            file_path: Path of the changed file
+            save_time: Time of the save
+            previous_save_time: Time of the file's previous save, if any
+        """
+        try:
+            triggered = await self._evaluate(file_path, save_time, previous_save_time)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception(f"Realtime analysis failed for {file_path}")
+            return
+
+        if triggered:
+            self._start(file_path)
+
+    def _start(self, file_path: str) -> None:
+        """
+        Start an analysis task for a triggered save, subject to the rate limiter.
+
+        Args:
+            file_path: Path of the changed file
+        """
+        deferred = self._deferred.pop(file_path, None)
+        if deferred is not None:
+            deferred.cancel()
+            self.analyses_superseded += 1
+
+        if self.rate_limiter is not None:
+            wait = self.rate_limiter.acquire(file_path)
+            if wait > 0:
+                # The in-flight analysis, if any, keeps running until this one can start
+                self._deferred[file_path] = self._loop.call_later(
+                    wait, self._start_deferred, file_path
+                )
+                self.analyses_deferred += 1
+                logger.debug(f"Deferred analysis of {file_path} by {wait:.1f}s")
+                return
+
+        previous = self._tasks.get(file_path)
+        if previous is not None and not previous.done():
+            previous.cancel()
+            self.analyses_cancelled += 1
+            logger.debug(f"Cancelled stale analysis of {file_path}")
+
+        task = self._loop.create_task(self._run(file_path))
+        self._tasks[file_path] = task
+        task.add_done_callback(lambda done: self._forget(file_path, done))
+
+    def _start_deferred(self, file_path: str) -> None:
+        """
+        Retry a rate-limited analysis once its wait has elapsed.
+
+        Args:
+            file_path: Path of the changed file
+        """
+        del self._deferred[file_path]
+        self._start(file_path)
+
+    def _forget(self, file_path: str, task: asyncio.Task) -> None:
+        """
+        Drop a finished task unless a newer one replaced it.
+
+        Args:
+            file_path: Path of the analyzed file
+            task: Finished task
+        """
+        if self._tasks.get(file_path) is task:
+            del self._tasks[file_path]
+
+    async def _run(self, file_path: str) -> None:
+        """
+        Analyze the latest triggered save of a file and deliver the report.
+
+        Args:
+            file_path: Path of the changed file
+        """
+        try:
+            report = await self._analyze_triggered(file_path)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception(f"Realtime analysis failed for {file_path}")
+            return
+
+        if report is not None and self.on_report is not None:
+            self.on_report(file_path, report)
+
+    async def analyze(self, file_path: str) -> Optional[str]:
+        """
+        Run the realtime flow for one file.
+
+        Evaluates the save and, if it triggers, analyzes it right away; the
+        rate limiter only applies to saves scheduled with submit().
+
+        Args:
+            file_path: Path of the changed file
+
+        Returns:
+            Pod201 report, or None if nothing was added, the trigger engine did
+            not trigger, the diff could not be embedded, or the change gate found
+            nothing new
+        """
+        save_time = time.time()
+        previous_save_time = self._record_save_time(file_path, save_time)
+        if not await self._evaluate(file_path, save_time, previous_save_time):
+            return None
+        return await self._analyze_triggered(file_path)
+
+    async def _evaluate(
+        self,
+        file_path: str,
+        save_time: float,
+        previous_save_time: Optional[float]
+    ) -> bool:
+        """
+        Read a save and decide whether it is analyzed.
+
+        Args:
+            file_path: Path of the changed file
+            save_time: Time of the save
+            previous_save_time: Time of the file's previous save, if any
+
+        Returns:
+            True if the save triggered; its text and diff are then kept as the
+            file's pending analysis, replacing an older pending one
+
+        Implementation:
+            - Saves of one file are evaluated one at a time, in order
+            - File reads run in worker threads
+            - While the file was only appended to since the last analysis, the
+              verified tail from the FileStateReader is the diff, so the text is
+              not compared again
+            - Diff is taken against the text of the last completed analysis, so
+              text from cancelled analyses is included in the next one
+            - After a restart that text is restored from the state store; a file
+              edited while the analyzer was not running is resynchronized
+              without analysis instead of being analyzed as a whole
+            - Every submitted save is evaluated, so adaptive thresholds learn
+              from each one exactly once, with the pause measured between
+              submit times, before the trigger engine evaluates it
+            - Structural signals are found in the current text within each
+              changed span, so a paragraph break completed by the edit counts
+              and the newlines joining spans in the diff text do not
+            - A save that does not trigger is not marked analyzed, so its text is
+              part of the next diff
+        """
+        lock = self._evaluation_locks.setdefault(file_path, asyncio.Lock())
+        async with lock:
+            # Append-only edits read just the new tail of the file
+            file_read = await asyncio.to_thread(self.file_reader.read, file_path)
+            current_text = file_read.text
+
+            # Each save is learned from exactly once
+            if self.adaptive_thresholds is not None:
+                await asyncio.to_thread(
+                    self.adaptive_thresholds.record_save,
+                    save_time - previous_save_time if previous_save_time is not None else None,
+                    len(current_text) - len(file_read.previous_text) if file_read.previous_text is not None else 0,
+                    self.timing_detector
+                )
+
+            previous_text = self._analyzed_texts.get(file_path)
+            unanalyzed_start = self._unanalyzed_start(file_path, file_read, previous_text)
+            if previous_text is None and self.state_store is not None and self.state_store.get(file_path):
+                previous_text = self.state_store.restore_text(file_path, current_text)
+                if previous_text is None:
+                    logger.info(f"{file_path} changed while not watched, resynchronizing")
+                    await self._mark_analyzed(file_path, file_read, save_time)
+                    return False
+                self._analyzed_texts[file_path] = previous_text
+                # restore_text() verified it as a prefix of the current text
+                unanalyzed_start = len(previous_text)
+
+            if unanalyzed_start is not None:
+                spans = [
+                    DiffSpan(unanalyzed_start, len(current_text), current_text[unanalyzed_start:], 'insert')
+                ] if unanalyzed_start < len(current_text) else []
+            else:
+                spans = self.diff_extractor.extract_spans(previous_text, current_text)
+                if len(spans) == 1 and spans[0].kind == 'insert' and spans[0].end == len(current_text):
+                    unanalyzed_start = spans[0].start
+
+            if unanalyzed_start is not None:
+                self._append_bases[file_path] = (current_text, previous_text, unanalyzed_start)
+            else:
+                self._append_bases.pop(file_path, None)
+
+            diff_text = self.diff_extractor.join_spans(spans)
+            if not diff_text.strip():
+                await self._mark_analyzed(file_path, file_read, save_time)
+                return False
+
+            if self.trigger_engine is not None:
+                saved_text = file_read.previous_text if file_read.previous_text is not None else previous_text
+                triggered = self.trigger_engine.should_trigger_lazy([
+                    (
+                        self.timing_detector.SIGNAL_TYPES,
+                        self.timing_detector.iter_signals(saved_text, previous_save_time, current_text, save_time)
+                    ),
+                    (self.structural_detector.SIGNAL_TYPES, self._structural_signals(current_text, spans)),
+                ])
+                if not triggered:
+                    self.analyses_not_triggered += 1
+                    return False
+
+            # Rate feedback counts every save that triggers
+            if self.adaptive_thresholds is not None:
+                self.adaptive_thresholds.record_trigger()
+
+            self._pending[file_path] = (file_read, save_time, previous_text, diff_text)
+            return True
+
+    def _unanalyzed_start(
+        self,
+        file_path: str,
+        file_read: FileRead,
+        previous_text: Optional[str]
+    ) -> Optional[int]:
+        """
+        Offset where text not yet analyzed begins, if the file was only appended to.
+
+        Args:
+            file_path: Path of the changed file
+            file_read: Current read of the file
+            previous_text: Text of the last completed analysis (None if none)
+
+        Returns:
+            Offset in file_read.text, or None if it has to be found by diffing
+
+        Implementation:
+            - Valid only if this read was a verified tail read, the previous read
+              is the one the offset was recorded for, and no analysis completed
+              since; texts are compared by identity, so nothing is rescanned
+        """
+        base = self._append_bases.get(file_path)
+        if base is None or file_read.appended is None:
+            return None
+
+        read_text, analyzed_text, start = base
+        if read_text is file_read.previous_text and analyzed_text is previous_text:
+            return start
+        return None
+
+    def _structural_signals(self, current_text: str, spans: List[DiffSpan]) -> Iterator[StructuralSignal]:
+        """
+        Lazily yield the structural signals of the changed spans.
+
+        Args:
+            current_text: Current file text
+            spans: Changed spans of current_text, in document order
+
+        Yields:
+            Signals that end inside a span and start before its end; one that
+            begins just before the span (e.g. the first newline of a paragraph
+            break) counts
+        """
+        for span in spans:
+            for signal in self.structural_detector.iter_signals(current_text, start=span.start):
+                if signal.position >= span.end:
+                    break
+                yield signal
+
+    async def _analyze_triggered(self, file_path: str) -> Optional[str]:
+        """
+        Embed, search and report the pending analysis of a file.
+
+        Args:
+            file_path: Path of the changed file
+
+        Returns:
+            Pod201 report, or None if the diff could not be embedded or the
+            change gate found nothing new
+
+        Implementation:
+            - An analysis that completed after the save was evaluated moves the
+              diff base forward, so its text is not analyzed twice
+            - ChromaDB queries run in worker threads
+            - Embedding and report generation await the async Ollama client
+            - With a change gate, a diff close to the last analyzed one skips the
+              search, and unchanged top results skip report generation; the
+              diff counts as analyzed either way
+        """
+        file_read, save_time, base_text, diff_text = self._pending.pop(file_path)
+        current_text = file_read.text
+        previous_text = self._analyzed_texts.get(file_path)
+        if previous_text is not base_text:
+            diff_text = self.diff_extractor.extract_diff(previous_text, current_text)
+            if not diff_text.strip():
+                await self._mark_analyzed(file_path, file_read, save_time)
+                return None
+
+        vector = await self._embed_diff(diff_text)
+        if vector is None:
+            return None
+
+        if self.change_gate is not None and not self.change_gate.should_search(file_path, vector):
+            await self._mark_analyzed(file_path, file_read, save_time)
+            return None
+
+        # ChromaDB queries are blocking; both levels are searched in one pass off the loop
+        level1_results, level2_results = await asyncio.to_thread(
+            self.similarity_searcher.search_multilevel, vector
+        )
+        integrated = self.result_integrator.integrate(level1_results, level2_results)
+
+        if self.change_gate is not None:
+            result_ids = [result["id"] for result in integrated]
+            if not self.change_gate.should_report(file_path, result_ids):
+                self.change_gate.record(file_path, vector, result_ids)
+                await self._mark_analyzed(file_path, file_read, save_time)
+                return None
+
+        if self.on_token is not None:
+            report = await self.report_generator.generate_report_async(
+                integrated,
+                on_token=lambda fragment: self.on_token(file_path, fragment)
+            )
+        else:
+            report = await self.report_generator.generate_report_async(integrated)
+
+        if self.change_gate is not None:
+            self.change_gate.record(file_path, vector, result_ids)
+        await self._mark_analyzed(file_path, file_read, save_time)
+        self.analyses_completed += 1
+        return report
+
+    async def _mark_analyzed(self, file_path: str, file_read: FileRead, save_time: float) -> None:
+        """
+        Record a read's text as analyzed, in memory and in the state store.
+
+        Args:
+            file_path: Path of the analyzed file
+            file_read: Read of the file that was analyzed
+            save_time: Time of the save that was read
+        """
+        self._analyzed_texts[file_path] = file_read.text
+        self._append_bases[file_path] = (file_read.text, file_read.text, len(file_read.text))
+        if self.state_store is not None:
+            # The reader's digest is the store's BLAKE2b-128, so the text is not hashed again
+            self.state_store.record(file_path, file_read.size, file_read.digest.hex(), save_time)
+            await asyncio.to_thread(self.state_store.save)
+
+    async def _embed_diff(self, diff_text: str) -> Optional[List[float]]:
+        """
+        Embed diff text with retry and exponential backoff.
+
+        Args:
+            diff_text: Diff text to vectorize
+
+        Returns:
+            1024-dimensional vector or None if all attempts failed
+        """
+        if self.query_cache is not None:
+            # The memory tier is answered on the loop; the SQLite spill tier is
+            # read in a worker thread so a slow or locked disk stalls no analysis
+            vector = self.query_cache.get(self.EMBEDDING_MODEL, diff_text, memory_only=True)
+            if vector is None:
+                vector = await asyncio.to_thread(self.query_cache.get, self.EMBEDDING_MODEL, diff_text)
+            if vector is not None:
+                return vector
+
+        for attempt in range(self.max_retries):
+            vector = await self.ollama_client.embed(
+                model=self.EMBEDDING_MODEL,
+                text=diff_text
+            )
+            if vector and len(vector) == 1024:
+                if self.query_cache is not None:
+                    # put() writes evicted vectors to the spill tier
+                    await asyncio.to_thread(self.query_cache.put, self.EMBEDDING_MODEL, diff_text, vector)
+                return vector
+
+            logger.warning(
+                f"Diff vectorization attempt {attempt + 1}/{self.max_retries} failed"
+            )
+            # Wait before retry (exponential backoff); cancellable
+            if attempt < self.max_retries - 1:
+                await asyncio.sleep(2 ** attempt)
+
+        logger.error(f"Diff vectorization failed after {self.max_retries} attempts")
+        return None
+
+    async def _shutdown(self) -> None:
+        """Cancel evaluations, in-flight and deferred analyses and close the Ollama client."""
+        for handle in self._deferred.values():
+            handle.cancel()
+        self._deferred.clear()
+
+        tasks = list(self._evaluations) + list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await self.ollama_client.aclose()
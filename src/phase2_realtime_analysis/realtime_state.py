@@ -0,0 +1,192 @@
+"""
+Realtime State Store for Resonance Archive System.
+
+Persists what the realtime analyzer has already seen of each diary file
+(analyzed byte length, hash of that content, time of the analyzed save) under
+.pod201/, so the first save after a restart only analyzes new text.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+from dataclasses import dataclass, asdict
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RealtimeFileState:
+    """Analyzed state of one diary file."""
+    path: str  # File path as reported by the watcher
+    size: int  # UTF-8 byte length of the analyzed text
+    content_hash: str  # BLAKE2b hex digest of the analyzed text
+    timestamp: float  # Time of the last analyzed save (epoch seconds)
+
+
+class RealtimeStateStore:
+    """Small JSON store of per-file realtime state with a bounded number of entries."""
+
+    STATE_FILENAME = "realtime_state.json"
+    VERSION = 1
+
+    def __init__(
+        self,
+        state_path: str = os.path.join(".pod201", STATE_FILENAME),
+        max_entries: int = 64
+    ):
+        """
+        Initialize RealtimeStateStore.
+
+        Args:
+            state_path: Path of the state JSON file (default: .pod201/realtime_state.json)
+            max_entries: Maximum files remembered; least recently analyzed files
+                are forgotten first (default: 64)
+
+        Note:
+            Only hashes are stored, never file text, so memory and disk use are
+            bounded by max_entries regardless of diary size.
+        """
+        self.state_path = state_path
+        self.max_entries = max_entries
+
+        self._lock = threading.Lock()
+        self.entries: Dict[str, RealtimeFileState] = {}
+
+    @staticmethod
+    def compute_hash(content: bytes) -> str:
+        """
+        Compute the digest stored for analyzed content.
+
+        Args:
+            content: UTF-8 encoded text
+
+        Returns:
+            BLAKE2b (128-bit) hex digest
+        """
+        return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+    def load(self) -> None:
+        """
+        Load state from disk.
+
+        Note:
+            A missing or unreadable file is treated as empty.
+        """
+        with self._lock:
+            self.entries = {}
+            if not os.path.exists(self.state_path):
+                return
+
+            try:
+                with open(self.state_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+
+                if data.get('version') != self.VERSION:
+                    logger.warning(
+                        f"Unsupported realtime state version {data.get('version')}, "
+                        f"ignoring {self.state_path}"
+                    )
+                    return
+
+                for path, entry in data.get('files', {}).items():
+                    self.entries[path] = RealtimeFileState(**entry)
+                self._evict()
+
+            except (OSError, ValueError, TypeError):
+                logger.exception(f"Failed to load realtime state {self.state_path}, starting fresh")
+                self.entries = {}
+
+    def save(self) -> None:
+        """Write state to disk atomically (temp file + rename)."""
+        with self._lock:
+            data = {
+                'version': self.VERSION,
+                'files': {path: asdict(entry) for path, entry in self.entries.items()}
+            }
+
+        directory = os.path.dirname(self.state_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, self.state_path)
+
+    def get(self, path: str) -> Optional[RealtimeFileState]:
+        """
+        Get the stored state of a file.
+
+        Args:
+            path: File path
+
+        Returns:
+            RealtimeFileState or None if the file is unknown
+        """
+        with self._lock:
+            return self.entries.get(path)
+
+    def update(self, path: str, text: str, timestamp: float) -> None:
+        """
+        Record the text a file had when it was analyzed.
+
+        Args:
+            path: File path
+            text: Analyzed text
+            timestamp: Time of the analyzed save (epoch seconds)
+        """
+        content = text.encode('utf-8')
+        self.record(path, len(content), self.compute_hash(content), timestamp)
+
+    def record(self, path: str, size: int, content_hash: str, timestamp: float) -> None:
+        """
+        Record analyzed content by its size and hash, without re-encoding the text.
+
+        Args:
+            path: File path
+            size: UTF-8 byte length of the analyzed text
+            content_hash: compute_hash() of the analyzed text
+            timestamp: Time of the analyzed save (epoch seconds)
+        """
+        with self._lock:
+            self.entries.pop(path, None)  # Re-insert as most recently analyzed
+            self.entries[path] = RealtimeFileState(
+                path=path,
+                size=size,
+                content_hash=content_hash,
+                timestamp=timestamp
+            )
+            self._evict()
+
+    def restore_text(self, path: str, current_text: str) -> Optional[str]:
+        """
+        Reconstruct the previously analyzed text from the current text.
+
+        Args:
+            path: File path
+            current_text: Current file text
+
+        Returns:
+            The analyzed text if it is still an unchanged prefix of current_text
+            (the file was only appended to), otherwise None
+        """
+        state = self.get(path)
+        if state is None:
+            return None
+
+        content = current_text.encode('utf-8')
+        if len(content) < state.size or self.compute_hash(content[:state.size]) != state.content_hash:
+            return None
+
+        return content[:state.size].decode('utf-8')
+
+    def _evict(self) -> None:
+        """Forget the least recently analyzed files beyond max_entries (caller holds the lock)."""
+        overflow = len(self.entries) - self.max_entries
+        if overflow <= 0:
+            return
+
+        for path in sorted(self.entries, key=lambda p: self.entries[p].timestamp)[:overflow]:
+            del self.entries[path]
@@ -0,0 +1,126 @@
+"""
+Semantic Change Gate for Resonance Archive System.
+
+Decides whether a new diff is different enough from the last analyzed one to
+be worth a similarity search and a Pod201 report.
+"""
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class GateState:
+    """What the last analysis of a file was based on."""
+    vector: np.ndarray  # Unit-normalized diff embedding
+    result_ids: List[str]  # Top-k IDs the analysis found, best first
+
+
+class SemanticChangeGate:
+    """Skips search and report generation when a diff adds nothing new."""
+
+    def __init__(self, similarity_threshold: float = 0.95):
+        """
+        Initialize SemanticChangeGate.
+
+        Args:
+            similarity_threshold: Cosine similarity to the last analyzed diff at or
+                above which search and report generation are skipped (default: 0.95)
+        """
+        self.similarity_threshold = similarity_threshold
+
+        # Counters
+        self.searches_skipped = 0
+        self.reports_skipped = 0
+
+        self._lock = threading.Lock()
+        self._states: Dict[str, GateState] = {}
+
+    def should_search(self, path: str, vector: Sequence[float]) -> bool:
+        """
+        Check whether a diff embedding differs from the last analyzed one.
+
+        Args:
+            path: File path
+            vector: Embedding of the new diff
+
+        Returns:
+            False if the cosine similarity to the last recorded diff of the file
+            reaches similarity_threshold
+        """
+        with self._lock:
+            previous = self._states.get(path)
+            if previous is None:
+                return True
+
+            if float(np.dot(previous.vector, self._normalize(vector))) >= self.similarity_threshold:
+                self.searches_skipped += 1
+                return False
+            return True
+
+    def should_report(self, path: str, result_ids: List[str]) -> bool:
+        """
+        Check whether search results differ from those of the last analysis.
+
+        Args:
+            path: File path
+            result_ids: IDs of the integrated top-k results, best first
+
+        Returns:
+            False if the IDs equal those recorded for the file
+        """
+        with self._lock:
+            previous = self._states.get(path)
+            if previous is not None and previous.result_ids == list(result_ids):
+                self.reports_skipped += 1
+                return False
+            return True
+
+    def record(self, path: str, vector: Sequence[float], result_ids: List[str]) -> None:
+        """
+        Record a completed analysis as the reference for the next diff.
+
+        Args:
+            path: File path
+            vector: Embedding of the analyzed diff
+            result_ids: IDs of the integrated top-k results, best first
+
+        Note:
+            Only completed analyses are recorded, so the text of a cancelled
+            analysis is still compared against the last one that finished.
+        """
+        with self._lock:
+            self._states[path] = GateState(
+                vector=self._normalize(vector),
+                result_ids=list(result_ids)
+            )
+
+    def forget(self, path: str) -> None:
+        """
+        Drop the state of a file, so its next diff is always analyzed.
+
+        Args:
+            path: File path
+        """
+        with self._lock:
+            self._states.pop(path, None)
+
+    @staticmethod
+    def _normalize(vector: Sequence[float]) -> np.ndarray:
+        """
+        Scale a vector to unit length.
+
+        Args:
+            vector: Embedding vector
+
+        Returns:
+            float32 array of norm 1 (all zeros stays all zeros)
+        """
+        array = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(array)
+        return array / norm if norm > 0 else array
@@ -1,10 +1,16 @@
 """
 Similarity Searcher for Resonance Archive System.
 
-Performs multi-level similarity search against ChromaDB.
+Performs multi-level similarity search against ChromaDB, or against an
+in-memory NumPy mirror of it.
 """
 import logging
-from typing import List, Dict, Any, Optional
+import threading
+import time
+from typing import List, Dict, Any, Optional, Sequence, Tuple
+
+from src.phase2_realtime_analysis.numpy_vector_index import NumpyVectorIndex
+from src.utils.latency_tracker import LatencyTracker
 
 logger = logging.getLogger(__name__)
 
@@ -12,14 +18,39 @@ logger = logging.getLogger(__name__)
 class SimilaritySearcher:
     """Performs multi-level similarity search using ChromaDB."""
 
-    def __init__(self, chromadb_indexer):
+    # Results per level: Level 1 (summary) and Level 2 (chunk)
+    TOP_K = {"summary": 5, "chunk": 10}
+
+    # A combined query on a single collection fetches this many times the
+    # results of all levels, so that each level usually gets its top_k
+    MULTILEVEL_OVERFETCH = 4
+
+    def __init__(
+        self,
+        chromadb_indexer,
+        vector_index: Optional[NumpyVectorIndex] = None,
+        latency_tracker: Optional[LatencyTracker] = None,
+        client_lock: Optional[threading.RLock] = None
+    ):
         """
         Initialize SimilaritySearcher.
 
         Args:
-            chromadb_indexer: ChromaDBIndexer instance
+            chromadb_indexer: ChromaDBIndexer instance (may be None when searching a
+                vector_index opened from a snapshot)
+            vector_index: Loaded NumpyVectorIndex, registered as an indexer listener or
+                opened from a snapshot; when given, searches use it instead of
+                ChromaDB (default: None)
+            latency_tracker: LatencyTracker receiving per-backend, per-level search
+                latencies (default: create new)
+            client_lock: Lock serializing ChromaDB client calls; pass the indexer's
+                client_lock when it is used from other threads too, since
+                chromadb 0.3.x clients are not thread-safe (default: private lock)
         """
         self.chromadb_indexer = chromadb_indexer
+        self.vector_index = vector_index
+        self.latency = latency_tracker or LatencyTracker()
+        self._client_lock = client_lock if client_lock is not None else threading.RLock()
 
     def search_level1(
         self,
@@ -37,7 +68,9 @@ class SimilaritySearcher:
 
         Implementation:
             - Returns empty list if query_vector is None or empty
-            - Queries ChromaDB with where={"type": "summary"}
+            - Searches the NumPy index if one is configured; otherwise queries the
+              summary collection, or ChromaDB with where={"type": "summary"} when
+              the indexer keeps a single collection
             - Returns up to 5 results
             - Logs error and returns empty list on failure
         """
@@ -46,15 +79,7 @@ class SimilaritySearcher:
             return []
 
         try:
-            # Query ChromaDB with metadata filter
-            results = self.chromadb_indexer.collection.query(
-                query_embeddings=[query_vector],
-                n_results=5,
-                where={"type": "summary"}
-            )
-
-            # Format results
-            return self._format_results(results)
+            return self._search_level("summary", query_vector, n_results=self.TOP_K["summary"])
 
         except Exception:
             logger.exception("Level 1 search failed")
@@ -76,7 +101,9 @@ class SimilaritySearcher:
 
         Implementation:
             - Returns empty list if query_vector is None or empty
-            - Queries ChromaDB with where={"type": "chunk"}
+            - Searches the NumPy index if one is configured; otherwise queries the
+              chunk collection, or ChromaDB with where={"type": "chunk"} when
+              the indexer keeps a single collection
             - Returns up to 10 results
             - Logs error and returns empty list on failure
         """
@@ -85,20 +112,228 @@ class SimilaritySearcher:
             return []
 
         try:
-            # Query ChromaDB with metadata filter
-            results = self.chromadb_indexer.collection.query(
-                query_embeddings=[query_vector],
-                n_results=10,
-                where={"type": "chunk"}
-            )
-
-            # Format results
-            return self._format_results(results)
+            return self._search_level("chunk", query_vector, n_results=self.TOP_K["chunk"])
 
         except Exception:
             logger.exception("Level 2 search failed")
             return []
 
+    def search_multilevel(
+        self,
+        query_vector: Optional[List[float]]
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Perform Level 1 and Level 2 searches in one pass.
+
+        Args:
+            query_vector: Query embedding vector (1024 dimensions)
+
+        Returns:
+            Tuple of (level1_results, level2_results), as returned by
+            search_level1() and search_level2()
+
+        Implementation:
+            - NumPy index: one matrix-vector product, split by level masks
+            - Single ChromaDB collection: one unfiltered, over-fetching query
+              partitioned by metadata type; a level short of its top_k is
+              queried again with its filter
+            - Per-level collections: one query per collection in a single
+              hold of the client lock
+            - If the combined search fails, each level is searched on its own,
+              so a failure of one level does not lose the other
+        """
+        if not query_vector:
+            return [], []
+
+        try:
+            results = self._search_levels(query_vector)
+        except Exception:
+            logger.exception("Multi-level search failed, searching each level")
+            return self.search_level1(query_vector), self.search_level2(query_vector)
+
+        return results["summary"], results["chunk"]
+
+    def reload_snapshot(self, root: str) -> bool:
+        """
+        Switch to the current vector snapshot if it changed.
+
+        Args:
+            root: Snapshot root directory
+
+        Returns:
+            True if a new snapshot was opened
+
+        Note:
+            The index is replaced by a single attribute assignment, so searches
+            running concurrently finish on the snapshot they started with.
+        """
+        current = NumpyVectorIndex.current_snapshot(root)
+        if current is None:
+            return False
+        if self.vector_index is not None and self.vector_index.snapshot_path == current:
+            return False
+
+        self.vector_index = NumpyVectorIndex.load_snapshot(root)
+        return True
+
+    def compare_backends(
+        self,
+        query_vectors: Sequence[List[float]]
+    ) -> Dict[str, Dict[str, float]]:
+        """
+        Measure NumPy and ChromaDB search latency on the same queries.
+
+        Args:
+            query_vectors: Query embedding vectors
+
+        Returns:
+            LatencyTracker report keyed "numpy:<level>" and "chroma:<level>"
+
+        Raises:
+            RuntimeError: If no vector_index is configured
+        """
+        if self.vector_index is None:
+            raise RuntimeError("compare_backends requires a vector_index")
+
+        tracker = LatencyTracker()
+        for query_vector in query_vectors:
+            for level, n_results in self.TOP_K.items():
+                started = time.perf_counter()
+                self.vector_index.search(query_vector, n_results, level=level)
+                tracker.record(f"numpy:{level}", time.perf_counter() - started)
+
+                started = time.perf_counter()
+                self._query_level(level, query_vector, n_results)
+                tracker.record(f"chroma:{level}", time.perf_counter() - started)
+
+        return tracker.report()
+
+    def _search_level(
+        self,
+        level: str,
+        query_vector: List[float],
+        n_results: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Search one level on the configured backend and record the latency.
+
+        Args:
+            level: "summary" or "chunk"
+            query_vector: Query embedding vector
+            n_results: Number of results
+
+        Returns:
+            List of result dictionaries with keys: id, distance, metadata
+        """
+        started = time.perf_counter()
+        if self.vector_index is not None:
+            backend = "numpy"
+            results = self.vector_index.search(query_vector, n_results, level=level)
+        else:
+            backend = "chroma"
+            results = self._format_results(self._query_level(level, query_vector, n_results))
+
+        self.latency.record(f"{backend}:{level}", time.perf_counter() - started)
+        return results
+
+    def _search_levels(self, query_vector: List[float]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Search all levels on the configured backend and record the latency.
+
+        Args:
+            query_vector: Query embedding vector
+
+        Returns:
+            Results per level, keyed "summary" and "chunk"
+        """
+        started = time.perf_counter()
+        if self.vector_index is not None:
+            backend = "numpy"
+            results = self.vector_index.search_levels(query_vector, self.TOP_K)
+        else:
+            backend = "chroma"
+            results = self._query_levels(query_vector)
+
+        self.latency.record(f"{backend}:multilevel", time.perf_counter() - started)
+        return results
+
+    def _query_levels(self, query_vector: List[float]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Query the vectors of all levels with as few ChromaDB calls as possible.
+
+        Args:
+            query_vector: Query embedding vector
+
+        Returns:
+            Formatted results per level
+        """
+        level_collections = getattr(self.chromadb_indexer, "level_collections", None)
+        with self._client_lock:
+            if isinstance(level_collections, dict) and all(level in level_collections for level in self.TOP_K):
+                return {
+                    level: self._format_results(self._query_level(level, query_vector, n_results))
+                    for level, n_results in self.TOP_K.items()
+                }
+
+            collection = self.chromadb_indexer.collection
+            total = collection.count()
+            n_results = min(self.MULTILEVEL_OVERFETCH * sum(self.TOP_K.values()), total)
+            results: Dict[str, List[Dict[str, Any]]] = {level: [] for level in self.TOP_K}
+            if n_results == 0:
+                return results
+
+            nearest = collection.query(query_embeddings=[query_vector], n_results=n_results)
+            for result in self._format_results(nearest):
+                level = (result["metadata"] or {}).get("type")
+                if level in results and len(results[level]) < self.TOP_K[level]:
+                    results[level].append(result)
+
+            if n_results < total:
+                for level, top_k in self.TOP_K.items():
+                    if len(results[level]) < top_k:
+                        # Level rare among the nearest vectors: query it on its own
+                        results[level] = self._format_results(self._query_level(level, query_vector, top_k))
+
+            return results
+
+    def _query_level(
+        self,
+        level: str,
+        query_vector: List[float],
+        n_results: int
+    ) -> Dict[str, Any]:
+        """
+        Query the vectors of one level.
+
+        Args:
+            level: "summary" or "chunk"
+            query_vector: Query embedding vector
+            n_results: Number of results
+
+        Returns:
+            ChromaDB query results
+        """
+        level_collections = getattr(self.chromadb_indexer, "level_collections", None)
+        with self._client_lock:
+            if isinstance(level_collections, dict) and level in level_collections:
+                # Dedicated collection: unfiltered query on a smaller index.
+                # chromadb 0.3.x raises if n_results exceeds the collection size
+                collection = level_collections[level]
+                n_results = min(n_results, collection.count())
+                if n_results == 0:
+                    return {"ids": [[]], "distances": [[]], "metadatas": [[]]}
+                return collection.query(
+                    query_embeddings=[query_vector],
+                    n_results=n_results
+                )
+
+            # Query ChromaDB with metadata filter
+            return self.chromadb_indexer.collection.query(
+                query_embeddings=[query_vector],
+                n_results=n_results,
+                where={"type": level}
+            )
+
     def _format_results(
         self,
         results: Dict[str, Any]
@@ -5,10 +5,10 @@ Detects structural patterns in text (paragraph breaks, horizontal rules, sentenc
 """
 import re
 from dataclasses import dataclass
-from typing import List
+from typing import Iterator, List
 
 
-@dataclass
+@dataclass(slots=True)
 class StructuralSignal:
     """Represents a detected structural signal in text."""
 
@@ -20,57 +20,67 @@ class StructuralSignal:
 class StructuralSignalDetector:
     """Detects structural signals in text."""
 
+    # Signal types this detector can produce
+    SIGNAL_TYPES = ("paragraph_break", "horizontal_rule", "sentence_end")
+
     # Patterns to detect
     PARAGRAPH_BREAK = r"\n\n"
     HORIZONTAL_RULE = r"---"
     SENTENCE_END = r"[。！？]"
 
-    def detect(self, text: str) -> List[StructuralSignal]:
+    # All patterns in one alternation; they share no characters, so a single
+    # pass finds exactly the matches of three separate passes, in position order
+    COMBINED = re.compile(
+        f"(?P<paragraph_break>{PARAGRAPH_BREAK})"
+        f"|(?P<horizontal_rule>{HORIZONTAL_RULE})"
+        f"|(?P<sentence_end>{SENTENCE_END})"
+    )
+
+    # Characters of multi-character patterns, which can span the start boundary
+    RUN_CHARS = "\n-"
+
+    def detect(self, text: str, start: int = 0) -> List[StructuralSignal]:
         """
-        Detect all structural signals in the given text.
+        Detect structural signals in the given text.
 
         Args:
             text: Input text to analyze
+            start: Index where new text begins; only signals ending after it are
+                returned (default: 0, the whole text)
 
         Returns:
             List of StructuralSignal objects, sorted by position
+
+        Implementation:
+            - Scanning starts at the beginning of the run of newlines/dashes that
+              contains start, so a "\\n\\n" or "---" spanning the boundary is found
+              and runs pair up the same way as in a scan of the whole text
+            - Text before that point is never scanned
         """
-        if not text:
-            return []
+        return list(self.iter_signals(text, start))
 
-        signals = []
+    def iter_signals(self, text: str, start: int = 0) -> Iterator[StructuralSignal]:
+        """
+        Lazily yield the signals that detect() returns, scanning only as far as consumed.
 
-        # Detect paragraph breaks
-        for match in re.finditer(self.PARAGRAPH_BREAK, text):
-            signals.append(
-                StructuralSignal(
-                    type="paragraph_break",
-                    position=match.start(),
-                    pattern=match.group()
-                )
-            )
+        Args:
+            text: Input text to analyze
+            start: Index where new text begins (default: 0)
 
-        # Detect horizontal rules
-        for match in re.finditer(self.HORIZONTAL_RULE, text):
-            signals.append(
-                StructuralSignal(
-                    type="horizontal_rule",
-                    position=match.start(),
-                    pattern=match.group()
-                )
-            )
+        Yields:
+            StructuralSignal objects in position order
+        """
+        if not text or start >= len(text):
+            return
+
+        scan_start = max(start, 0)
+        while scan_start > 0 and text[scan_start - 1] in self.RUN_CHARS:
+            scan_start -= 1
 
-        # Detect sentence ends
-        for match in re.finditer(self.SENTENCE_END, text):
-            signals.append(
-                StructuralSignal(
-                    type="sentence_end",
+        for match in self.COMBINED.finditer(text, scan_start):
+            if match.end() > start:
+                yield StructuralSignal(
+                    type=match.lastgroup,
                     position=match.start(),
                     pattern=match.group()
                 )
-            )
-
-        # Sort by position
-        signals.sort(key=lambda s: s.position)
-
-        return signals
@@ -4,7 +4,7 @@ Timing and Delta Signal Detector for Resonance Archive System.
 Detects timing patterns (pauses) and content delta (character additions).
 """
 from dataclasses import dataclass
-from typing import List, Optional, Union
+from typing import Iterator, List, Optional, Union
 
 
 @dataclass
@@ -26,6 +26,12 @@ class DeltaSignal:
 class TimingDeltaSignalDetector:
     """Detects timing and delta signals in text changes."""
 
+    # Signal types this detector can produce
+    SIGNAL_TYPES = (
+        "long_pause", "medium_pause",
+        "large_delta", "medium_delta", "small_delta",
+    )
+
     # Timing thresholds (seconds)
     LONG_PAUSE_SECONDS = 300  # 5 minutes
     MEDIUM_PAUSE_SECONDS = 120  # 2 minutes
@@ -54,16 +60,33 @@ class TimingDeltaSignalDetector:
         Returns:
             List of TimingSignal and DeltaSignal objects
         """
-        signals = []
+        return list(self.iter_signals(
+            previous_text, previous_timestamp, current_text, current_timestamp
+        ))
 
-        # Detect timing signals (only if previous save exists)
+    def iter_signals(
+        self,
+        previous_text: Optional[str],
+        previous_timestamp: Optional[float],
+        current_text: str,
+        current_timestamp: float
+    ) -> Iterator[Union[TimingSignal, DeltaSignal]]:
+        """
+        Lazily yield the signals that detect() returns (timing first, then delta).
+
+        Args:
+            previous_text: Previous text content (None for first save)
+            previous_timestamp: Previous save timestamp (None for first save)
+            current_text: Current text content
+            current_timestamp: Current save timestamp
+
+        Yields:
+            TimingSignal and DeltaSignal objects
+        """
+        elapsed = None
         if previous_timestamp is not None:
             elapsed = current_timestamp - previous_timestamp
-            timing_signal = self._detect_timing_signal(elapsed)
-            if timing_signal:
-                signals.append(timing_signal)
 
-        # Detect delta signals
         if previous_text is None:
             # First save: treat all content as new
             char_delta = len(current_text)
@@ -71,13 +94,17 @@ class TimingDeltaSignalDetector:
             # Calculate delta
             char_delta = len(current_text) - len(previous_text)
 
-        # Only positive deltas (additions) are considered
+        # Detect timing signals (only if previous save exists)
+        if elapsed is not None:
+            timing_signal = self._detect_timing_signal(elapsed)
+            if timing_signal:
+                yield timing_signal
+
+        # Detect delta signals (only positive deltas, i.e. additions)
         if char_delta > 0:
             delta_signal = self._detect_delta_signal(char_delta)
             if delta_signal:
-                signals.append(delta_signal)
-
-        return signals
+                yield delta_signal
 
     def _detect_timing_signal(self, elapsed_seconds: float) -> Optional[TimingSignal]:
         """
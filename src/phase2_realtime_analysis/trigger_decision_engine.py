@@ -3,7 +3,10 @@ Trigger Decision Engine for Resonance Archive System.
 
 Calculates confidence scores from multiple signals and determines if analysis should be triggered.
 """
-from typing import ClassVar, List, Union
+from typing import Any, ClassVar, Collection, Iterable, List, Sequence, Set, Tuple, Union
+
+# (signal types the source can produce, lazily evaluated signals)
+SignalSource = Tuple[Collection[str], Iterable[Any]]
 
 
 class TriggerDecisionEngine:
@@ -81,3 +84,68 @@ class TriggerDecisionEngine:
         """
         confidence = self.calculate_confidence(signals)
         return confidence >= self.CONFIDENCE_THRESHOLD
+
+    def should_trigger_lazy(self, sources: Sequence[SignalSource]) -> bool:
+        """
+        Decide like should_trigger(), consuming signals only until the outcome is known.
+
+        Args:
+            sources: (signal types, signal iterable) pairs, cheapest first; pass
+                generators such as TimingDeltaSignalDetector.iter_signals() and
+                StructuralSignalDetector.iter_signals() so that unconsumed
+                detection work is never done
+
+        Returns:
+            Same result as should_trigger() on all signals of all sources
+
+        Implementation:
+            - Stops as soon as the score of distinct types reaches the threshold
+            - Stops with False once the score plus the weights of all types the
+              remaining sources could still add stays below the threshold
+        """
+        detected: Set[str] = set()
+        score = 0.0
+
+        for index, (_, signals) in enumerate(sources):
+            remaining = sources[index:]
+            if not self._can_reach(score, detected, remaining):
+                return False
+
+            for signal in signals:
+                if signal.type in detected:
+                    continue
+                detected.add(signal.type)
+                score += self.WEIGHTS.get(signal.type, 0.0)
+
+                if score >= self.CONFIDENCE_THRESHOLD:
+                    return True
+                if not self._can_reach(score, detected, remaining):
+                    return False
+
+        return False
+
+    def _can_reach(
+        self,
+        score: float,
+        detected: Set[str],
+        sources: Sequence[SignalSource]
+    ) -> bool:
+        """
+        Check whether the threshold is still reachable.
+
+        Args:
+            score: Score of the types detected so far
+            detected: Types detected so far
+            sources: Sources that may still produce signals
+
+        Returns:
+            True if adding every undetected type of the sources reaches the threshold
+        """
+        possible = {
+            signal_type
+            for signal_types, _ in sources
+            for signal_type in signal_types
+            if signal_type not in detected
+        }
+        bound = score + sum(self.WEIGHTS.get(signal_type, 0.0) for signal_type in possible)
+        return bound >= self.CONFIDENCE_THRESHOLD
@@ -0,0 +1,110 @@
+"""
+Trigger Rate Limiter for Resonance Archive System.
+
+Limits how often realtime analyses start, with a global token bucket and a
+per-file cooldown, so a fast writer cannot queue back-to-back Ollama runs.
+"""
+import logging
+import threading
+import time
+from typing import Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+
+class TriggerRateLimiter:
+    """Token bucket (global) plus cooldown (per file) for analysis starts."""
+
+    def __init__(
+        self,
+        max_per_minute: float = 4.0,
+        burst: int = 1,
+        file_cooldown_seconds: float = 30.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        """
+        Initialize TriggerRateLimiter.
+
+        Args:
+            max_per_minute: Sustained analysis starts per minute across all files (default: 4.0)
+            burst: Starts allowed back to back before the rate applies (default: 1)
+            file_cooldown_seconds: Minimum time between starts for one file (default: 30.0)
+            clock: Monotonic time source in seconds (default: time.monotonic)
+
+        Note:
+            One analysis (embedding + search + 8B report generation) takes several
+            seconds of full CPU; the defaults keep analysis well below half of
+            each minute on a typical machine. Lower max_per_minute on slower ones.
+        """
+        if max_per_minute <= 0:
+            raise ValueError("max_per_minute must be positive")
+        if burst < 1:
+            raise ValueError("burst must be at least 1")
+
+        self.max_per_minute = max_per_minute
+        self.burst = burst
+        self.file_cooldown_seconds = file_cooldown_seconds
+        self.clock = clock
+
+        # Counters
+        self.acquired = 0
+        self.throttled = 0
+
+        self._lock = threading.Lock()
+        self._tokens = float(burst)
+        self._refilled_at = clock()
+        self._last_start: Dict[str, float] = {}
+
+    def acquire(self, path: str) -> float:
+        """
+        Take a start slot for a file if one is available now.
+
+        Args:
+            path: File path about to be analyzed
+
+        Returns:
+            0.0 if the analysis may start (a slot was taken), otherwise the
+            seconds to wait before asking again (nothing is taken)
+        """
+        with self._lock:
+            now = self.clock()
+            self._refill(now)
+
+            wait = max(self._bucket_wait(), self._cooldown_wait(path, now))
+            if wait > 0:
+                self.throttled += 1
+                return wait
+
+            self._tokens -= 1.0
+            self._last_start[path] = now
+            self.acquired += 1
+            self._prune(now)
+            return 0.0
+
+    def _refill(self, now: float) -> None:
+        """Add tokens for the time elapsed since the last refill (caller holds the lock)."""
+        rate = self.max_per_minute / 60.0
+        self._tokens = min(float(self.burst), self._tokens + (now - self._refilled_at) * rate)
+        self._refilled_at = now
+
+    def _bucket_wait(self) -> float:
+        """Seconds until the bucket holds a whole token (caller holds the lock)."""
+        if self._tokens >= 1.0:
+            return 0.0
+        return (1.0 - self._tokens) * 60.0 / self.max_per_minute
+
+    def _cooldown_wait(self, path: str, now: float) -> float:
+        """Seconds until the file's cooldown ends (caller holds the lock)."""
+        last_start = self._last_start.get(path)
+        if last_start is None:
+            return 0.0
+        return max(0.0, last_start + self.file_cooldown_seconds - now)
+
+    def _prune(self, now: float) -> None:
+        """Forget files whose cooldown has ended (caller holds the lock)."""
+        expired = [
+            path for path, last_start in self._last_start.items()
+            if last_start + self.file_cooldown_seconds <= now
+        ]
+        for path in expired:
+            del self._last_start[path]
@@ -7,12 +7,14 @@ import re
 import logging
 from datetime import datetime
 from io import StringIO
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, AsyncIterator, Callable, Iterable, Iterator, Optional
 from pathlib import Path
 
 from rich.console import Console
+from rich.live import Live
 from rich.table import Table
 from rich.panel import Panel
+from rich.text import Text
 from rich import box
 
 # Set up logger
@@ -63,7 +65,8 @@ class Pod201ReportGenerator:
 
     def generate_report(
         self,
-        search_results: List[Dict[str, Any]]
+        search_results: List[Dict[str, Any]],
+        on_token: Optional[Callable[[str], None]] = None
     ) -> str:
         """
         Generate Pod201-style report from search results.
@@ -71,6 +74,8 @@ class Pod201ReportGenerator:
         Args:
             search_results: List of similarity search result dictionaries
                             Each dict contains: id, distance, metadata
+            on_token: Called with each text fragment as it is generated; enables
+                      streaming so output can start before generation finishes
 
         Returns:
             Generated Pod201-style report text (falls back to plain text on error)
@@ -81,39 +86,68 @@ class Pod201ReportGenerator:
             - Uses llama3.1:8b model for generation
             - On error: logs the error and returns fallback report
         """
+        if on_token is not None:
+            fragments = []
+            for fragment in self.generate_report_stream(search_results):
+                on_token(fragment)
+                fragments.append(fragment)
+            return "".join(fragments)
+
         # Format search results for the prompt
         results_text = self._format_search_results(search_results)
 
-        # Construct full prompt with persona and results
-        full_prompt = f"""{self.persona_prompt}
+        # Call Ollama LLM
+        try:
+            report = self.ollama_client.generate(
+                model="llama3.1:8b",
+                prompt=self._build_prompt(results_text)
+            )
+            return self._validate_report(report, results_text)
 
----
+        except ConnectionError as e:
+            logger.error(f"Connection error during LLM generation: {e}", exc_info=True)
+            return self._generate_fallback_report(results_text, error_type="接続エラー")
+        except TimeoutError as e:
+            logger.error(f"Timeout during LLM generation: {e}", exc_info=True)
+            return self._generate_fallback_report(results_text, error_type="タイムアウト")
+        except Exception as e:
+            logger.error(f"Error during LLM generation: {e}", exc_info=True)
+            return self._generate_fallback_report(results_text)
 
-## 任務ブリーフィング
-以下の類似検索結果を分析し、Pod201ペルソナでレポートを生成せよ。
+    async def generate_report_async(
+        self,
+        search_results: List[Dict[str, Any]],
+        on_token: Optional[Callable[[str], None]] = None
+    ) -> str:
+        """
+        Generate Pod201-style report without blocking the event loop.
 
-{results_text}
+        Args:
+            search_results: List of similarity search result dictionaries
+            on_token: Called with each text fragment as it is generated
 
-## 指示
-- 接頭語ラベル（報告/分析/提案等）を使用すること
-- だ・である調の断定形を使用すること
-- 簡潔に核心的な洞察を提供すること
-- 一人称「当機」、二人称「随行対象」を使用すること
-"""
+        Returns:
+            Generated Pod201-style report text (falls back to plain text on error)
+
+        Note:
+            Requires an AsyncOllamaClient. Cancelling the awaiting task cancels
+            the in-flight LLM request.
+        """
+        if on_token is not None:
+            fragments = []
+            async for fragment in self.generate_report_stream_async(search_results):
+                on_token(fragment)
+                fragments.append(fragment)
+            return "".join(fragments)
+
+        results_text = self._format_search_results(search_results)
 
-        # Call Ollama LLM
         try:
-            report = self.ollama_client.generate(
+            report = await self.ollama_client.generate(
                 model="llama3.1:8b",
-                prompt=full_prompt
+                prompt=self._build_prompt(results_text)
             )
-
-            # Validate response
-            if report is None or (isinstance(report, str) and not report.strip()):
-                logger.error("LLM returned empty or None response")
-                return self._generate_fallback_report(results_text)
-
-            return report
+            return self._validate_report(report, results_text)
 
         except ConnectionError as e:
             logger.error(f"Connection error during LLM generation: {e}", exc_info=True)
@@ -125,6 +159,158 @@ class Pod201ReportGenerator:
             logger.error(f"Error during LLM generation: {e}", exc_info=True)
             return self._generate_fallback_report(results_text)
 
+    def generate_report_stream(
+        self,
+        search_results: List[Dict[str, Any]]
+    ) -> Iterator[str]:
+        """
+        Generate Pod201-style report, yielding text fragments as they arrive.
+
+        Args:
+            search_results: List of similarity search result dictionaries
+
+        Yields:
+            Report text fragments; the fallback report if the LLM produced nothing
+
+        Note:
+            Errors after the first fragment end the stream with the partial report.
+        """
+        results_text = self._format_search_results(search_results)
+        error_type = "LLM生成失敗"
+        received = False
+
+        try:
+            for fragment in self.ollama_client.generate_stream(
+                model="llama3.1:8b",
+                prompt=self._build_prompt(results_text)
+            ):
+                received = received or bool(fragment.strip())
+                yield fragment
+
+        except ConnectionError as e:
+            logger.error(f"Connection error during LLM generation: {e}", exc_info=True)
+            error_type = "接続エラー"
+        except TimeoutError as e:
+            logger.error(f"Timeout during LLM generation: {e}", exc_info=True)
+            error_type = "タイムアウト"
+        except Exception as e:
+            logger.error(f"Error during LLM generation: {e}", exc_info=True)
+
+        if not received:
+            logger.error("LLM returned empty or None response")
+            yield self._generate_fallback_report(results_text, error_type=error_type)
+
+    async def generate_report_stream_async(
+        self,
+        search_results: List[Dict[str, Any]]
+    ) -> AsyncIterator[str]:
+        """
+        Asynchronous variant of generate_report_stream (requires an AsyncOllamaClient).
+
+        Args:
+            search_results: List of similarity search result dictionaries
+
+        Yields:
+            Report text fragments; the fallback report if the LLM produced nothing
+        """
+        results_text = self._format_search_results(search_results)
+        error_type = "LLM生成失敗"
+        received = False
+
+        try:
+            async for fragment in self.ollama_client.generate_stream(
+                model="llama3.1:8b",
+                prompt=self._build_prompt(results_text)
+            ):
+                received = received or bool(fragment.strip())
+                yield fragment
+
+        except ConnectionError as e:
+            logger.error(f"Connection error during LLM generation: {e}", exc_info=True)
+            error_type = "接続エラー"
+        except TimeoutError as e:
+            logger.error(f"Timeout during LLM generation: {e}", exc_info=True)
+            error_type = "タイムアウト"
+        except Exception as e:
+            logger.error(f"Error during LLM generation: {e}", exc_info=True)
+
+        if not received:
+            logger.error("LLM returned empty or None response")
+            yield self._generate_fallback_report(results_text, error_type=error_type)
+
+    def render_report_stream(
+        self,
+        fragments: Iterable[str],
+        console: Optional[Console] = None
+    ) -> str:
+        """
+        Render a streamed report incrementally in the terminal.
+
+        Args:
+            fragments: Report text fragments (e.g. from generate_report_stream)
+            console: Rich Console to render to (default: new Console on stdout)
+
+        Returns:
+            Full report text
+
+        Implementation:
+            - Uses rich.live.Live to redraw a Panel as each fragment arrives
+            - The first fragment is shown as soon as it is received
+        """
+        console = console or Console()
+        text = Text()
+        panel = Panel(text, title="Pod201 レポート", border_style="cyan")
+
+        with Live(panel, console=console, refresh_per_second=12, transient=False) as live:
+            for fragment in fragments:
+                text.append(fragment)
+                live.update(panel, refresh=True)
+
+        return text.plain
+
+    def _build_prompt(self, results_text: str) -> str:
+        """
+        Construct the full prompt with persona and formatted results.
+
+        Args:
+            results_text: Formatted search results text
+
+        Returns:
+            Prompt text for the LLM
+        """
+        return f"""{self.persona_prompt}
+
+---
+
+## 任務ブリーフィング
+以下の類似検索結果を分析し、Pod201ペルソナでレポートを生成せよ。
+
+{results_text}
+
+## 指示
+- 接頭語ラベル（報告/分析/提案等）を使用すること
+- だ・である調の断定形を使用すること
+- 簡潔に核心的な洞察を提供すること
+- 一人称「当機」、二人称「随行対象」を使用すること
+"""
+
+    def _validate_report(self, report: Optional[str], results_text: str) -> str:
+        """
+        Return the LLM report, or the fallback report if it is empty.
+
+        Args:
+            report: LLM response text (None if the request failed)
+            results_text: Formatted search results text
+
+        Returns:
+            Report text
+        """
+        if report is None or (isinstance(report, str) and not report.strip()):
+            logger.error("LLM returned empty or None response")
+            return self._generate_fallback_report(results_text)
+
+        return report
+
     def _generate_fallback_report(
         self,
         results_text: str,
@@ -0,0 +1,261 @@
+"""
+Asynchronous Ollama API client for the realtime analysis path.
+
+Mirrors OllamaClient on top of httpx.AsyncClient so that requests can run on
+an asyncio event loop and be cancelled while in flight.
+"""
+import logging
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import httpx
+
+from src.utils.ollama_client import OllamaClient
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncOllamaClient:
+    """Asynchronous client for interacting with Ollama API."""
+
+    def __init__(
+        self,
+        base_url: str = "http://localhost:11434",
+        pool_maxsize: int = 10,
+        connect_timeout: float = 5.0,
+        generate_timeout: float = 60.0,
+        embed_timeout: float = 30.0,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        """
+        Initialize asynchronous Ollama client.
+
+        Args:
+            base_url: Base URL of Ollama API (default: http://localhost:11434)
+            pool_maxsize: Maximum keep-alive connections kept open (default: 10)
+            connect_timeout: Seconds to wait for a TCP connection (default: 5.0)
+            generate_timeout: Seconds to wait for a generate response (default: 60.0)
+            embed_timeout: Seconds to wait for an embed response (default: 30.0)
+            transport: httpx transport (default: network transport)
+
+        Note:
+            Cancelling the awaiting task closes the underlying connection, so
+            Ollama stops working on requests that are no longer needed.
+        """
+        self.base_url = base_url
+        self.connect_timeout = connect_timeout
+        self.generate_timeout = generate_timeout
+        self.embed_timeout = embed_timeout
+
+        self.client = httpx.AsyncClient(
+            base_url=base_url,
+            limits=httpx.Limits(
+                max_connections=pool_maxsize,
+                max_keepalive_connections=pool_maxsize
+            ),
+            transport=transport
+        )
+
+    async def aclose(self) -> None:
+        """Close pooled connections."""
+        await self.client.aclose()
+
+    async def __aenter__(self) -> 'AsyncOllamaClient':
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.aclose()
+
+    def _timeout(self, read_timeout: float) -> httpx.Timeout:
+        """
+        Build a timeout with separate connect and read limits.
+
+        Args:
+            read_timeout: Seconds to wait for the response
+
+        Returns:
+            httpx.Timeout
+        """
+        return httpx.Timeout(read_timeout, connect=self.connect_timeout)
+
+    async def is_available(self) -> bool:
+        """
+        Check if Ollama service is available.
+
+        Returns:
+            True if Ollama is running, False otherwise
+        """
+        try:
+            response = await self.client.get("/", timeout=self._timeout(5))
+            return response.status_code == 200
+        except httpx.HTTPError:
+            return False
+
+    async def generate(
+        self,
+        model: str,
+        prompt: str,
+        timeout: Optional[float] = None
+    ) -> Optional[str]:
+        """
+        Generate text using specified model.
+
+        Args:
+            model: Model name (e.g., "llama3.1:8b")
+            prompt: Input prompt text
+            timeout: Read timeout in seconds (default: generate_timeout)
+
+        Returns:
+            Generated text or None if error
+        """
+        try:
+            payload = {
+                "model": model,
+                "prompt": prompt,
+                "stream": False
+            }
+            response = await self.client.post(
+                "/api/generate",
+                json=payload,
+                timeout=self._timeout(timeout or self.generate_timeout)
+            )
+            response.raise_for_status()
+            data = response.json()
+            return data.get("response", "")
+        except (httpx.HTTPError, ValueError):
+            # ValueError: malformed or truncated JSON body
+            return None
+
+    async def generate_stream(
+        self,
+        model: str,
+        prompt: str,
+        timeout: Optional[float] = None
+    ) -> AsyncIterator[str]:
+        """
+        Generate text using specified model, yielding fragments as they arrive.
+
+        Args:
+            model: Model name (e.g., "llama3.1:8b")
+            prompt: Input prompt text
+            timeout: Maximum seconds between two streamed lines (default: generate_timeout)
+
+        Yields:
+            Response text fragments in order
+
+        Note:
+            The stream ends early (without raising) on HTTP errors, so callers
+            must treat an empty result as a failure.
+        """
+        payload = {
+            "model": model,
+            "prompt": prompt,
+            "stream": True
+        }
+        try:
+            async with self.client.stream(
+                "POST",
+                "/api/generate",
+                json=payload,
+                timeout=self._timeout(timeout or self.generate_timeout)
+            ) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    fragment, done = OllamaClient.parse_stream_line(line)
+                    if fragment:
+                        yield fragment
+                    if done:
+                        break
+        except httpx.HTTPError as e:
+            logger.warning(f"Streaming generation failed: {e}")
+
+    async def embed(
+        self,
+        model: str,
+        text: str,
+        timeout: Optional[float] = None
+    ) -> Optional[List[float]]:
+        """
+        Generate embeddings for text.
+
+        Args:
+            model: Embedding model name (e.g., "mxbai-embed-large")
+            text: Input text to embed
+            timeout: Read timeout in seconds (default: embed_timeout)
+
+        Returns:
+            Vector (list of floats) or None if error
+        """
+        embeddings = await self._embed_request(
+            model, text, timeout or self.embed_timeout
+        )
+        if embeddings:
+            return embeddings[0]
+        return None
+
+    async def embed_batch(
+        self,
+        model: str,
+        texts: List[str],
+        max_batch: int = 32,
+        timeout: Optional[float] = None
+    ) -> List[Optional[List[float]]]:
+        """
+        Generate embeddings for multiple texts using /api/embed input arrays.
+
+        Args:
+            model: Embedding model name (e.g., "mxbai-embed-large")
+            texts: Input texts to embed
+            max_batch: Maximum number of texts per HTTP request (default: 32)
+            timeout: Read timeout per request in seconds
+                (default: embed_timeout plus one second per text)
+
+        Returns:
+            List of vectors aligned with texts; an entry is None if its
+            request failed or the response did not contain it
+        """
+        vectors: List[Optional[List[float]]] = []
+
+        for start in range(0, len(texts), max_batch):
+            batch = texts[start:start + max_batch]
+            embeddings = await self._embed_request(
+                model, batch, timeout or self.embed_timeout + len(batch)
+            )
+            if embeddings is None or len(embeddings) != len(batch):
+                embeddings = [None] * len(batch)
+            vectors.extend(embeddings)
+
+        return vectors
+
+    async def _embed_request(
+        self,
+        model: str,
+        input_value: Any,
+        read_timeout: float
+    ) -> Optional[List[List[float]]]:
+        """
+        Send one /api/embed request.
+
+        Args:
+            model: Embedding model name
+            input_value: Text or list of texts
+            read_timeout: Read timeout in seconds
+
+        Returns:
+            List of embeddings or None if error
+        """
+        try:
+            payload: Dict[str, Any] = {
+                "model": model,
+                "input": input_value
+            }
+            response = await self.client.post(
+                "/api/embed",
+                json=payload,
+                timeout=self._timeout(read_timeout)
+            )
+            response.raise_for_status()
+            data = response.json()
+            return data.get("embeddings", [])
+        except (httpx.HTTPError, ValueError):
+            # ValueError: malformed or truncated JSON body
+            return None
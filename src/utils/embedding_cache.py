@@ -0,0 +1,164 @@
+"""
+Embedding cache for Resonance Archive System.
+
+Stores embedding vectors on disk keyed by (model name, content hash) so that
+unchanged text is never sent to the embedding model twice.
+"""
+import logging
+import os
+import sqlite3
+import threading
+import time
+from array import array
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingCache:
+    """SQLite-backed embedding cache with size-bounded LRU eviction."""
+
+    CACHE_FILENAME = "embedding_cache.sqlite3"
+
+    # Cache hits buffered before their access times are written in one transaction
+    ACCESS_FLUSH_ENTRIES = 256
+
+    def __init__(self, db_path: str, max_entries: int = 200_000):
+        """
+        Initialize EmbeddingCache.
+
+        Args:
+            db_path: Path of the SQLite database file
+            max_entries: Maximum number of cached vectors before LRU eviction (default: 200000)
+        """
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # Shared between indexing worker threads; access is serialized by the lock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embeddings (
+                model TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                vector BLOB NOT NULL,
+                last_access INTEGER NOT NULL,
+                PRIMARY KEY (model, content_hash)
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_embeddings_last_access ON embeddings (last_access)"
+        )
+        self._conn.commit()
+        self._count = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+        # Access times of cache hits not yet written, by (model, content_hash)
+        self._accessed: Dict[Tuple[str, str], int] = {}
+
+    def get(self, model: str, content_hash: str) -> Optional[List[float]]:
+        """
+        Look up a cached vector and mark it as recently used.
+
+        Args:
+            model: Embedding model name
+            content_hash: SHA256 hex digest of the embedded text
+
+        Returns:
+            Vector (list of floats) or None on cache miss
+
+        Note:
+            The access time is buffered and written with the next put(),
+            flush(), or once ACCESS_FLUSH_ENTRIES hits have accumulated, so a
+            run of hits costs one transaction instead of one per hit.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT vector FROM embeddings WHERE model = ? AND content_hash = ?",
+                (model, content_hash)
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            self._accessed[(model, content_hash)] = time.time_ns()
+            if len(self._accessed) >= self.ACCESS_FLUSH_ENTRIES:
+                self._write_accesses()
+                self._conn.commit()
+            self.hits += 1
+
+        vector = array('f')
+        vector.frombytes(row[0])
+        return vector.tolist()
+
+    def put(self, model: str, content_hash: str, vector: List[float]) -> None:
+        """
+        Store a vector (as float32) and evict least recently used entries if full.
+
+        Args:
+            model: Embedding model name
+            content_hash: SHA256 hex digest of the embedded text
+            vector: Embedding vector
+        """
+        blob = array('f', vector).tobytes()
+
+        with self._lock:
+            # Eviction below ranks entries by their current access times
+            self._write_accesses()
+            cursor = self._conn.execute(
+                "INSERT OR IGNORE INTO embeddings (model, content_hash, vector, last_access) "
+                "VALUES (?, ?, ?, ?)",
+                (model, content_hash, blob, time.time_ns())
+            )
+            self._count += cursor.rowcount
+
+            overflow = self._count - self.max_entries
+            if overflow > 0:
+                self._conn.execute(
+                    "DELETE FROM embeddings WHERE rowid IN "
+                    "(SELECT rowid FROM embeddings ORDER BY last_access LIMIT ?)",
+                    (overflow,)
+                )
+                self._count -= overflow
+                logger.debug(f"Evicted {overflow} embeddings from cache")
+
+            self._conn.commit()
+
+    def flush(self) -> None:
+        """Write buffered access times to the database in one transaction."""
+        with self._lock:
+            if self._accessed:
+                self._write_accesses()
+                self._conn.commit()
+
+    def __len__(self) -> int:
+        """Return the number of cached vectors."""
+        return self._count
+
+    def close(self) -> None:
+        """Write buffered access times and close the underlying database connection."""
+        with self._lock:
+            self._write_accesses()
+            self._conn.commit()
+            self._conn.close()
+
+    def _write_accesses(self) -> None:
+        """Apply buffered access times to the current transaction (caller holds the lock)."""
+        if not self._accessed:
+            return
+
+        self._conn.executemany(
+            "UPDATE embeddings SET last_access = ? WHERE model = ? AND content_hash = ?",
+            [(accessed, model, content_hash) for (model, content_hash), accessed in self._accessed.items()]
+        )
+        self._accessed.clear()
@@ -0,0 +1,61 @@
+"""
+Latency tracker for Resonance Archive System.
+
+Keeps a bounded window of recent latency samples per operation and reports
+percentiles.
+"""
+import threading
+from collections import deque
+from typing import Deque, Dict
+
+import numpy as np
+
+
+class LatencyTracker:
+    """Rolling latency percentiles per named operation."""
+
+    def __init__(self, window: int = 1000):
+        """
+        Initialize LatencyTracker.
+
+        Args:
+            window: Most recent samples kept per operation (default: 1000)
+        """
+        self.window = window
+
+        self._lock = threading.Lock()
+        self._samples: Dict[str, Deque[float]] = {}
+
+    def record(self, name: str, seconds: float) -> None:
+        """
+        Record one latency sample.
+
+        Args:
+            name: Operation name
+            seconds: Measured latency in seconds
+        """
+        with self._lock:
+            samples = self._samples.setdefault(name, deque(maxlen=self.window))
+            samples.append(seconds)
+
+    def report(self) -> Dict[str, Dict[str, float]]:
+        """
+        Summarize the recorded samples.
+
+        Returns:
+            Dictionary mapping operation name to count, p50_ms and p95_ms
+        """
+        with self._lock:
+            snapshot = {name: list(samples) for name, samples in self._samples.items()}
+
+        report = {}
+        for name, samples in snapshot.items():
+            if not samples:
+                continue
+            p50, p95 = np.percentile(samples, [50, 95])
+            report[name] = {
+                'count': len(samples),
+                'p50_ms': float(p50) * 1000,
+                'p95_ms': float(p95) * 1000
+            }
+        return report
@@ -3,21 +3,96 @@ Ollama API client for text generation and embeddings.
 
 This module provides a simple interface to interact with Ollama API.
 """
+import json
+import logging
+
 import requests
-from typing import List, Dict, Any, Optional
+from requests.adapters import HTTPAdapter
+from typing import List, Dict, Any, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
 
 
 class OllamaClient:
     """Client for interacting with Ollama API."""
 
-    def __init__(self, base_url: str = "http://localhost:11434"):
+    def __init__(
+        self,
+        base_url: str = "http://localhost:11434",
+        pool_maxsize: int = 10,
+        connect_timeout: float = 5.0,
+        generate_timeout: float = 60.0,
+        embed_timeout: float = 30.0
+    ):
         """
         Initialize Ollama client.
 
         Args:
             base_url: Base URL of Ollama API (default: http://localhost:11434)
+            pool_maxsize: Maximum keep-alive connections kept open; should cover the
+                number of threads sharing this client (default: 10)
+            connect_timeout: Seconds to wait for a TCP connection (default: 5.0)
+            generate_timeout: Seconds to wait for a generate response (default: 60.0)
+            embed_timeout: Seconds to wait for an embed response (default: 30.0)
+
+        Note:
+            All calls share one pooled requests.Session, so a single client can be
+            passed to DiffExtractor, MultilevelVectorizer and Pod201ReportGenerator
+            and used from multiple threads without reconnecting per request.
         """
         self.base_url = base_url
+        self.connect_timeout = connect_timeout
+        self.generate_timeout = generate_timeout
+        self.embed_timeout = embed_timeout
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def close(self) -> None:
+        """Close pooled connections."""
+        self.session.close()
+
+    def __enter__(self) -> 'OllamaClient':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def _timeout(self, read_timeout: float) -> Tuple[float, float]:
+        """
+        Build a (connect, read) timeout for requests.
+
+        Args:
+            read_timeout: Seconds to wait for the response
+
+        Returns:
+            Timeout tuple accepted by requests
+        """
+        return (self.connect_timeout, read_timeout)
+
+    @staticmethod
+    def parse_stream_line(line: str) -> Tuple[str, bool]:
+        """
+        Parse one NDJSON line of a streaming /api/generate response.
+
+        Args:
+            line: A single line of the response body
+
+        Returns:
+            Tuple of (response text fragment, done flag); blank or malformed
+            lines yield ("", False)
+        """
+        if not line or not line.strip():
+            return "", False
+
+        try:
+            data = json.loads(line)
+        except ValueError:
+            return "", False
+
+        return data.get("response", ""), bool(data.get("done", False))
 
     def is_available(self) -> bool:
         """
@@ -27,7 +102,7 @@ class OllamaClient:
             True if Ollama is running, False otherwise
         """
         try:
-            response = requests.get(f"{self.base_url}/", timeout=5)
+            response = self.session.get(f"{self.base_url}/", timeout=self._timeout(5))
             return response.status_code == 200
         except requests.exceptions.RequestException:
             return False
@@ -40,35 +115,46 @@ class OllamaClient:
             List of model information dictionaries
         """
         try:
-            response = requests.get(f"{self.base_url}/api/tags", timeout=10)
+            response = self.session.get(f"{self.base_url}/api/tags", timeout=self._timeout(10))
             response.raise_for_status()
             data = response.json()
             return data.get("models", [])
         except requests.exceptions.RequestException:
             return []
 
-    def generate(self, model: str, prompt: str, stream: bool = False) -> Optional[str]:
+    def generate(
+        self,
+        model: str,
+        prompt: str,
+        stream: bool = False,
+        timeout: Optional[float] = None
+    ) -> Optional[str]:
         """
         Generate text using specified model.
 
         Args:
             model: Model name (e.g., "llama3.1:8b")
             prompt: Input prompt text
-            stream: Whether to stream the response (default: False)
+            stream: Receive the response as a stream and join it (default: False)
+            timeout: Read timeout in seconds (default: generate_timeout)
 
         Returns:
             Generated text or None if error
         """
+        if stream:
+            text = "".join(self.generate_stream(model, prompt, timeout=timeout))
+            return text or None
+
         try:
             payload = {
                 "model": model,
                 "prompt": prompt,
                 "stream": stream
             }
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/api/generate",
                 json=payload,
-                timeout=60
+                timeout=self._timeout(timeout or self.generate_timeout)
             )
             response.raise_for_status()
             data = response.json()
@@ -76,13 +162,64 @@ class OllamaClient:
         except requests.exceptions.RequestException:
             return None
 
-    def embed(self, model: str, text: str) -> Optional[List[float]]:
+    def generate_stream(
+        self,
+        model: str,
+        prompt: str,
+        timeout: Optional[float] = None
+    ) -> Iterator[str]:
+        """
+        Generate text using specified model, yielding fragments as they arrive.
+
+        Args:
+            model: Model name (e.g., "llama3.1:8b")
+            prompt: Input prompt text
+            timeout: Maximum seconds between two streamed lines (default: generate_timeout)
+
+        Yields:
+            Response text fragments in order
+
+        Note:
+            The read timeout applies between lines, so it bounds time-to-first-token
+            rather than total generation time. The stream ends early (without
+            raising) on HTTP errors, so callers must treat an empty result as a failure.
+        """
+        payload = {
+            "model": model,
+            "prompt": prompt,
+            "stream": True
+        }
+        try:
+            with self.session.post(
+                f"{self.base_url}/api/generate",
+                json=payload,
+                timeout=self._timeout(timeout or self.generate_timeout),
+                stream=True
+            ) as response:
+                response.raise_for_status()
+                # NDJSON lines never split a UTF-8 character, so decode per line
+                for line in response.iter_lines():
+                    fragment, done = self.parse_stream_line(line.decode("utf-8"))
+                    if fragment:
+                        yield fragment
+                    if done:
+                        break
+        except requests.exceptions.RequestException as e:
+            logger.warning(f"Streaming generation failed: {e}")
+
+    def embed(
+        self,
+        model: str,
+        text: str,
+        timeout: Optional[float] = None
+    ) -> Optional[List[float]]:
         """
         Generate embeddings for text.
 
         Args:
             model: Embedding model name (e.g., "mxbai-embed-large")
             text: Input text to embed
+            timeout: Read timeout in seconds (default: embed_timeout)
 
         Returns:
             Vector (list of floats) or None if error
@@ -92,10 +229,10 @@ class OllamaClient:
                 "model": model,
                 "input": text
             }
-            response = requests.post(
+            response = self.session.post(
                 f"{self.base_url}/api/embed",
                 json=payload,
-                timeout=30
+                timeout=self._timeout(timeout or self.embed_timeout)
             )
             response.raise_for_status()
             data = response.json()
@@ -105,3 +242,49 @@ class OllamaClient:
             return None
         except requests.exceptions.RequestException:
             return None
+
+    def embed_batch(
+        self,
+        model: str,
+        texts: List[str],
+        max_batch: int = 32,
+        timeout: Optional[float] = None
+    ) -> List[Optional[List[float]]]:
+        """
+        Generate embeddings for multiple texts using /api/embed input arrays.
+
+        Args:
+            model: Embedding model name (e.g., "mxbai-embed-large")
+            texts: Input texts to embed
+            max_batch: Maximum number of texts per HTTP request (default: 32)
+            timeout: Read timeout per request in seconds
+                (default: embed_timeout plus one second per text)
+
+        Returns:
+            List of vectors aligned with texts; an entry is None if its
+            request failed or the response did not contain it
+        """
+        vectors: List[Optional[List[float]]] = []
+
+        for start in range(0, len(texts), max_batch):
+            batch = texts[start:start + max_batch]
+            try:
+                payload = {
+                    "model": model,
+                    "input": batch
+                }
+                response = self.session.post(
+                    f"{self.base_url}/api/embed",
+                    json=payload,
+                    timeout=self._timeout(timeout or self.embed_timeout + len(batch))
+                )
+                response.raise_for_status()
+                data = response.json()
+                embeddings = data.get("embeddings", [])
+                if len(embeddings) != len(batch):
+                    embeddings = [None] * len(batch)
+                vectors.extend(embeddings)
+            except requests.exceptions.RequestException:
+                vectors.extend([None] * len(batch))
+
+        return vectors
@@ -0,0 +1,125 @@
+"""
+Query vector cache for Resonance Archive System.
+
+Keeps recently embedded query texts (realtime diffs) in a bounded in-memory
+LRU, so re-triggered or repeated queries skip the embedding round-trip.
+"""
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+from src.utils.embedding_cache import EmbeddingCache
+
+logger = logging.getLogger(__name__)
+
+
+class QueryVectorCache:
+    """In-memory LRU of query embeddings, optionally spilling to an EmbeddingCache."""
+
+    def __init__(self, max_entries: int = 512, disk_cache: Optional[EmbeddingCache] = None):
+        """
+        Initialize QueryVectorCache.
+
+        Args:
+            max_entries: Maximum vectors kept in memory (default: 512)
+            disk_cache: EmbeddingCache that receives vectors evicted from memory
+                and is consulted on a memory miss (default: memory only)
+        """
+        self.max_entries = max_entries
+        self.disk_cache = disk_cache
+
+        # Counters
+        self.hits = 0  # Served from memory
+        self.disk_hits = 0  # Served from the disk cache
+        self.misses = 0  # Caller has to embed
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[str, str], List[float]]" = OrderedDict()
+
+    @staticmethod
+    def compute_hash(text: str) -> str:
+        """
+        Compute the cache key digest of a text (same digest as EmbeddingCache keys).
+
+        Args:
+            text: Query text
+
+        Returns:
+            SHA256 hex digest
+        """
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    def get(self, model: str, text: str, memory_only: bool = False) -> Optional[List[float]]:
+        """
+        Look up the vector of a query text.
+
+        Args:
+            model: Embedding model name
+            text: Query text
+            memory_only: Consult only the in-memory tier; a miss is not counted,
+                so the caller can follow up with a full get() off the event loop
+                (default: False)
+
+        Returns:
+            Cached vector or None on miss
+        """
+        key = (model, self.compute_hash(text))
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return vector
+
+        if memory_only:
+            return None
+
+        if self.disk_cache is not None:
+            vector = self.disk_cache.get(*key)
+            if vector is not None:
+                with self._lock:
+                    self.disk_hits += 1
+                self._insert(key, vector)
+                return vector
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, model: str, text: str, vector: List[float]) -> None:
+        """
+        Store the vector of a query text.
+
+        Args:
+            model: Embedding model name
+            text: Query text
+            vector: Embedding vector
+        """
+        self._insert((model, self.compute_hash(text)), vector)
+
+    def __len__(self) -> int:
+        """Return the number of vectors held in memory."""
+        return len(self._entries)
+
+    def _insert(self, key: Tuple[str, str], vector: List[float]) -> None:
+        """
+        Insert a vector as most recently used and evict beyond max_entries.
+
+        Args:
+            key: (model, content hash)
+            vector: Embedding vector
+        """
+        evicted = []
+        with self._lock:
+            self._entries[key] = vector
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                evicted.append(self._entries.popitem(last=False))
+                self.evictions += 1
+
+        if self.disk_cache is not None:
+            for (model, content_hash), old_vector in evicted:
+                self.disk_cache.put(model, content_hash, old_vector)
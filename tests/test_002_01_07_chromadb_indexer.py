@@ -4,6 +4,7 @@ Test for Subtask 002-01-07: ChromaDBインデックス化実装
 このテストは承認されたAcceptance Criteriaから導出されています。
 """
 import pytest
+from unittest.mock import Mock
 import tempfile
 import shutil
 from src.phase1_archive_sync.chromadb_indexer import ChromaDBIndexer
@@ -227,3 +228,80 @@ def test_add_vectors_batch_persists_data(temp_db_dir, sample_embedding_records):
     # Verify data persisted
     stored_count = indexer2.collection.count()
     assert stored_count == len(sample_embedding_records)
+
+
+def test_delete_vectors_removes_only_given_ids(indexer, sample_embedding_records):
+    """AC: 差分インデックス構築 - 指定IDのベクトルのみ削除すること"""
+    indexer.add_vectors_batch(sample_embedding_records, show_progress=False)
+
+    deleted = indexer.delete_vectors([sample_embedding_records[0].id])
+
+    assert deleted == 1
+    assert indexer.collection.count() == len(sample_embedding_records) - 1
+
+
+def test_delete_vectors_empty_list_is_noop(indexer, sample_embedding_records):
+    """AC: 差分インデックス構築 - 空リストの削除で全件削除しないこと"""
+    indexer.add_vectors_batch(sample_embedding_records, show_progress=False)
+
+    deleted = indexer.delete_vectors([])
+
+    assert deleted == 0
+    assert indexer.collection.count() == len(sample_embedding_records)
+
+
+def test_add_vectors_batch_accepts_generator(indexer, sample_embedding_records):
+    """AC: ストリーミング投入 - ジェネレータから逐次レコードを受け取れること"""
+    result = indexer.add_vectors_batch(
+        (record for record in sample_embedding_records), batch_size=2, show_progress=False
+    )
+
+    assert result['success'] == len(sample_embedding_records)
+    assert indexer.collection.count() == len(sample_embedding_records)
+
+
+def test_bulk_insert_persists_bounded_number_of_times(temp_db_dir):
+    """AC: 永続化ポリシー - バッチ毎ではなく一定バッチ数毎に永続化すること"""
+    indexer = ChromaDBIndexer(persist_directory=temp_db_dir, persist_every_batches=5)
+    indexer.client.persist = Mock(wraps=indexer.client.persist)
+    records = [
+        EmbeddingRecord(
+            id=f"bulk#{i}", text="", vector=[0.01 * (i + 1)] * 1024,
+            metadata={'type': 'chunk', 'file': 'bulk.md'}
+        )
+        for i in range(20)
+    ]
+
+    indexer.add_vectors_batch(records, batch_size=1, show_progress=False)
+    indexer.close()
+
+    # 20 batches: first write, then every 5 writes, then the trailing writes at close
+    assert indexer.client.persist.call_count <= 1 + 20 // 5 + 1
+    assert indexer.collection.count() == 20
+
+
+def test_flush_persists_pending_writes(temp_db_dir, sample_embedding_records):
+    """AC: 永続化ポリシー - flush()で未永続化の書込を永続化すること"""
+    indexer = ChromaDBIndexer(
+        persist_directory=temp_db_dir, persist_every_batches=100, persist_interval_seconds=3600
+    )
+    indexer.add_vectors_batch(sample_embedding_records[:1], show_progress=False)
+    indexer.add_vectors_batch(sample_embedding_records[1:], show_progress=False)
+    indexer.client.persist = Mock()
+
+    indexer.flush()
+    indexer.flush()
+
+    indexer.client.persist.assert_called_once()
+
+
+def test_context_manager_persists_on_exit(temp_db_dir, sample_embedding_records):
+    """AC: 永続化ポリシー - コンテキストマネージャ終了時に永続化すること"""
+    with ChromaDBIndexer(
+        persist_directory=temp_db_dir, persist_every_batches=100, persist_interval_seconds=3600
+    ) as indexer:
+        indexer.add_vectors_batch(sample_embedding_records[:1], show_progress=False)
+        indexer.add_vectors_batch(sample_embedding_records[1:], show_progress=False)
+        indexer.client.persist = Mock(wraps=indexer.client.persist)
+
+    indexer.client.persist.assert_called_once()
@@ -54,7 +54,7 @@ def test_on_modified_event_fires(temp_diary_dir):
     def callback(event):
         events_received.append(event)
 
-    watcher = FileWatcher(vault_root=vault_root, on_change_callback=callback)
+    watcher = FileWatcher(vault_root=vault_root, on_change_callback=callback, debounce_seconds=0.1)
     watcher.start()
 
     try:
@@ -80,7 +80,7 @@ def test_passes_event_to_callback(temp_diary_dir):
     def callback(event):
         events_received.append(event)
 
-    watcher = FileWatcher(vault_root=vault_root, on_change_callback=callback)
+    watcher = FileWatcher(vault_root=vault_root, on_change_callback=callback, debounce_seconds=0.1)
     watcher.start()
 
     try:
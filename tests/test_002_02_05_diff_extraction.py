@@ -74,11 +74,11 @@ def test_extract_diff_large_addition():
 
 
 def test_extract_diff_deletion_returns_empty():
-    """AC: 削除(current_textがprevious_textより短い)の場合、空文字列を返す"""
+    """AC: 削除のみの変更の場合、空文字列を返す"""
     extractor = DiffExtractor()
 
     previous_text = "This is a long text"
-    current_text = "Short"
+    current_text = "This is text"
 
     diff = extractor.extract_diff(previous_text=previous_text, current_text=current_text)
 
@@ -0,0 +1,253 @@
+"""
+Test for Subtask 002-04-03: パフォーマンス最適化 - 履歴から学習する適応的トリガー閾値
+
+書き方に合わせて時間・差分の閾値を学習し、再起動後も引き継ぐこと。
+"""
+import asyncio
+import random
+import shutil
+import tempfile
+from pathlib import Path
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from src.phase2_realtime_analysis.adaptive_thresholds import (
+    AdaptiveThresholds,
+    QuantileSketch,
+    StreamingQuantile
+)
+from src.phase2_realtime_analysis.realtime_analyzer import RealtimeAnalyzer
+from src.phase2_realtime_analysis.timing_delta_signal_detector import TimingDeltaSignalDetector
+from src.phase2_realtime_analysis.trigger_decision_engine import TriggerDecisionEngine
+from src.phase2_realtime_analysis.trigger_rate_limiter import TriggerRateLimiter
+
+
+@pytest.fixture
+def temp_dir():
+    """一時ディレクトリを作成"""
+    path = tempfile.mkdtemp()
+    yield Path(path)
+    shutil.rmtree(path)
+
+
+def _train(adaptive, pause_scale, delta_scale, samples=500, seed=0):
+    rng = random.Random(seed)
+    for _ in range(samples):
+        adaptive.observe(rng.expovariate(1 / pause_scale), int(rng.expovariate(1 / delta_scale)) + 1)
+
+
+def test_streaming_quantile_accuracy_with_constant_memory():
+    """AC: 一定のメモリでストリームの分位点を推定できること"""
+    rng = random.Random(1)
+    estimator = StreamingQuantile(0.9)
+    for _ in range(20000):
+        estimator.add(rng.uniform(0, 100))
+
+    assert estimator.value() == pytest.approx(90, abs=2)
+    assert len(estimator.heights) == 5
+
+
+def test_sketch_interpolates_between_tracked_quantiles():
+    """AC: 追跡していない分位点は前後の推定値から補間すること"""
+    sketch = QuantileSketch()
+    for value in range(1, 1001):
+        sketch.add(value)
+
+    assert sketch.value(0.8) == pytest.approx(800, rel=0.05)
+    assert sketch.value(0.1) == sketch.value(0.5)
+
+
+def test_thresholds_unavailable_until_min_samples(temp_dir):
+    """AC: 学習データが不足している間は固定閾値を使うこと"""
+    adaptive = AdaptiveThresholds(str(temp_dir / "state.json"), min_samples=20, save_every=0)
+    _train(adaptive, pause_scale=60, delta_scale=40, samples=5)
+    detector = TimingDeltaSignalDetector()
+
+    assert adaptive.thresholds() is None
+    assert adaptive.apply(detector) is False
+    assert detector.LONG_PAUSE_SECONDS == TimingDeltaSignalDetector.LONG_PAUSE_SECONDS
+
+
+def test_faster_writer_gets_stricter_thresholds(temp_dir):
+    """AC: 保存頻度が高いほど、目標解析回数に合わせて閾値が厳しくなること"""
+    slow = AdaptiveThresholds(str(temp_dir / "slow.json"), save_every=0)
+    fast = AdaptiveThresholds(str(temp_dir / "fast.json"), save_every=0)
+    _train(slow, pause_scale=300, delta_scale=40)
+    _train(fast, pause_scale=30, delta_scale=40)
+
+    assert fast.fire_fraction() < slow.fire_fraction()
+    assert fast.thresholds()["LARGE_DELTA_CHARS"] > slow.thresholds()["LARGE_DELTA_CHARS"]
+
+
+def test_thresholds_are_ordered(temp_dir):
+    """AC: 学習した閾値の大小関係が保たれること"""
+    adaptive = AdaptiveThresholds(str(temp_dir / "state.json"), save_every=0)
+    _train(adaptive, pause_scale=60, delta_scale=40)
+
+    thresholds = adaptive.thresholds()
+
+    assert thresholds["LONG_PAUSE_SECONDS"] >= thresholds["MEDIUM_PAUSE_SECONDS"]
+    assert thresholds["LARGE_DELTA_CHARS"] >= thresholds["MEDIUM_DELTA_CHARS"] >= thresholds["SMALL_DELTA_CHARS"] >= 1
+
+
+def test_state_persists_across_restarts(temp_dir):
+    """AC: 学習状態を保存し、再起動後に同じ閾値を復元すること"""
+    state_path = str(temp_dir / ".pod201" / "adaptive_thresholds.json")
+    adaptive = AdaptiveThresholds(state_path, save_every=0)
+    _train(adaptive, pause_scale=60, delta_scale=40)
+    adaptive.save()
+
+    restored = AdaptiveThresholds(state_path)
+    restored.load()
+
+    assert restored.thresholds() == adaptive.thresholds()
+
+
+def test_state_is_saved_periodically(temp_dir):
+    """AC: save_every回の観測ごとに学習状態を自動保存すること"""
+    state_path = temp_dir / "adaptive_thresholds.json"
+    adaptive = AdaptiveThresholds(str(state_path), save_every=10)
+
+    _train(adaptive, pause_scale=60, delta_scale=40, samples=9)
+    assert not state_path.exists()
+    _train(adaptive, pause_scale=60, delta_scale=40, samples=1)
+    assert state_path.exists()
+
+
+def test_corrupt_state_is_ignored(temp_dir):
+    """AC: 壊れた状態ファイルは無視して学習をやり直すこと"""
+    state_path = temp_dir / "adaptive_thresholds.json"
+    state_path.write_text("{broken", encoding="utf-8")
+    adaptive = AdaptiveThresholds(str(state_path))
+
+    adaptive.load()
+
+    assert adaptive.pauses.count == 0
+
+
+def test_record_save_learns_once_and_applies_thresholds(temp_dir):
+    """AC: 保存ごとに1回だけ学習し、学習した閾値を検知器に設定すること"""
+    adaptive = AdaptiveThresholds(str(temp_dir / "state.json"), save_every=0)
+    _train(adaptive, pause_scale=30, delta_scale=40)
+    detector = TimingDeltaSignalDetector()
+
+    assert adaptive.record_save(3000.0, 5, detector) is True
+    signals = detector.detect("a" * 100, 0.0, "a" * 100 + "b" * 5, 3000.0)
+    detector.detect("a" * 100, 0.0, "a" * 100 + "b" * 5, 3000.0)
+
+    assert adaptive.pauses.count == 501
+    assert detector.LONG_PAUSE_SECONDS == adaptive.thresholds()["LONG_PAUSE_SECONDS"]
+    assert detector.LONG_PAUSE_SECONDS != TimingDeltaSignalDetector.LONG_PAUSE_SECONDS
+    assert [s.type for s in signals][0] == "long_pause"
+
+
+def _simulate(adaptive, triggers_per_window, windows):
+    # 60 saves 30s apart fill one 1800s feedback window
+    detector = TimingDeltaSignalDetector()
+    for _ in range(windows):
+        for i in range(60):
+            adaptive.record_save(30.0, 20, detector)
+            if i < triggers_per_window:
+                adaptive.record_trigger()
+
+
+def test_trigger_rate_feedback_corrects_fire_fraction(temp_dir):
+    """AC: 実際のトリガー回数が目標を上回れば発火率を下げ、下回れば上げること"""
+    too_many = AdaptiveThresholds(str(temp_dir / "a.json"), target_analyses_per_hour=6, save_every=0)
+    too_few = AdaptiveThresholds(str(temp_dir / "b.json"), target_analyses_per_hour=6, save_every=0)
+    base = AdaptiveThresholds(str(temp_dir / "c.json"), target_analyses_per_hour=6, save_every=0)
+    _simulate(base, triggers_per_window=3, windows=1)  # Exactly on target (6/h)
+
+    _simulate(too_many, triggers_per_window=12, windows=1)  # 24/h
+    _simulate(too_few, triggers_per_window=0, windows=1)
+
+    assert base.correction == pytest.approx(1.0)
+    assert too_many.correction == pytest.approx(0.5)
+    assert too_many.fire_fraction() < base.fire_fraction() < too_few.fire_fraction()
+
+
+def test_trigger_rate_feedback_converges_and_persists(temp_dir):
+    """AC: フィードバック補正が範囲内に収まり、再起動後も引き継がれること"""
+    state_path = str(temp_dir / "state.json")
+    adaptive = AdaptiveThresholds(state_path, save_every=0)
+    _simulate(adaptive, triggers_per_window=60, windows=20)
+
+    low, _ = AdaptiveThresholds.CORRECTION_RANGE
+    assert adaptive.correction == pytest.approx(low)
+    adaptive.save()
+
+    restored = AdaptiveThresholds(state_path)
+    restored.load()
+    assert restored.correction == adaptive.correction
+
+
+def test_analyzer_learns_each_save_once_and_reports_triggers(temp_dir):
+    """AC: 解析器が保存ごとに1回学習し、トリガーした保存を報告すること"""
+    diary = temp_dir / "2026-01-01.md"
+    diary.write_text("一行目。", encoding="utf-8")
+    adaptive = AdaptiveThresholds(str(temp_dir / "state.json"), save_every=0)
+    client = Mock()
+    client.embed = AsyncMock(return_value=[0.1] * 1024)
+    searcher = Mock()
+    searcher.search_multilevel.return_value = ([], [])
+    integrator = Mock()
+    integrator.integrate.return_value = []
+    report_generator = Mock()
+    report_generator.generate_report_async = AsyncMock(return_value="報告")
+    analyzer = RealtimeAnalyzer(
+        client, searcher, integrator, report_generator,
+        trigger_engine=TriggerDecisionEngine(), adaptive_thresholds=adaptive
+    )
+
+    async def run():
+        first = await analyzer.analyze(str(diary))
+        diary.write_text("一行目。" + "あ" * 120 + "。\n\n", encoding="utf-8")
+        second = await analyzer.analyze(str(diary))
+        return first, second
+
+    first, second = asyncio.run(run())
+
+    # Short first save stays below the threshold and is included in the next diff
+    assert (first, second) == (None, "報告")
+    assert analyzer.analyses_not_triggered == 1
+    assert client.embed.call_args.kwargs["text"].startswith("一行目。")
+    assert (adaptive.pauses.count, adaptive.deltas.count) == (1, 1)
+    assert adaptive._window_triggers == 1
+
+
+def test_analyzer_learns_from_saves_the_rate_limiter_defers(temp_dir):
+    """AC: レート制限で待機・置換された保存も、投入時刻で1回ずつ学習すること"""
+    diary = temp_dir / "2026-01-01.md"
+    diary.write_text("一行目。", encoding="utf-8")
+    adaptive = Mock()
+    client = Mock()
+    client.embed = AsyncMock(return_value=[0.1] * 1024)
+    client.aclose = AsyncMock()
+    searcher = Mock()
+    searcher.search_multilevel.return_value = ([], [])
+    integrator = Mock()
+    integrator.integrate.return_value = []
+    report_generator = Mock()
+    report_generator.generate_report_async = AsyncMock(return_value="報告")
+    analyzer = RealtimeAnalyzer(
+        client, searcher, integrator, report_generator,
+        rate_limiter=TriggerRateLimiter(max_per_minute=1, burst=1, file_cooldown_seconds=0),
+        adaptive_thresholds=adaptive
+    )
+
+    async def submit_all():
+        for save_time, text in [(100.0, "一行目。"), (130.0, "一行目。二行目。"), (135.0, "一行目。二行目。三")]:
+            diary.write_text(text, encoding="utf-8")
+            await analyzer._schedule(str(diary), save_time)
+
+    analyzer.start()
+    try:
+        asyncio.run_coroutine_threadsafe(submit_all(), analyzer._loop).result()
+    finally:
+        analyzer.stop()
+
+    assert analyzer.analyses_deferred == 2
+    assert [call.args[:2] for call in adaptive.record_save.call_args_list] == [
+        (None, 0), (30.0, 4), (5.0, 1)
+    ]
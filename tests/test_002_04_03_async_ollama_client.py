@@ -0,0 +1,101 @@
+"""
+Test for Subtask 002-04-03: パフォーマンス最適化 - リアルタイム経路向け非同期OllamaClient
+
+asyncioループ上でOllamaへの要求を行い、不要になった要求をキャンセルできるようにする。
+"""
+import asyncio
+import json
+from unittest.mock import AsyncMock, Mock
+
+import httpx
+
+from src.phase3_pod_report.pod201_report_generator import Pod201ReportGenerator
+from src.utils.async_ollama_client import AsyncOllamaClient
+
+
+def _client(handler):
+    return AsyncOllamaClient(transport=httpx.MockTransport(handler))
+
+
+def test_embed_and_embed_batch():
+    """AC: embed/embed_batchが/api/embedの入力を送信しベクトルを返すこと"""
+    requests_seen = []
+
+    def handler(request):
+        payload = json.loads(request.content)
+        requests_seen.append(payload["input"])
+        count = len(payload["input"]) if isinstance(payload["input"], list) else 1
+        return httpx.Response(200, json={"embeddings": [[0.1] * 1024] * count})
+
+    async def run():
+        async with _client(handler) as client:
+            single = await client.embed("mxbai-embed-large", "a")
+            batch = await client.embed_batch("mxbai-embed-large", ["a", "b", "c"], max_batch=2)
+        return single, batch
+
+    single, batch = asyncio.run(run())
+
+    assert single == [0.1] * 1024
+    assert batch == [[0.1] * 1024] * 3
+    assert requests_seen == ["a", ["a", "b"], ["c"]]
+
+
+def test_errors_return_none():
+    """AC: HTTPエラー時は同期クライアントと同様にNoneを返すこと"""
+    async def run():
+        async with _client(lambda request: httpx.Response(500)) as client:
+            return (
+                await client.generate("llama3.1:8b", "prompt"),
+                await client.embed("mxbai-embed-large", "a"),
+                await client.embed_batch("mxbai-embed-large", ["a", "b"]),
+            )
+
+    assert asyncio.run(run()) == (None, None, [None, None])
+
+
+def test_malformed_json_returns_none():
+    """AC: 不正・途中で切れたJSON応答は同期クライアントと同様にNoneを返すこと"""
+    def handler(request):
+        return httpx.Response(200, content=b'{"embeddings": [[0.1, 0.2')
+
+    async def run():
+        async with _client(handler) as client:
+            return (
+                await client.generate("llama3.1:8b", "prompt"),
+                await client.embed("mxbai-embed-large", "a"),
+                await client.embed_batch("mxbai-embed-large", ["a", "b"]),
+            )
+
+    assert asyncio.run(run()) == (None, None, [None, None])
+
+
+def test_generate_stream_parses_ndjson():
+    """AC: ストリーミング生成でNDJSONの各行を順に返すこと"""
+    body = "\n".join([
+        json.dumps({"response": "報告", "done": False}),
+        "",
+        json.dumps({"response": "：完了", "done": False}),
+        json.dumps({"response": "", "done": True}),
+    ])
+
+    def handler(request):
+        assert json.loads(request.content)["stream"] is True
+        return httpx.Response(200, content=body.encode("utf-8"))
+
+    async def run():
+        async with _client(handler) as client:
+            return [fragment async for fragment in client.generate_stream("llama3.1:8b", "prompt")]
+
+    assert asyncio.run(run()) == ["報告", "：完了"]
+
+
+def test_report_generator_async_uses_async_client():
+    """AC: generate_report_asyncが非同期クライアントで生成し、失敗時はフォールバックすること"""
+    client = Mock()
+    client.generate = AsyncMock(return_value="報告：完了")
+    generator = Pod201ReportGenerator(client)
+
+    assert asyncio.run(generator.generate_report_async([])) == "報告：完了"
+
+    client.generate = AsyncMock(return_value=None)
+    assert asyncio.run(generator.generate_report_async([])).startswith("【警告】")
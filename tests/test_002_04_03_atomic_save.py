@@ -0,0 +1,93 @@
+"""
+Test for Subtask 002-04-03: パフォーマンス最適化 - アトミック保存対応と内容不変の保存の除外
+
+一時ファイル＋リネームによる保存を検知し、内容が変わらない保存は読込・解析の前に破棄する。
+"""
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+from watchdog.events import FileCreatedEvent, FileMovedEvent
+
+from src.phase2_realtime_analysis.file_fingerprint import FingerprintTracker
+from src.phase2_realtime_analysis.file_watcher import DiaryFileHandler, FileWatcher
+
+
+@pytest.fixture
+def temp_vault():
+    """テスト用の一時Vaultと日記ファイルを作成"""
+    temp_dir = tempfile.mkdtemp()
+    diary_dir = Path(temp_dir) / "01_diary" / "2026"
+    diary_dir.mkdir(parents=True)
+    diary_file = diary_dir / "2026-01-01.md"
+    diary_file.write_text("一行目。", encoding="utf-8")
+    yield temp_dir, diary_file
+    shutil.rmtree(temp_dir)
+
+
+def test_handler_reports_created_and_moved_as_modified():
+    """AC: created/movedイベントを日記ファイルの変更として扱うこと"""
+    callback = Mock()
+    handler = DiaryFileHandler(callback=callback)
+
+    handler.on_created(FileCreatedEvent("/vault/01_diary/2026/2026-01-01.md"))
+    handler.on_moved(FileMovedEvent("/vault/01_diary/2026/.2026-01-01.md.tmp", "/vault/01_diary/2026/2026-01-01.md"))
+    handler.on_moved(FileMovedEvent("/vault/01_diary/2026/2026-01-01.md", "/vault/01_diary/2026/backup.bak"))
+
+    paths = [call.args[0].src_path for call in callback.call_args_list]
+    assert paths == ["/vault/01_diary/2026/2026-01-01.md", "/vault/01_diary/2026/2026-01-01.md"]
+
+
+def test_fingerprint_skips_read_when_stat_is_unchanged(temp_vault):
+    """AC: サイズとmtimeが同じ場合はファイルを読まずに未変更と判定すること"""
+    _, diary_file = temp_vault
+    tracker = FingerprintTracker()
+
+    assert tracker.has_changed(str(diary_file))
+    with patch("builtins.open") as mock_open:
+        assert not tracker.has_changed(str(diary_file))
+    mock_open.assert_not_called()
+    assert tracker.unchanged_by_stat == 1
+
+
+def test_fingerprint_detects_touch_without_content_change(temp_vault):
+    """AC: mtimeのみ変化した保存はハッシュ比較で未変更と判定すること"""
+    _, diary_file = temp_vault
+    tracker = FingerprintTracker()
+    tracker.has_changed(str(diary_file))
+
+    stat = diary_file.stat()
+    os.utime(diary_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10_000_000))
+    assert not tracker.has_changed(str(diary_file))
+    assert tracker.unchanged_by_hash == 1
+
+    diary_file.write_text("一行目。二行目。", encoding="utf-8")
+    assert tracker.has_changed(str(diary_file))
+
+
+def test_watcher_detects_atomic_save_and_ignores_noop_save(temp_vault):
+    """AC: アトミック保存を検知し、内容不変の保存ではコールバックしないこと"""
+    vault_root, diary_file = temp_vault
+    received = []
+    watcher = FileWatcher(vault_root=vault_root, on_change_callback=received.append, debounce_seconds=0.1)
+    watcher.start()
+
+    try:
+        # Atomic save: write temp file, then rename over the diary file
+        temp_file = diary_file.with_name(".2026-01-01.md.tmp")
+        temp_file.write_text("一行目。二行目。", encoding="utf-8")
+        os.replace(temp_file, diary_file)
+        time.sleep(0.5)
+        assert [event.src_path for event in received] == [str(diary_file)]
+
+        # No-op save: same content rewritten
+        diary_file.write_text("一行目。二行目。", encoding="utf-8")
+        time.sleep(0.5)
+        assert len(received) == 1
+
+    finally:
+        watcher.stop()
@@ -0,0 +1,84 @@
+"""
+Test for Subtask 002-04-03: パフォーマンス最適化 - /api/embed の入力配列によるバッチ埋め込み
+
+短いチャンクごとのHTTPリクエストのオーバーヘッドを削減する。
+"""
+from unittest.mock import Mock, patch
+
+import requests
+
+from src.phase1_archive_sync.multilevel_vectorizer import MultilevelVectorizer
+from src.utils.ollama_client import OllamaClient
+
+
+def _response(embeddings):
+    response = Mock()
+    response.json.return_value = {"embeddings": embeddings}
+    return response
+
+
+def test_embed_batch_sends_input_arrays():
+    """AC: 複数テキストを1リクエストの入力配列として送信すること"""
+    client = OllamaClient()
+
+    with patch.object(client.session, "post") as mock_post:
+        mock_post.return_value = _response([[0.1] * 1024, [0.2] * 1024])
+        vectors = client.embed_batch("mxbai-embed-large", ["a", "b"])
+
+    mock_post.assert_called_once()
+    assert mock_post.call_args.kwargs["json"]["input"] == ["a", "b"]
+    assert vectors == [[0.1] * 1024, [0.2] * 1024]
+
+
+def test_embed_batch_splits_by_max_batch():
+    """AC: max_batchを超える入力は複数リクエストに分割すること"""
+    client = OllamaClient()
+
+    with patch.object(client.session, "post") as mock_post:
+        mock_post.side_effect = lambda url, json, timeout: _response([[0.1]] * len(json["input"]))
+        vectors = client.embed_batch("mxbai-embed-large", ["a", "b", "c", "d", "e"], max_batch=2)
+
+    assert mock_post.call_count == 3
+    assert len(vectors) == 5
+
+
+def test_embed_batch_marks_failed_batch_as_none():
+    """AC: 失敗したバッチの要素はNoneとし、他のバッチは返すこと"""
+    client = OllamaClient()
+
+    with patch.object(client.session, "post") as mock_post:
+        mock_post.side_effect = [
+            _response([[0.1], [0.2]]),
+            requests.exceptions.ConnectionError("down"),
+        ]
+        vectors = client.embed_batch("mxbai-embed-large", ["a", "b", "c"], max_batch=2)
+
+    assert vectors == [[0.1], [0.2], None]
+
+
+def test_vectorizer_embeds_file_chunks_in_one_batch():
+    """AC: MultilevelVectorizerはファイル内の全チャンクをバッチで送信すること"""
+    mock_ollama = Mock()
+    mock_ollama.embed_batch.side_effect = lambda model, texts, max_batch: [[0.1] * 1024] * len(texts)
+    vectorizer = MultilevelVectorizer(ollama_client=mock_ollama)
+
+    records = vectorizer.vectorize("段落1です。\n\n段落2です。\n\n段落3です。", "2026-01-01.md")
+
+    mock_ollama.embed_batch.assert_called_once()
+    assert len(mock_ollama.embed_batch.call_args.kwargs["texts"]) == len(records)
+    mock_ollama.embed.assert_not_called()
+
+
+def test_vectorizer_retries_missing_batch_entries_individually():
+    """AC: バッチ応答で欠けたチャンクは個別リクエストで再試行すること"""
+    mock_ollama = Mock()
+    mock_ollama.embed_batch.return_value = [[0.1] * 1024, None]
+    mock_ollama.embed.return_value = [0.2] * 1024
+    splitter = Mock()
+    splitter.split.return_value = [Mock(text="一つ目。", seq=0), Mock(text="二つ目。", seq=1)]
+    vectorizer = MultilevelVectorizer(ollama_client=mock_ollama, semantic_splitter=splitter)
+
+    records = vectorizer.vectorize("一つ目。二つ目。", "note.md")
+
+    assert [r.vector[0] for r in records] == [0.1, 0.2]
+    mock_ollama.embed.assert_called_once_with(model="mxbai-embed-large", text="二つ目。")
@@ -0,0 +1,75 @@
+"""
+Test for Subtask 002-04-03: パフォーマンス最適化 - 編集位置を考慮した差分抽出
+
+文書途中の編集でも新たに書かれたテキストのみを埋め込み、末尾全体の再埋め込みを避ける。
+"""
+from unittest.mock import Mock
+
+from src.phase2_realtime_analysis.diff_extractor import DiffExtractor, DiffSpan
+
+
+def _extractor():
+    return DiffExtractor(ollama_client=Mock())
+
+
+def test_append_is_single_insert_span():
+    """AC: 末尾への追記は挿入スパン1つとして返すこと"""
+    spans = _extractor().extract_spans("一行目。\n", "一行目。\n二行目。\n")
+
+    assert spans == [DiffSpan(5, 10, "二行目。\n", "insert")]
+
+
+def test_mid_document_insert_returns_only_inserted_text():
+    """AC: 文書途中への挿入は挿入されたテキストのみを返すこと"""
+    previous_text = "朝。\n夜。\n"
+    current_text = "朝。\n昼。\n夜。\n"
+
+    spans = _extractor().extract_spans(previous_text, current_text)
+
+    assert [span.text for span in spans] == ["昼。\n"]
+    assert current_text[spans[0].start:spans[0].end] == "昼。\n"
+    assert spans[0].kind == "insert"
+
+
+def test_mid_document_edit_does_not_return_tail():
+    """AC: 文書途中の修正で後続テキストを差分に含めないこと"""
+    previous_text = "今日は晴れだった。\n" + "続きの段落。\n" * 50
+    current_text = "今日は雨だった。\n" + "続きの段落。\n" * 50 + "追記。"
+
+    diff = _extractor().extract_diff(previous_text, current_text)
+
+    assert "雨だった。" in diff
+    assert "追記。" in diff
+    assert "続きの段落" not in diff
+
+
+def test_edit_that_shrinks_file_returns_replacement():
+    """AC: ファイルが短くなる修正でも新しいテキストを返すこと"""
+    spans = _extractor().extract_spans("長い長い文章を書いた。", "短文。")
+
+    assert [span.kind for span in spans] == ["replace"]
+    assert "短文" in spans[0].text
+
+
+def test_multiple_edits_return_separate_spans():
+    """AC: 離れた複数の編集はそれぞれのオフセットを持つスパンとして返すこと"""
+    previous_text = "A\nB\nC\nD\n"
+    current_text = "A\nB2\nC\nD2\n"
+
+    spans = _extractor().extract_spans(previous_text, current_text)
+
+    assert [span.text for span in spans] == ["2\n", "D2"]
+    for span in spans:
+        assert current_text[span.start:span.end] == span.text
+
+
+def test_edit_across_compare_blocks():
+    """AC: 比較ブロックの境界をまたぐ位置の編集も正しく抽出すること"""
+    extractor = _extractor()
+    extractor.COMPARE_BLOCK_CHARS = 4
+    previous = "あいうえおかきくけこ\nさしすせそ\n"
+    current = "あいうえおかきくけこ\n追加。\nさしすせそ\n"
+
+    assert extractor.extract_diff(previous, current) == "追加。\n"
+    assert extractor._common_prefix_length("abcdefgh", "abcdeXgh") == 5
+    assert extractor._common_suffix_length("abcdefgh", "abXdefgh") == 5
@@ -0,0 +1,124 @@
+"""
+Test for Subtask 002-04-03: パフォーマンス最適化 - content_hashをキーとした埋め込みキャッシュ
+
+同一チャンクの再ベクトル化を省き、変更されたチャンクのみOllamaに送る。
+"""
+import os
+import shutil
+import tempfile
+from unittest.mock import Mock
+
+import pytest
+
+from src.phase1_archive_sync.multilevel_vectorizer import MultilevelVectorizer
+from src.utils.embedding_cache import EmbeddingCache
+
+
+@pytest.fixture
+def cache():
+    """一時ディレクトリにEmbeddingCacheを作成"""
+    temp_dir = tempfile.mkdtemp()
+    cache = EmbeddingCache(os.path.join(temp_dir, EmbeddingCache.CACHE_FILENAME))
+    yield cache
+    cache.close()
+    shutil.rmtree(temp_dir)
+
+
+def test_put_and_get_roundtrip(cache):
+    """AC: (モデル名, content_hash)をキーにベクトルを保存・取得できること"""
+    cache.put("mxbai-embed-large", "hash1", [0.5] * 1024)
+
+    vector = cache.get("mxbai-embed-large", "hash1")
+
+    assert vector == [0.5] * 1024
+    assert cache.hits == 1
+
+
+def test_get_miss_for_other_model(cache):
+    """AC: モデル名が異なる場合はキャッシュミスとすること"""
+    cache.put("mxbai-embed-large", "hash1", [0.5] * 1024)
+
+    assert cache.get("other-model", "hash1") is None
+    assert cache.misses == 1
+
+
+def test_lru_eviction_keeps_recently_used(cache):
+    """AC: 上限を超えた場合、最も長く参照されていないエントリを削除すること"""
+    cache.max_entries = 2
+    cache.put("m", "a", [0.1])
+    cache.put("m", "b", [0.2])
+    cache.get("m", "a")  # "a" becomes most recently used
+    cache.put("m", "c", [0.3])
+
+    assert len(cache) == 2
+    assert cache.get("m", "a") is not None
+    assert cache.get("m", "b") is None
+    assert cache.get("m", "c") is not None
+
+
+def test_access_times_are_written_together(cache):
+    """AC: ヒット時の参照時刻はまとめて書き込み、ヒットごとにコミットしないこと"""
+    cache.put("m", "a", [0.1])
+    cache.put("m", "b", [0.2])
+
+    def last_access():
+        return dict(cache._conn.execute("SELECT content_hash, last_access FROM embeddings"))
+
+    before = last_access()
+    cache.get("m", "a")
+    cache.get("m", "b")
+    assert last_access() == before
+
+    cache.flush()
+    after = last_access()
+    assert after["a"] > before["a"] and after["b"] > before["b"]
+
+
+def test_cache_persists_across_instances(cache):
+    """AC: キャッシュはディスクに永続化されること"""
+    cache.put("m", "a", [0.25, 0.5])
+
+    reopened = EmbeddingCache(cache.db_path)
+    try:
+        assert reopened.get("m", "a") == [0.25, 0.5]
+    finally:
+        reopened.close()
+
+
+def test_vectorizer_reuses_cached_chunk_vectors(cache):
+    """AC: 同一チャンクはOllamaを呼ばずにキャッシュから取得すること"""
+    mock_ollama = Mock()
+    mock_ollama.embed_batch.side_effect = lambda model, texts, max_batch: [[0.1] * 1024] * len(texts)
+    vectorizer = MultilevelVectorizer(ollama_client=mock_ollama, embedding_cache=cache)
+
+    text = "段落1です。\n\n段落2です。"
+    first = vectorizer.vectorize(text, "2026-01-01.md")
+    calls_after_first = mock_ollama.embed_batch.call_count
+    second = vectorizer.vectorize(text, "2026-01-01.md")
+
+    assert calls_after_first > 0
+    assert mock_ollama.embed_batch.call_count == calls_after_first
+    assert [r.id for r in first] == [r.id for r in second]
+
+
+def test_vectorizer_only_embeds_changed_chunks(cache):
+    """AC: 小さな編集では変更されたチャンクのみ再ベクトル化すること"""
+    mock_ollama = Mock()
+    mock_ollama.embed_batch.side_effect = lambda model, texts, max_batch: [[0.1] * 1024] * len(texts)
+    splitter = Mock()
+    vectorizer = MultilevelVectorizer(
+        ollama_client=mock_ollama, semantic_splitter=splitter, embedding_cache=cache
+    )
+
+    def chunks(*texts):
+        return [Mock(text=t, seq=i) for i, t in enumerate(texts)]
+
+    splitter.split.return_value = chunks("変更なし。", "編集前。")
+    vectorizer.vectorize("変更なし。編集前。", "note.md")
+    splitter.split.return_value = chunks("変更なし。", "編集後。")
+    mock_ollama.embed_batch.reset_mock()
+    vectorizer.vectorize("変更なし。編集後。", "note.md")
+
+    mock_ollama.embed_batch.assert_called_once_with(
+        model="mxbai-embed-large", texts=["編集後。"], max_batch=32
+    )
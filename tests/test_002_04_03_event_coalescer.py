@@ -0,0 +1,148 @@
+"""
+Test for Subtask 002-04-03: パフォーマンス最適化 - ファイルイベントの集約とデバウンス
+
+エディタの1回の保存で発生する複数イベントを1回の解析にまとめる。
+"""
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from src.phase2_realtime_analysis.event_coalescer import EventCoalescer
+
+
+def _event(path):
+    return Mock(src_path=path)
+
+
+@pytest.fixture
+def coalescer_factory():
+    """テスト終了時に停止するEventCoalescerを生成"""
+    coalescers = []
+
+    def create(callback, **kwargs):
+        coalescer = EventCoalescer(callback=callback, **kwargs)
+        coalescer.start()
+        coalescers.append(coalescer)
+        return coalescer
+
+    yield create
+    for coalescer in coalescers:
+        coalescer.stop()
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_burst_is_collapsed_into_one_callback(coalescer_factory):
+    """AC: 同一ファイルの連続イベントを1回のコールバックにまとめること"""
+    received = []
+    coalescer = coalescer_factory(received.append, debounce_seconds=0.1)
+
+    events = [_event("a.md") for _ in range(4)]
+    for event in events:
+        coalescer.submit(event)
+
+    assert _wait_for(lambda: len(received) == 1)
+    time.sleep(0.2)
+    assert received == [events[-1]]
+    assert coalescer.events_received == 4
+    assert coalescer.events_coalesced == 3
+    assert coalescer.events_dispatched == 1
+
+
+def test_waits_for_quiet_period(coalescer_factory):
+    """AC: 最後のイベントからデバウンス時間が経過するまで実行しないこと"""
+    received = []
+    coalescer = coalescer_factory(received.append, debounce_seconds=0.3)
+
+    coalescer.submit(_event("a.md"))
+    time.sleep(0.2)
+    coalescer.submit(_event("a.md"))
+    time.sleep(0.2)
+
+    # The second event restarted the quiet period
+    assert received == []
+    assert _wait_for(lambda: len(received) == 1)
+
+
+def test_paths_are_debounced_independently(coalescer_factory):
+    """AC: ファイルごとに独立してデバウンスすること"""
+    received = []
+    coalescer = coalescer_factory(lambda event: received.append(event.src_path), debounce_seconds=0.1)
+
+    coalescer.submit(_event("a.md"))
+    coalescer.submit(_event("b.md"))
+
+    assert _wait_for(lambda: sorted(received) == ["a.md", "b.md"])
+
+
+def test_caps_in_flight_callbacks_per_path(coalescer_factory):
+    """AC: 実行中の解析がある間の新しいイベントは1回の後続実行にまとめること"""
+    release = threading.Event()
+    active = 0
+    max_active = 0
+    calls = 0
+    lock = threading.Lock()
+
+    def slow_callback(event):
+        nonlocal active, max_active, calls
+        with lock:
+            active += 1
+            calls += 1
+            max_active = max(max_active, active)
+        release.wait(timeout=5)
+        with lock:
+            active -= 1
+
+    coalescer = coalescer_factory(slow_callback, debounce_seconds=0.05)
+
+    coalescer.submit(_event("a.md"))
+    assert _wait_for(lambda: calls == 1)
+    for _ in range(3):
+        coalescer.submit(_event("a.md"))
+    time.sleep(0.2)
+    assert calls == 1
+
+    release.set()
+    assert _wait_for(lambda: calls == 2)
+    assert max_active == 1
+    assert coalescer.events_coalesced == 2
+
+
+def test_stop_drops_pending_events():
+    """AC: 停止時に未実行のイベントを破棄し、破棄数を記録すること"""
+    callback = Mock()
+    coalescer = EventCoalescer(callback=callback, debounce_seconds=10)
+    coalescer.start()
+
+    coalescer.submit(_event("a.md"))
+    coalescer.stop()
+    coalescer.submit(_event("b.md"))
+
+    callback.assert_not_called()
+    assert coalescer.events_dropped == 2
+
+
+def test_callback_error_does_not_stop_scheduler(coalescer_factory):
+    """AC: コールバックの例外後も後続イベントを処理すること"""
+    received = []
+
+    def callback(event):
+        received.append(event.src_path)
+        if event.src_path == "a.md":
+            raise RuntimeError("boom")
+
+    coalescer = coalescer_factory(callback, debounce_seconds=0.05)
+    coalescer.submit(_event("a.md"))
+    assert _wait_for(lambda: received == ["a.md"])
+    coalescer.submit(_event("b.md"))
+
+    assert _wait_for(lambda: received == ["a.md", "b.md"])
@@ -0,0 +1,126 @@
+"""
+Test for Subtask 002-04-03: パフォーマンス最適化 - 追記型編集の末尾のみ読込
+
+日記への追記時はファイル全体を再読込・再デコードせず、追記されたバイトのみを読む。
+"""
+import shutil
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from src.phase2_realtime_analysis.file_state_reader import FileStateReader
+
+
+@pytest.fixture
+def diary_file():
+    """テスト用の日記ファイルを作成"""
+    temp_dir = tempfile.mkdtemp()
+    path = Path(temp_dir) / "2026-01-01.md"
+    path.write_text("一行目。", encoding="utf-8")
+    yield path
+    shutil.rmtree(temp_dir)
+
+
+def _append(path, text):
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(text)
+
+
+def test_first_read_is_full(diary_file):
+    """AC: 初回はファイル全体を読み込むこと"""
+    reader = FileStateReader()
+
+    result = reader.read(str(diary_file))
+
+    assert result.text == "一行目。"
+    assert result.full_read
+    assert result.previous_text is None
+    assert result.appended is None
+
+
+def test_append_reads_only_new_bytes(diary_file):
+    """AC: 追記時は追記分のバイトのみをデコードすること"""
+    reader = FileStateReader()
+    reader.read(str(diary_file))
+    bytes_before = reader.bytes_decoded
+
+    _append(diary_file, "二行目。")
+    result = reader.read(str(diary_file))
+
+    assert result.text == "一行目。二行目。"
+    assert result.appended == "二行目。"
+    assert result.previous_text == "一行目。"
+    assert not result.full_read
+    assert reader.bytes_decoded - bytes_before == len("二行目。".encode("utf-8"))
+    assert reader.tail_reads == 1
+
+
+def test_prefix_change_falls_back_to_full_read(diary_file):
+    """AC: 既存部分が変更された場合はファイル全体を読み直すこと"""
+    reader = FileStateReader()
+    reader.read(str(diary_file))
+
+    diary_file.write_text("一行目を修正。二行目。", encoding="utf-8")
+    result = reader.read(str(diary_file))
+
+    assert result.full_read
+    assert result.text == "一行目を修正。二行目。"
+    assert result.previous_text == "一行目。"
+
+
+def test_truncation_falls_back_to_full_read(diary_file):
+    """AC: ファイルが短くなった場合はファイル全体を読み直すこと"""
+    reader = FileStateReader()
+    reader.read(str(diary_file))
+
+    diary_file.write_text("一行", encoding="utf-8")
+    result = reader.read(str(diary_file))
+
+    assert result.full_read
+    assert result.text == "一行"
+
+
+def test_change_near_old_end_is_detected(diary_file):
+    """AC: 旧末尾付近の変更を検知すること"""
+    diary_file.write_text("あ" * 100, encoding="utf-8")
+    reader = FileStateReader()
+    reader.read(str(diary_file))
+
+    diary_file.write_text("あ" * 99 + "い" + "う", encoding="utf-8")
+    result = reader.read(str(diary_file))
+
+    assert result.full_read
+    assert result.text.endswith("いう")
+
+
+def test_same_length_edit_in_middle_followed_by_append_is_detected(diary_file):
+    """AC: 途中の同じ長さの修正（誤字修正など）の後に追記された場合も検知すること"""
+    diary_file.write_text("あ" * 50 + "誤字" + "あ" * 50, encoding="utf-8")
+    reader = FileStateReader()
+    reader.read(str(diary_file))
+
+    diary_file.write_text("あ" * 50 + "正字" + "あ" * 50 + "追記。", encoding="utf-8")
+    result = reader.read(str(diary_file))
+    again = reader.read(str(diary_file))
+
+    assert result.full_read
+    assert "正字" in result.text
+    assert again.text == result.text
+
+
+def test_partial_character_at_tail_falls_back_to_full_read(diary_file):
+    """AC: 追記分が文字の途中で切れている場合も正しく読み込むこと"""
+    reader = FileStateReader()
+    reader.read(str(diary_file))
+
+    with open(diary_file, 'ab') as f:
+        f.write("二".encode("utf-8")[:2])
+    with pytest.raises(UnicodeDecodeError):
+        reader.read(str(diary_file))
+
+    with open(diary_file, 'ab') as f:
+        f.write("二".encode("utf-8")[2:])
+    result = reader.read(str(diary_file))
+
+    assert result.text == "一行目。二"
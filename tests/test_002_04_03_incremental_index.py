@@ -0,0 +1,173 @@
+"""
+Test for Subtask 002-04-03: パフォーマンス最適化 - マニフェストによる差分インデックス構築
+
+未変更ファイルの再処理を省き、インデックス再構築を変更ファイル数に比例させる。
+"""
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import pytest
+
+from scripts.build_index import build_index
+from src.phase1_archive_sync.index_manifest import IndexManifest, ManifestEntry
+from src.phase1_archive_sync.multilevel_vectorizer import EmbeddingRecord
+
+
+@pytest.fixture
+def temp_dir():
+    """一時ディレクトリを作成"""
+    path = tempfile.mkdtemp()
+    yield path
+    shutil.rmtree(path)
+
+
+@pytest.fixture
+def temp_vault(temp_dir):
+    """テスト用の小規模Vaultを作成"""
+    diary = Path(temp_dir) / "vault" / "01_diary" / "2026"
+    diary.mkdir(parents=True)
+    (diary / "2026-01-01.md").write_text("一日目の日記。", encoding="utf-8")
+    (diary / "2026-01-02.md").write_text("二日目の日記。", encoding="utf-8")
+    return str(Path(temp_dir) / "vault")
+
+
+@pytest.fixture
+def mock_components():
+    """MultilevelVectorizerとChromaDBIndexerをモック化"""
+    def fake_vectorize_chunks(chunks, file_path, current_time):
+        return [EmbeddingRecord(
+            id=f"{file_path}#1#{IndexManifest.compute_hash(text.encode('utf-8'))[:8]}",
+            text=text,
+            vector=[0.1] * 1024,
+            metadata={'level': 2, 'type': 'chunk', 'file': file_path}
+        ) for text in chunks]
+
+    vectorizer = Mock()
+    vectorizer.split_chunks.side_effect = lambda text, file_path: [text]
+    vectorizer.vectorize_chunks.side_effect = fake_vectorize_chunks
+    vectorizer.needs_summary.return_value = False
+    vectorizer.vectorize_summary.return_value = None
+
+    indexer = Mock()
+    indexer.add_vectors_batch.side_effect = lambda records, **kwargs: {
+        'success': len(records), 'failed': 0, 'errors': []
+    }
+    indexer.delete_vectors.side_effect = lambda ids: len(ids)
+
+    with patch('scripts.build_index.MultilevelVectorizer', return_value=vectorizer), \
+            patch('scripts.build_index.ChromaDBIndexer', return_value=indexer):
+        yield vectorizer, indexer
+
+
+def test_manifest_save_and_load_roundtrip(temp_dir):
+    """AC: マニフェストを永続化し、再読み込みできること"""
+    path = os.path.join(temp_dir, IndexManifest.MANIFEST_FILENAME)
+    manifest = IndexManifest(path)
+    manifest.update(ManifestEntry(
+        path="01_diary/2026-01-01.md", mtime=1.5, size=10, content_hash="abc", chunk_ids=["a", "b"]
+    ))
+    manifest.save()
+
+    reloaded = IndexManifest(path)
+    reloaded.load()
+
+    entry = reloaded.get("01_diary/2026-01-01.md")
+    assert entry == ManifestEntry(
+        path="01_diary/2026-01-01.md", mtime=1.5, size=10, content_hash="abc", chunk_ids=["a", "b"]
+    )
+    assert reloaded.is_unchanged("01_diary/2026-01-01.md", 1.5, 10)
+    assert not reloaded.is_unchanged("01_diary/2026-01-01.md", 2.0, 10)
+
+
+def test_manifest_load_handles_corrupt_file(temp_dir):
+    """AC: 破損したマニフェストは空として扱うこと"""
+    path = os.path.join(temp_dir, IndexManifest.MANIFEST_FILENAME)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("{not json")
+
+    manifest = IndexManifest(path)
+    manifest.load()
+
+    assert manifest.paths() == set()
+
+
+def test_rebuild_skips_unchanged_files(temp_vault, temp_dir, mock_components):
+    """AC: 未変更ファイルは再処理しないこと"""
+    vectorizer, _ = mock_components
+    db_path = os.path.join(temp_dir, "db")
+
+    first = build_index(vault_root=temp_vault, db_path=db_path, show_progress=False)
+    second = build_index(vault_root=temp_vault, db_path=db_path, show_progress=False)
+
+    assert first['files_processed'] == 2
+    assert second['files_processed'] == 0
+    assert second['files_skipped'] == 2
+    assert vectorizer.vectorize_chunks.call_count == 2
+
+
+def test_rebuild_processes_changed_file_and_deletes_old_vectors(temp_vault, temp_dir, mock_components):
+    """AC: 変更ファイルのみ再処理し、旧ベクトルを削除すること"""
+    vectorizer, indexer = mock_components
+    db_path = os.path.join(temp_dir, "db")
+    build_index(vault_root=temp_vault, db_path=db_path, show_progress=False)
+    written = [r for call in indexer.add_vectors_batch.call_args_list for r in call.kwargs['records']]
+    old_ids = [r.id for r in written if r.metadata['file'].endswith("2026-01-02.md")]
+
+    changed = Path(temp_vault) / "01_diary" / "2026" / "2026-01-02.md"
+    changed.write_text("二日目の日記。追記した。", encoding="utf-8")
+    stats = build_index(vault_root=temp_vault, db_path=db_path, show_progress=False)
+
+    assert stats['files_processed'] == 1
+    assert stats['files_skipped'] == 1
+    assert stats['vectors_deleted'] == len(old_ids)
+    indexer.delete_vectors.assert_called_with(old_ids)
+    assert vectorizer.vectorize_chunks.call_args.args[1].endswith("2026-01-02.md")
+
+
+def test_rebuild_skips_touched_file_with_same_content(temp_vault, temp_dir, mock_components):
+    """AC: mtimeのみ変化し内容が同一のファイルは再処理しないこと"""
+    vectorizer, _ = mock_components
+    db_path = os.path.join(temp_dir, "db")
+    build_index(vault_root=temp_vault, db_path=db_path, show_progress=False)
+
+    touched = Path(temp_vault) / "01_diary" / "2026" / "2026-01-01.md"
+    stat = touched.stat()
+    os.utime(touched, (stat.st_atime, stat.st_mtime + 10))
+    stats = build_index(vault_root=temp_vault, db_path=db_path, show_progress=False)
+
+    assert stats['files_processed'] == 0
+    assert stats['files_skipped'] == 2
+    assert vectorizer.vectorize_chunks.call_count == 2
+
+
+def test_rebuild_deletes_vectors_of_removed_files(temp_vault, temp_dir, mock_components):
+    """AC: Vaultから削除されたファイルのベクトルを削除すること"""
+    _, indexer = mock_components
+    db_path = os.path.join(temp_dir, "db")
+    build_index(vault_root=temp_vault, db_path=db_path, show_progress=False)
+
+    (Path(temp_vault) / "01_diary" / "2026" / "2026-01-01.md").unlink()
+    stats = build_index(vault_root=temp_vault, db_path=db_path, show_progress=False)
+
+    assert stats['files_removed'] == 1
+    assert stats['vectors_deleted'] == 1
+
+    manifest = IndexManifest(os.path.join(db_path, IndexManifest.MANIFEST_FILENAME))
+    manifest.load()
+    assert manifest.paths() == {str(Path("01_diary") / "2026" / "2026-01-02.md")}
+
+
+def test_full_rebuild_reprocesses_all_files(temp_vault, temp_dir, mock_components):
+    """AC: incremental=Falseの場合は全ファイルを再処理すること"""
+    vectorizer, _ = mock_components
+    db_path = os.path.join(temp_dir, "db")
+    build_index(vault_root=temp_vault, db_path=db_path, show_progress=False)
+
+    stats = build_index(vault_root=temp_vault, db_path=db_path, show_progress=False, incremental=False)
+
+    assert stats['files_processed'] == 2
+    assert stats['vectors_deleted'] == 2
+    assert vectorizer.vectorize_chunks.call_count == 4
@@ -0,0 +1,71 @@
+"""
+Test for Subtask 002-04-03: パフォーマンス最適化 - 追記範囲のみの構造的シグナル検知
+
+追記された範囲のみを走査し、全文走査と同じシグナルを返すこと。
+"""
+import re
+
+import pytest
+
+from src.phase2_realtime_analysis.structural_signal_detector import (
+    StructuralSignalDetector,
+    StructuralSignal
+)
+
+
+def _detect_separately(text):
+    """旧実装と同じく3パターンを個別に走査した結果"""
+    signals = []
+    for signal_type, pattern in [
+        ("paragraph_break", StructuralSignalDetector.PARAGRAPH_BREAK),
+        ("horizontal_rule", StructuralSignalDetector.HORIZONTAL_RULE),
+        ("sentence_end", StructuralSignalDetector.SENTENCE_END),
+    ]:
+        for match in re.finditer(pattern, text):
+            signals.append(StructuralSignal(signal_type, match.start(), match.group()))
+    signals.sort(key=lambda s: s.position)
+    return signals
+
+
+@pytest.mark.parametrize("text", [
+    "First sentence。\n\nSecond paragraph.\n---\nThird section！",
+    "a\n\n\n\n\nb------c。！？",
+    "\n---\n\n--\n\n\n",
+])
+def test_single_pass_matches_separate_passes(text):
+    """AC: 単一の結合正規表現による走査が、個別走査と同じ結果を返すこと"""
+    assert StructuralSignalDetector().detect(text) == _detect_separately(text)
+
+
+@pytest.mark.parametrize("previous, appended", [
+    ("一行目。\n", "\n二行目。"),
+    ("本文\n\n\n", "\n続き"),
+    ("本文--", "-\n続き！"),
+    ("本文-----", "-"),
+    ("一行目。", "二行目。"),
+])
+def test_incremental_detection_matches_full_scan(previous, appended):
+    """AC: 追記範囲のみの検知結果が、全文走査のうち追記範囲にかかるシグナルと一致すること"""
+    detector = StructuralSignalDetector()
+    text = previous + appended
+
+    expected = [s for s in detector.detect(text) if s.position + len(s.pattern) > len(previous)]
+
+    assert detector.detect(text, start=len(previous)) == expected
+
+
+def test_incremental_detection_skips_previous_text():
+    """AC: 追記範囲より前のシグナルは返さないこと"""
+    detector = StructuralSignalDetector()
+    previous = "前の文。\n\n---\n" * 100
+
+    signals = detector.detect(previous + "新しい文！", start=len(previous))
+
+    assert signals == [StructuralSignal("sentence_end", len(previous) + 4, "！")]
+
+
+def test_signals_are_slotted():
+    """AC: シグナルオブジェクトが__dict__を持たないこと"""
+    signal = StructuralSignal(type="sentence_end", position=0, pattern="。")
+
+    assert not hasattr(signal, "__dict__")
@@ -0,0 +1,299 @@
+"""
+Test for Subtask 002-04-03: パフォーマンス最適化 - 並列インデックス構築パイプライン
+
+読込・分割・埋め込み・要約・書込の各ステージを並行させ、初回インデックス構築時間を短縮する。
+"""
+import os
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+
+from src.phase1_archive_sync.index_manifest import IndexManifest
+from src.phase1_archive_sync.index_pipeline import IndexPipeline, PipelineConfig
+from src.phase1_archive_sync.multilevel_vectorizer import EmbeddingRecord
+
+
+@pytest.fixture
+def temp_files():
+    """テスト用ファイルを作成し、絶対パス→相対パスの対応を返す"""
+    temp_dir = tempfile.mkdtemp()
+    paths = {}
+    for i in range(6):
+        path = Path(temp_dir) / f"2026-01-0{i + 1}.md"
+        path.write_text(f"日記{i}。", encoding="utf-8")
+        paths[str(path)] = path.name
+    yield temp_dir, paths
+    shutil.rmtree(temp_dir)
+
+
+def _record(file_path, level=2):
+    return EmbeddingRecord(
+        id=f"{file_path}#{level}", text="", vector=[0.1] * 1024,
+        metadata={'level': level, 'type': 'chunk' if level == 2 else 'summary', 'file': file_path}
+    )
+
+
+def _make_pipeline(temp_dir, vectorizer, config=None):
+    indexer = Mock()
+    indexer.add_vectors_batch.side_effect = lambda records, **kwargs: {
+        'success': len(records), 'failed': 0, 'errors': []
+    }
+    indexer.delete_vectors.side_effect = lambda ids: len(ids)
+    manifest = IndexManifest(os.path.join(temp_dir, IndexManifest.MANIFEST_FILENAME))
+    return IndexPipeline(vectorizer, indexer, manifest, config=config), indexer, manifest
+
+
+def _mock_vectorizer():
+    vectorizer = Mock()
+    vectorizer.split_chunks.side_effect = lambda text, file_path: [text]
+    vectorizer.vectorize_chunks.side_effect = lambda chunks, file_path, current_time: [_record(file_path)]
+    vectorizer.needs_summary.return_value = True
+    vectorizer.vectorize_summary.side_effect = (
+        lambda text, file_path, chunk_count, current_time: _record(file_path, level=1)
+    )
+    return vectorizer
+
+
+def test_pipeline_processes_all_files(temp_files):
+    """AC: 全ファイルが全ステージを通過し、インデックス化されること"""
+    temp_dir, paths = temp_files
+    pipeline, indexer, manifest = _make_pipeline(temp_dir, _mock_vectorizer())
+
+    stats = pipeline.run(paths)
+
+    assert stats['files_processed'] == len(paths)
+    assert stats['level1_count'] == len(paths)
+    assert stats['level2_count'] == len(paths)
+    assert manifest.paths() == set(paths.values())
+    written = [r for call in indexer.add_vectors_batch.call_args_list for r in call.kwargs['records']]
+    assert len(written) == 2 * len(paths)
+
+
+def test_pipeline_reports_per_stage_throughput(temp_files):
+    """AC: 終了時にステージ毎のスループットを報告すること"""
+    temp_dir, paths = temp_files
+    pipeline, _, _ = _make_pipeline(temp_dir, _mock_vectorizer())
+
+    stats = pipeline.run(paths)
+
+    names = [stage.name for stage in stats['stages']]
+    assert names == ["reader", "splitter", "embed", "summary", "writer"]
+    items = {stage.name: stage.items for stage in stats['stages']}
+    # The writer receives chunk and summary tasks separately
+    assert items == {
+        "reader": len(paths), "splitter": len(paths), "embed": len(paths),
+        "summary": len(paths), "writer": 2 * len(paths)
+    }
+    for stage in stats['stages']:
+        assert stage.items_per_second(stats['elapsed_time']) > 0
+
+
+def test_pipeline_runs_embed_workers_concurrently(temp_files):
+    """AC: 埋め込みステージは設定された並列度で同時実行されること"""
+    temp_dir, paths = temp_files
+    vectorizer = _mock_vectorizer()
+    active = 0
+    max_active = 0
+    lock = threading.Lock()
+
+    def slow_vectorize_chunks(chunks, file_path, current_time):
+        nonlocal active, max_active
+        with lock:
+            active += 1
+            max_active = max(max_active, active)
+        time.sleep(0.05)
+        with lock:
+            active -= 1
+        return [_record(file_path)]
+
+    vectorizer.vectorize_chunks.side_effect = slow_vectorize_chunks
+    pipeline, _, _ = _make_pipeline(temp_dir, vectorizer, PipelineConfig(embed_workers=3))
+
+    pipeline.run(paths)
+
+    assert max_active > 1
+
+
+def test_pipeline_continues_after_file_error(temp_files):
+    """AC: 1ファイルの処理失敗で他ファイルの処理を止めないこと"""
+    temp_dir, paths = temp_files
+    vectorizer = _mock_vectorizer()
+    failing = next(iter(paths.values()))
+
+    def vectorize_chunks(chunks, file_path, current_time):
+        if file_path == failing:
+            raise RuntimeError("boom")
+        return [_record(file_path)]
+
+    vectorizer.vectorize_chunks.side_effect = vectorize_chunks
+    pipeline, _, manifest = _make_pipeline(temp_dir, vectorizer)
+
+    stats = pipeline.run(paths)
+
+    assert stats['files_failed'] == 1
+    assert stats['files_processed'] == len(paths) - 1
+    assert failing not in manifest.paths()
+
+
+def test_pipeline_calls_progress_callback_once_per_file(temp_files):
+    """AC: スキップ・失敗を含め、各ファイルにつき1回進捗を通知すること"""
+    temp_dir, paths = temp_files
+    vectorizer = _mock_vectorizer()
+    vectorizer.vectorize_chunks.side_effect = RuntimeError("boom")
+    pipeline, _, _ = _make_pipeline(temp_dir, vectorizer)
+    done = Mock()
+    pipeline.on_file_done = done
+
+    pipeline.run(paths)
+
+    assert done.call_count == len(paths)
+
+
+def test_writer_streams_records_in_bounded_batches(temp_files):
+    """AC: レコードは生成され次第、上限付きバッチでChromaDBへ書き込まれること"""
+    temp_dir, paths = temp_files
+    pipeline, indexer, _ = _make_pipeline(
+        temp_dir, _mock_vectorizer(), PipelineConfig(write_batch_size=4)
+    )
+
+    stats = pipeline.run(paths)
+
+    batch_sizes = [len(call.kwargs['records']) for call in indexer.add_vectors_batch.call_args_list]
+    # Each file contributes 2 records, so a batch never exceeds write_batch_size + 1
+    assert max(batch_sizes) <= 4 + 1
+    assert sum(batch_sizes) == 2 * len(paths)
+    assert stats['batches_written'] == len(batch_sizes) > 1
+
+
+def test_writer_checkpoints_manifest_during_run(temp_files):
+    """AC: 途中でクラッシュしても書込済みファイルが失われないようマニフェストを保存すること"""
+    temp_dir, paths = temp_files
+    pipeline, indexer, manifest = _make_pipeline(
+        temp_dir, _mock_vectorizer(), PipelineConfig(write_batch_size=2, checkpoint_every_batches=1)
+    )
+    saved_sizes = []
+
+    def add_vectors_batch(records, **kwargs):
+        on_disk = IndexManifest(manifest.manifest_path)
+        on_disk.load()
+        saved_sizes.append(len(on_disk.paths()))
+        return {'success': len(records), 'failed': 0, 'errors': []}
+
+    indexer.add_vectors_batch.side_effect = add_vectors_batch
+
+    stats = pipeline.run(paths)
+
+    # Before each later batch, the files of earlier batches are already on disk
+    assert saved_sizes[0] == 0
+    assert saved_sizes == sorted(saved_sizes)
+    assert saved_sizes[-1] > 0
+    # Vectors are persisted at every checkpoint, before the manifest is saved
+    assert indexer.flush.call_count == stats['batches_written']
+
+
+def test_writer_keeps_failed_batch_out_of_manifest(temp_files):
+    """AC: 書込に失敗したバッチのファイルは次回再処理されること"""
+    temp_dir, paths = temp_files
+    pipeline, indexer, manifest = _make_pipeline(temp_dir, _mock_vectorizer())
+    indexer.add_vectors_batch.side_effect = lambda records, **kwargs: {
+        'success': 0, 'failed': len(records), 'errors': ["boom"]
+    }
+
+    stats = pipeline.run(paths)
+
+    assert stats['vectors_failed'] == 2 * len(paths)
+    assert manifest.paths() == set()
+
+
+def test_chunks_are_written_while_summaries_are_pending(temp_files):
+    """AC: 要約生成を待たずにチャンクベクトルが書き込まれること"""
+    temp_dir, paths = temp_files
+    vectorizer = _mock_vectorizer()
+    chunks_written = threading.Event()
+    released = []
+
+    def slow_vectorize_summary(text, file_path, chunk_count, current_time):
+        # Summaries block until every file's chunks reached ChromaDB
+        released.append(chunks_written.wait(timeout=5))
+        return _record(file_path, level=1)
+
+    vectorizer.vectorize_summary.side_effect = slow_vectorize_summary
+    pipeline, indexer, manifest = _make_pipeline(
+        temp_dir, vectorizer, PipelineConfig(write_batch_size=1)
+    )
+    written = []
+
+    def add_vectors_batch(records, **kwargs):
+        written.extend(records)
+        if sum(1 for r in written if r.metadata['level'] == 2) == len(paths):
+            chunks_written.set()
+        return {'success': len(records), 'failed': 0, 'errors': []}
+
+    indexer.add_vectors_batch.side_effect = add_vectors_batch
+
+    stats = pipeline.run(paths)
+
+    assert all(released)
+    assert stats['level1_count'] == len(paths)
+    for relative_path in paths.values():
+        entry = manifest.get(relative_path)
+        assert not entry.summary_pending
+        assert entry.chunk_ids == [f"{relative_path}#1", f"{relative_path}#2"]
+
+
+def test_deferred_summaries_are_marked_pending(temp_files):
+    """AC: 要約を後回しにした場合、チャンクのみ索引しマニフェストに未生成を記録すること"""
+    temp_dir, paths = temp_files
+    vectorizer = _mock_vectorizer()
+    pipeline, _, manifest = _make_pipeline(
+        temp_dir, vectorizer, PipelineConfig(defer_summaries=True)
+    )
+
+    stats = pipeline.run(paths)
+
+    assert vectorizer.vectorize_summary.call_count == 0
+    assert stats['level1_count'] == 0
+    assert stats['level2_count'] == len(paths)
+    assert stats['summaries_pending'] == len(paths)
+    assert all(manifest.get(path).summary_pending for path in paths.values())
+
+
+def test_run_summaries_backfills_pending_summaries(temp_files):
+    """AC: 後続の要約パスで未生成の要約のみを生成すること"""
+    temp_dir, paths = temp_files
+    vectorizer = _mock_vectorizer()
+    pipeline, _, manifest = _make_pipeline(
+        temp_dir, vectorizer, PipelineConfig(defer_summaries=True)
+    )
+    pipeline.run(paths)
+
+    changed_path, changed_name = next(iter(paths.items()))
+    Path(changed_path).write_text("変更後の日記。", encoding="utf-8")
+    done = Mock()
+    pipeline.on_file_done = done
+
+    stats = pipeline.run_summaries(paths)
+
+    assert [stage.name for stage in stats['stages']] == ["summary", "writer"]
+    assert done.call_count == len(paths)
+    # The changed file is left to the next build
+    assert stats['level1_count'] == len(paths) - 1
+    assert stats['summaries_pending'] == 1
+    assert manifest.get(changed_name).summary_pending
+    assert vectorizer.vectorize_chunks.call_count == len(paths)
+    for relative_path in set(paths.values()) - {changed_name}:
+        entry = manifest.get(relative_path)
+        assert not entry.summary_pending
+        assert entry.chunk_ids[0] == f"{relative_path}#1"
+
+
+@pytest.mark.parametrize("field", ["splitter_workers", "embed_workers", "summary_workers", "queue_size"])
+def test_config_rejects_values_below_one(field):
+    """AC: ワーカー数・キューサイズが1未満の設定はValueErrorとすること"""
+    with pytest.raises(ValueError, match=field):
+        PipelineConfig(**{field: 0})
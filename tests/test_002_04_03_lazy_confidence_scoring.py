@@ -0,0 +1,106 @@
+"""
+Test for Subtask 002-04-03: パフォーマンス最適化 - 確信度スコアリングの短絡評価
+
+閾値到達（または到達不能）が確定した時点でシグナル検知を打ち切ること。
+"""
+import itertools
+
+from src.phase2_realtime_analysis.structural_signal_detector import (
+    StructuralSignalDetector,
+    StructuralSignal
+)
+from src.phase2_realtime_analysis.timing_delta_signal_detector import (
+    TimingDeltaSignalDetector,
+    TimingSignal,
+    DeltaSignal
+)
+from src.phase2_realtime_analysis.trigger_decision_engine import TriggerDecisionEngine
+
+
+class _Recorder:
+    """消費されたシグナルを記録するイテラブル"""
+
+    def __init__(self, signals):
+        self.signals = signals
+        self.consumed = 0
+
+    def __iter__(self):
+        for signal in self.signals:
+            self.consumed += 1
+            yield signal
+
+
+def test_cheap_signals_skip_structural_scan():
+    """AC: 時間・差分シグナルで閾値に達した場合、構造的シグナルを走査しないこと"""
+    engine = TriggerDecisionEngine()
+    timing_delta = _Recorder([
+        TimingSignal(type="long_pause", elapsed_seconds=400),
+        DeltaSignal(type="medium_delta", char_delta=50),
+    ])
+    structural = _Recorder([StructuralSignal("sentence_end", 0, "。")])
+
+    assert engine.should_trigger_lazy([
+        (TimingDeltaSignalDetector.SIGNAL_TYPES, timing_delta),
+        (StructuralSignalDetector.SIGNAL_TYPES, structural),
+    ]) is True
+    assert structural.consumed == 0
+
+
+def test_structural_scan_stops_at_threshold():
+    """AC: 閾値に達した時点で残りのシグナルを消費しないこと"""
+    engine = TriggerDecisionEngine()
+    structural = _Recorder([
+        StructuralSignal("horizontal_rule", 0, "---"),
+        StructuralSignal("sentence_end", 5, "。"),
+        StructuralSignal("paragraph_break", 6, "\n\n"),
+    ])
+
+    assert engine.should_trigger_lazy([
+        (TimingDeltaSignalDetector.SIGNAL_TYPES, [TimingSignal("long_pause", 400)]),
+        (StructuralSignalDetector.SIGNAL_TYPES, structural),
+    ]) is True
+    assert structural.consumed == 1
+
+
+def test_unreachable_threshold_stops_early():
+    """AC: 残りのシグナルを全て加えても閾値に届かない場合、走査せずFalseを返すこと"""
+    engine = TriggerDecisionEngine()
+    structural = _Recorder([StructuralSignal("paragraph_break", 0, "\n\n")])
+
+    assert engine.should_trigger_lazy([
+        (("sentence_end",), [StructuralSignal("sentence_end", 0, "。")]),
+        (("paragraph_break",), structural),
+    ]) is False
+    assert structural.consumed == 0
+
+
+def test_lazy_decision_matches_should_trigger():
+    """AC: 短絡評価の結果が全シグナルによるshould_trigger()と一致すること"""
+    engine = TriggerDecisionEngine()
+    timing_options = [[], [TimingSignal("medium_pause", 150)], [TimingSignal("long_pause", 400)]]
+    delta_options = [[], [DeltaSignal("small_delta", 15)], [DeltaSignal("large_delta", 150)]]
+    structural_types = StructuralSignalDetector.SIGNAL_TYPES
+    structural_options = [
+        [StructuralSignal(signal_type, 0, "") for signal_type in combination]
+        for size in range(len(structural_types) + 1)
+        for combination in itertools.combinations(structural_types, size)
+    ]
+
+    for timing, delta, structural in itertools.product(timing_options, delta_options, structural_options):
+        signals = timing + delta + structural
+        lazy = engine.should_trigger_lazy([
+            (TimingDeltaSignalDetector.SIGNAL_TYPES, iter(timing + delta)),
+            (structural_types, iter(structural)),
+        ])
+        assert lazy == engine.should_trigger(signals), signals
+
+
+def test_detector_generators_are_lazy():
+    """AC: 検知器のiter_signals()が消費された分だけ走査すること"""
+    detector = StructuralSignalDetector()
+    text = "---" + "。" * 1000
+
+    signals = detector.iter_signals(text)
+
+    assert next(signals) == StructuralSignal("horizontal_rule", 0, "---")
+    assert detector.detect(text) == list(detector.iter_signals(text))
@@ -0,0 +1,149 @@
+"""
+Test for Subtask 002-04-03: パフォーマンス最適化 - レベル別コレクション
+
+要約とチャンクを別々のコレクションに格納し、フィルタなしで検索すること。
+"""
+import shutil
+import tempfile
+from unittest.mock import MagicMock, Mock
+
+import pytest
+
+from src.phase1_archive_sync.chromadb_indexer import ChromaDBIndexer
+from src.phase1_archive_sync.multilevel_vectorizer import EmbeddingRecord
+from src.phase2_realtime_analysis.similarity_searcher import SimilaritySearcher
+
+
+@pytest.fixture
+def temp_db_dir():
+    """一時的なDBディレクトリを作成"""
+    temp_dir = tempfile.mkdtemp()
+    yield temp_dir
+    shutil.rmtree(temp_dir)
+
+
+def _record(record_id, level, value):
+    return EmbeddingRecord(
+        id=record_id,
+        text=record_id,
+        vector=[value] * 1024,
+        metadata={"type": level, "file": "test.md", "date": "2026-01-01"}
+    )
+
+
+def _records():
+    return [
+        _record("test.md#0#summary", "summary", 0.1),
+        _record("test.md#0#chunk", "chunk", 0.2),
+        _record("test.md#1#chunk", "chunk", 0.3),
+    ]
+
+
+def test_vectors_are_stored_per_level(temp_db_dir):
+    """AC: 要約とチャンクがそれぞれ専用のコレクションに格納されること"""
+    indexer = ChromaDBIndexer(persist_directory=temp_db_dir, split_levels=True)
+
+    indexer.add_vectors_batch(_records(), show_progress=False)
+
+    assert indexer.collection is None
+    assert indexer.level_collections["summary"].count() == 1
+    assert indexer.level_collections["chunk"].count() == 2
+    assert indexer.count() == 3
+
+
+def test_unknown_type_is_rejected(temp_db_dir):
+    """AC: 未知のtypeのベクトルは格納しないこと"""
+    indexer = ChromaDBIndexer(persist_directory=temp_db_dir, split_levels=True)
+
+    with pytest.raises(ValueError):
+        indexer.add_vector("x", [0.1] * 1024, {"type": "other"})
+
+
+def test_delete_and_search_span_levels(temp_db_dir):
+    """AC: 削除と全体検索が両方のコレクションに対して行われること"""
+    indexer = ChromaDBIndexer(persist_directory=temp_db_dir, split_levels=True)
+    indexer.add_vectors_batch(_records(), show_progress=False)
+
+    results = indexer.search([0.2] * 1024, top_k=3)
+    indexer.delete_vectors(["test.md#0#summary", "test.md#1#chunk"])
+
+    assert len(results) == 3
+    assert [r["distance"] for r in results] == sorted(r["distance"] for r in results)
+    assert indexer.count() == 1
+
+
+def test_legacy_collection_is_migrated(temp_db_dir):
+    """AC: 既存の単一コレクションのベクトルがレベル別コレクションへ移行されること"""
+    legacy = ChromaDBIndexer(persist_directory=temp_db_dir)
+    legacy.add_vectors_batch(_records(), show_progress=False)
+    legacy.close()
+
+    indexer = ChromaDBIndexer(persist_directory=temp_db_dir, split_levels=True, migration_batch_size=2)
+
+    assert indexer.migrated_count == 3
+    assert indexer.level_collections["summary"].count() == 1
+    assert indexer.level_collections["chunk"].count() == 2
+    names = {collection.name for collection in indexer.client.list_collections()}
+    assert ChromaDBIndexer.LEGACY_COLLECTION not in names
+
+    restarted = ChromaDBIndexer(persist_directory=temp_db_dir, split_levels=True)
+    assert restarted.migrated_count == 0
+    assert restarted.count() == 3
+
+
+def test_existing_layout_is_detected(temp_db_dir):
+    """AC: split_levels未指定の場合、DBの既存の構成（レベル別コレクション）を使うこと"""
+    built = ChromaDBIndexer(persist_directory=temp_db_dir, split_levels=True)
+    built.add_vectors_batch(_records(), show_progress=False)
+    built.close()
+
+    reopened = ChromaDBIndexer(persist_directory=temp_db_dir)
+
+    assert reopened.split_levels is True
+    assert reopened.count() == 3
+    names = {collection.name for collection in reopened.client.list_collections()}
+    assert ChromaDBIndexer.LEGACY_COLLECTION not in names
+
+
+def test_single_collection_mode_is_refused_for_split_database(temp_db_dir):
+    """AC: レベル別コレクションのDBを単一コレクションとして開くことを拒否すること"""
+    built = ChromaDBIndexer(persist_directory=temp_db_dir, split_levels=True)
+    built.add_vectors_batch(_records(), show_progress=False)
+    built.close()
+
+    with pytest.raises(ValueError):
+        ChromaDBIndexer(persist_directory=temp_db_dir, split_levels=False)
+
+
+def test_searcher_caps_n_results_at_level_collection_size(temp_db_dir):
+    """AC: コレクションのベクトル数がtop_kより少ない場合も、全件を返すこと"""
+    indexer = ChromaDBIndexer(persist_directory=temp_db_dir, split_levels=True)
+    indexer.add_vectors_batch(
+        [_record(f"test.md#{i}#summary", "summary", i / 40) for i in range(3)] +
+        [_record(f"test.md#{i}#chunk", "chunk", i / 40) for i in range(30)],
+        show_progress=False
+    )
+    searcher = SimilaritySearcher(chromadb_indexer=indexer, client_lock=indexer.client_lock)
+
+    assert len(searcher.search_level1([0.1] * 1024)) == 3
+    assert len(searcher.search_level2([0.1] * 1024)) == 10
+
+
+def test_searcher_queries_level_collections_without_filter():
+    """AC: レベル別コレクションがある場合、whereフィルタなしで各コレクションを検索すること"""
+    summary_collection = MagicMock()
+    chunk_collection = MagicMock()
+    for collection, result_id in [(summary_collection, "s"), (chunk_collection, "c")]:
+        collection.query.return_value = {"ids": [[result_id]], "distances": [[0.1]], "metadatas": [[{}]]}
+        collection.count.return_value = 20
+    indexer = Mock()
+    indexer.level_collections = {"summary": summary_collection, "chunk": chunk_collection}
+    searcher = SimilaritySearcher(chromadb_indexer=indexer)
+
+    level1 = searcher.search_level1([0.1] * 1024)
+    level2 = searcher.search_level2([0.1] * 1024)
+
+    assert (level1[0]["id"], level2[0]["id"]) == ("s", "c")
+    summary_collection.query.assert_called_once_with(query_embeddings=[[0.1] * 1024], n_results=5)
+    chunk_collection.query.assert_called_once_with(query_embeddings=[[0.1] * 1024], n_results=10)
+    indexer.collection.query.assert_not_called()
@@ -0,0 +1,135 @@
+"""
+Test for Subtask 002-04-03: パフォーマンス最適化 - Level 1 / Level 2検索の一括実行
+
+2レベルの類似検索を1回の問い合わせで実行し、両方の結果を返すこと。
+"""
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, Mock
+
+import pytest
+
+from src.phase1_archive_sync.chromadb_indexer import ChromaDBIndexer
+from src.phase1_archive_sync.multilevel_vectorizer import EmbeddingRecord
+from src.phase2_realtime_analysis.similarity_searcher import SimilaritySearcher
+
+
+@pytest.fixture
+def temp_db_dir():
+    """一時的なDBディレクトリを作成"""
+    temp_dir = tempfile.mkdtemp()
+    yield temp_dir
+    shutil.rmtree(temp_dir)
+
+
+def _record(record_id, level, index):
+    # Distinct, level-interleaved vectors so that an unfiltered search would mix levels
+    return EmbeddingRecord(
+        id=record_id,
+        text=record_id,
+        vector=[index / 40.0] * 1024,
+        metadata={"type": level, "file": f"{record_id}.md", "date": "2026-01-01"}
+    )
+
+
+def _query_result(result_id):
+    return {
+        "ids": [[result_id]],
+        "distances": [[0.1]],
+        "metadatas": [[{}]]
+    }
+
+
+def _level_results(levels):
+    return {
+        "ids": [[f"{level}-{i}" for i, level in enumerate(levels)]],
+        "distances": [[i / 10 for i in range(len(levels))]],
+        "metadatas": [[{"type": level} for level in levels]]
+    }
+
+
+def test_search_multilevel_partitions_one_query():
+    """AC: 単一コレクションでは1回の問い合わせ結果をレベル別に分けて返すこと"""
+    indexer = Mock(spec=["collection"])
+    indexer.collection = MagicMock()
+    indexer.collection.count.return_value = 100
+    indexer.collection.query.return_value = _level_results(["chunk", "summary"] * 30)
+    searcher = SimilaritySearcher(chromadb_indexer=indexer)
+
+    level1, level2 = searcher.search_multilevel([0.1] * 1024)
+
+    indexer.collection.query.assert_called_once_with(query_embeddings=[[0.1] * 1024], n_results=60)
+    assert [r["id"] for r in level1] == [f"summary-{i}" for i in range(1, 11, 2)]
+    assert [r["id"] for r in level2] == [f"chunk-{i}" for i in range(0, 20, 2)]
+
+
+def test_search_multilevel_queries_a_rare_level_on_its_own():
+    """AC: 一方のレベルが上位に少ない場合、そのレベルのみフィルタ付きで再検索すること"""
+    def query(query_embeddings, n_results, where=None):
+        if where is None:
+            return _level_results(["chunk"] * n_results)
+        return _query_result(f"{where['type']}-{n_results}")
+
+    indexer = Mock(spec=["collection"])
+    indexer.collection = MagicMock()
+    indexer.collection.count.return_value = 100
+    indexer.collection.query.side_effect = query
+    searcher = SimilaritySearcher(chromadb_indexer=indexer)
+
+    level1, level2 = searcher.search_multilevel([0.1] * 1024)
+
+    assert [r["id"] for r in level1] == ["summary-5"]
+    assert len(level2) == 10
+    assert indexer.collection.query.call_count == 2
+
+
+def test_concurrent_search_multilevel_on_real_collection(temp_db_dir):
+    """AC: 実際のコレクションに対して並行に呼び出しても、各レベルの結果が正しいこと"""
+    indexer = ChromaDBIndexer(persist_directory=temp_db_dir)
+    indexer.add_vectors_batch(
+        [_record(f"s{i}", "summary", i) for i in range(20)] +
+        [_record(f"c{i}", "chunk", i) for i in range(40)],
+        show_progress=False
+    )
+    searcher = SimilaritySearcher(chromadb_indexer=indexer, client_lock=indexer.client_lock)
+
+    def search(seed):
+        return searcher.search_multilevel([seed / 100.0] * 1024)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(search, range(100)))
+
+    for level1, level2 in results:
+        assert len(level1) == 5
+        assert len(level2) == 10
+        assert {r["metadata"]["type"] for r in level1} == {"summary"}
+        assert {r["metadata"]["type"] for r in level2} == {"chunk"}
+
+
+def test_search_multilevel_empty_vector():
+    """AC: クエリベクトルが空の場合、検索せずに空の結果を返すこと"""
+    indexer = Mock()
+    searcher = SimilaritySearcher(chromadb_indexer=indexer)
+
+    assert searcher.search_multilevel([]) == ([], [])
+    indexer.collection.query.assert_not_called()
+
+
+def test_search_multilevel_isolates_level_failures():
+    """AC: 一括検索が失敗した場合はレベルごとに検索し、一方が失敗してももう一方の結果を返すこと"""
+    def query(query_embeddings, n_results, where=None):
+        if where is None or where["type"] == "summary":
+            raise RuntimeError("query failed")
+        return _query_result("chunk")
+
+    indexer = Mock(spec=["collection"])
+    indexer.collection = MagicMock()
+    indexer.collection.count.return_value = 100
+    indexer.collection.query.side_effect = query
+    searcher = SimilaritySearcher(chromadb_indexer=indexer)
+
+    level1, level2 = searcher.search_multilevel([0.1] * 1024)
+
+    assert level1 == []
+    assert [r["id"] for r in level2] == ["chunk"]
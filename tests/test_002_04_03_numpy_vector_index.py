@@ -0,0 +1,169 @@
+"""
+Test for Subtask 002-04-03: パフォーマンス最適化 - NumPyによる厳密検索ミラー
+
+全ベクトルをNumPy配列に保持して厳密検索し、インデクサへの書き込みと同期すること。
+"""
+import random
+import shutil
+import tempfile
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from src.phase1_archive_sync.chromadb_indexer import ChromaDBIndexer
+from src.phase1_archive_sync.multilevel_vectorizer import EmbeddingRecord
+from src.phase2_realtime_analysis.numpy_vector_index import NumpyVectorIndex
+from src.phase2_realtime_analysis.similarity_searcher import SimilaritySearcher
+
+
+@pytest.fixture
+def temp_db_dir():
+    """一時的なDBディレクトリを作成"""
+    temp_dir = tempfile.mkdtemp()
+    yield temp_dir
+    shutil.rmtree(temp_dir)
+
+
+def _random_vector(rng):
+    return [rng.uniform(-1, 1) for _ in range(1024)]
+
+
+def _records(rng, count=40):
+    return [
+        EmbeddingRecord(
+            id=f"note{i}.md#{i}#0000",
+            text="",
+            vector=_random_vector(rng),
+            metadata={"type": "summary" if i % 4 == 0 else "chunk", "file": f"note{i}.md"}
+        )
+        for i in range(count)
+    ]
+
+
+@pytest.fixture
+def populated(temp_db_dir):
+    """ベクトルを格納したインデクサと、同期済みのNumPyインデックス"""
+    rng = random.Random(0)
+    indexer = ChromaDBIndexer(persist_directory=temp_db_dir)
+    indexer.add_vectors_batch(_records(rng), show_progress=False)
+    vector_index = NumpyVectorIndex(initial_capacity=4)
+    indexer.add_listener(vector_index)
+    vector_index.load(indexer)
+    return indexer, vector_index, rng
+
+
+def test_results_match_chroma(populated):
+    """AC: NumPyバックエンドの検索結果がChromaDBの検索結果と一致すること"""
+    indexer, vector_index, rng = populated
+    chroma = SimilaritySearcher(indexer, client_lock=indexer.client_lock)
+    mirror = SimilaritySearcher(indexer, vector_index=vector_index)
+
+    for _ in range(3):
+        query = _random_vector(rng)
+        for search in ("search_level1", "search_level2"):
+            expected = getattr(chroma, search)(query)
+            actual = getattr(mirror, search)(query)
+            assert [r["id"] for r in actual] == [r["id"] for r in expected]
+            assert [r["distance"] for r in actual] == pytest.approx(
+                [r["distance"] for r in expected], rel=1e-3
+            )
+            assert all(r["metadata"]["type"] == ("summary" if search == "search_level1" else "chunk")
+                       for r in actual)
+
+
+def test_multilevel_search_matches_per_level_search(populated):
+    """AC: 一括検索(1回の行列積)の結果がレベル別検索の結果と一致すること"""
+    indexer, vector_index, rng = populated
+    searcher = SimilaritySearcher(indexer, vector_index=vector_index)
+    query = _random_vector(rng)
+
+    level1, level2 = searcher.search_multilevel(query)
+
+    assert level1 == vector_index.search(query, top_k=5, level="summary")
+    assert level2 == vector_index.search(query, top_k=10, level="chunk")
+    assert searcher.latency.report()["numpy:multilevel"]["count"] == 1
+
+
+def test_mirror_follows_indexer_writes(populated):
+    """AC: インデクサへの追加・削除がNumPyインデックスに反映されること"""
+    indexer, vector_index, rng = populated
+    vector = _random_vector(rng)
+
+    indexer.add_vector("new.md#0#0000", vector, {"type": "chunk", "file": "new.md"})
+    assert vector_index.search(vector, top_k=1, level="chunk")[0]["id"] == "new.md#0#0000"
+    assert len(vector_index) == 41
+
+    indexer.delete_vectors(["new.md#0#0000", "note0.md#0#0000"])
+    assert len(vector_index) == 39
+    ids = {r["id"] for r in vector_index.search(vector, top_k=100)}
+    assert "new.md#0#0000" not in ids
+    assert "note0.md#0#0000" not in ids
+
+
+def test_delete_during_load_is_not_undone(populated):
+    """AC: 読込中に削除されたベクトルが、削除前に取得したページから復活しないこと"""
+    indexer, _, _ = populated
+    mirror = NumpyVectorIndex(initial_capacity=4)
+    indexer.add_listener(mirror)
+    deleter = threading.Thread(target=indexer.delete_vectors, args=(["note0.md#0#0000"],))
+
+    def get(collection, **kwargs):
+        page = collection.get(**kwargs)
+        if deleter.ident is None:
+            # Delete a row of the fetched page while the load is in progress
+            deleter.start()
+            deleter.join(timeout=0.5)
+        return page
+
+    paged = SimpleNamespace(
+        client_lock=indexer.client_lock,
+        all_collections=lambda: [
+            SimpleNamespace(get=lambda collection=collection, **kwargs: get(collection, **kwargs))
+            for collection in indexer.all_collections()
+        ]
+    )
+    mirror.load(paged, page_size=10)
+    deleter.join()
+
+    assert len(mirror) == 39
+    assert "note0.md#0#0000" not in {r["id"] for r in mirror.search([0.0] * 1024, top_k=100)}
+
+
+def test_delete_keeps_remaining_rows_consistent():
+    """AC: 削除後も残りのベクトルとIDの対応が保たれること"""
+    vector_index = NumpyVectorIndex(dimension=2, initial_capacity=1)
+    vector_index.upsert(
+        ["a", "b", "c"],
+        [[0.0, 0.0], [1.0, 0.0], [0.0, 1.0]],
+        [{"type": "chunk"}] * 3
+    )
+
+    vector_index.delete(["a", "unknown"])
+
+    assert vector_index.search([0.0, 1.0], top_k=1)[0]["id"] == "c"
+    assert vector_index.search([1.0, 0.0], top_k=1)[0] == {
+        "id": "b", "distance": 0.0, "metadata": {"type": "chunk"}
+    }
+
+
+def test_latency_is_reported_per_backend(populated):
+    """AC: NumPyとChromaDBの検索レイテンシのp50/p95を報告すること"""
+    indexer, vector_index, rng = populated
+    searcher = SimilaritySearcher(indexer, vector_index=vector_index, client_lock=indexer.client_lock)
+
+    searcher.search_level1(_random_vector(rng))
+    report = searcher.compare_backends([_random_vector(rng) for _ in range(3)])
+
+    assert set(report) == {"numpy:summary", "numpy:chunk", "chroma:summary", "chroma:chunk"}
+    assert report["numpy:chunk"]["count"] == 3
+    assert report["numpy:chunk"]["p95_ms"] >= report["numpy:chunk"]["p50_ms"]
+    assert searcher.latency.report()["numpy:summary"]["count"] == 1
+
+
+def test_compare_backends_requires_vector_index(populated):
+    """AC: NumPyインデックス未設定で比較した場合、RuntimeErrorとすること"""
+    indexer, _, _ = populated
+
+    with pytest.raises(RuntimeError):
+        SimilaritySearcher(indexer).compare_backends([[0.0] * 1024])
@@ -0,0 +1,64 @@
+"""
+Test for Subtask 002-04-03: パフォーマンス最適化 - OllamaClientの永続HTTPセッションとコネクションプール
+
+呼び出し毎のTCP接続確立を避け、並行処理からも同じ接続プールを再利用する。
+"""
+from unittest.mock import Mock, patch
+
+from src.utils.ollama_client import OllamaClient
+
+
+def _response(data):
+    response = Mock()
+    response.json.return_value = data
+    return response
+
+
+def test_calls_share_one_pooled_session():
+    """AC: generate/embedは単一のSessionを再利用し、モジュールレベルのrequestsを使わないこと"""
+    client = OllamaClient()
+
+    with patch("src.utils.ollama_client.requests.post") as module_post, \
+            patch.object(client.session, "post") as session_post:
+        session_post.side_effect = [
+            _response({"response": "ok"}),
+            _response({"embeddings": [[0.1] * 1024]}),
+        ]
+        assert client.generate("llama3.1:8b", "prompt") == "ok"
+        assert client.embed("mxbai-embed-large", "text") == [0.1] * 1024
+
+    assert session_post.call_count == 2
+    module_post.assert_not_called()
+
+
+def test_pool_size_is_configurable():
+    """AC: コネクションプールのサイズを設定できること"""
+    client = OllamaClient(pool_maxsize=4)
+
+    adapter = client.session.get_adapter(client.base_url)
+
+    assert adapter._pool_maxsize == 4
+
+
+def test_default_and_per_call_timeouts():
+    """AC: 接続/読込タイムアウトは既定値を持ち、呼び出し毎に上書きできること"""
+    client = OllamaClient(connect_timeout=2.0, generate_timeout=90.0)
+
+    with patch.object(client.session, "post") as session_post:
+        session_post.return_value = _response({"response": "ok"})
+        client.generate("llama3.1:8b", "prompt")
+        client.generate("llama3.1:8b", "prompt", timeout=10.0)
+
+    assert session_post.call_args_list[0].kwargs["timeout"] == (2.0, 90.0)
+    assert session_post.call_args_list[1].kwargs["timeout"] == (2.0, 10.0)
+
+
+def test_close_releases_session():
+    """AC: with文の終了時にプール済み接続を解放すること"""
+    client = OllamaClient()
+
+    with patch.object(client.session, "close") as session_close:
+        with client:
+            session_close.assert_not_called()
+
+    session_close.assert_called_once()
@@ -0,0 +1,114 @@
+"""
+Test for Subtask 002-04-03: パフォーマンス最適化 - クエリベクトルのLRUキャッシュ
+
+同じ差分テキストの再埋め込みを省略し、ヒット・ミスを計測すること。
+"""
+import asyncio
+import os
+import shutil
+import tempfile
+import threading
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from src.phase2_realtime_analysis.diff_extractor import DiffExtractor
+from src.phase2_realtime_analysis.realtime_analyzer import RealtimeAnalyzer
+from src.utils.embedding_cache import EmbeddingCache
+from src.utils.query_vector_cache import QueryVectorCache
+
+VECTOR = [0.5] * 1024
+
+
+@pytest.fixture
+def temp_dir():
+    """一時ディレクトリを作成"""
+    path = tempfile.mkdtemp()
+    yield path
+    shutil.rmtree(path)
+
+
+def test_get_and_put_with_metrics():
+    """AC: モデルとテキストのハッシュをキーにベクトルを返し、ヒット・ミスを数えること"""
+    cache = QueryVectorCache()
+
+    assert cache.get("model", "本文") is None
+    cache.put("model", "本文", VECTOR)
+
+    assert cache.get("model", "本文") == VECTOR
+    assert cache.get("other-model", "本文") is None
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_lru_eviction():
+    """AC: max_entriesを超えた場合、最も古く使われたエントリを破棄すること"""
+    cache = QueryVectorCache(max_entries=2)
+    cache.put("model", "a", [1.0])
+    cache.put("model", "b", [2.0])
+    cache.get("model", "a")
+    cache.put("model", "c", [3.0])
+
+    assert cache.get("model", "b") is None
+    assert cache.get("model", "a") == [1.0]
+    assert len(cache) == 2
+    assert cache.evictions == 1
+
+
+def test_evicted_vectors_spill_to_disk(temp_dir):
+    """AC: ディスクキャッシュ指定時は破棄したベクトルを退避し、ミス時に読み戻すこと"""
+    disk_cache = EmbeddingCache(os.path.join(temp_dir, EmbeddingCache.CACHE_FILENAME))
+    cache = QueryVectorCache(max_entries=1, disk_cache=disk_cache)
+    cache.put("model", "a", [1.0])
+    cache.put("model", "b", [2.0])
+
+    assert cache.get("model", "a") == [1.0]
+    assert cache.disk_hits == 1
+    disk_cache.close()
+
+
+def test_diff_extractor_skips_embedding_on_hit():
+    """AC: DiffExtractorは同じ差分テキストを再度埋め込まないこと"""
+    client = Mock()
+    client.embed.return_value = VECTOR
+    extractor = DiffExtractor(ollama_client=client, query_cache=QueryVectorCache())
+
+    assert extractor.vectorize_diff("差分") == VECTOR
+    assert extractor.vectorize_diff("差分") == VECTOR
+    assert client.embed.call_count == 1
+
+
+def test_cache_is_shared_with_realtime_analyzer():
+    """AC: DiffExtractorとリアルタイム解析でキャッシュを共有できること"""
+    cache = QueryVectorCache()
+    DiffExtractor(ollama_client=Mock(embed=Mock(return_value=VECTOR)), query_cache=cache).vectorize_diff("差分")
+    client = Mock()
+    client.embed = AsyncMock(return_value=[0.1] * 1024)
+    analyzer = RealtimeAnalyzer(client, Mock(), Mock(), Mock(), query_cache=cache)
+
+    assert asyncio.run(analyzer._embed_diff("差分")) == VECTOR
+    client.embed.assert_not_called()
+    assert cache.hits == 1
+
+
+def test_analyzer_reads_spill_tier_off_the_event_loop():
+    """AC: リアルタイム解析ではディスク層の読み書きをイベントループ外で行うこと"""
+    threads = []
+    disk_cache = Mock()
+    disk_cache.get.side_effect = lambda model, content_hash: threads.append(threading.get_ident())
+    disk_cache.put.side_effect = lambda model, content_hash, vector: threads.append(threading.get_ident())
+    cache = QueryVectorCache(max_entries=1, disk_cache=disk_cache)
+    cache.put("other", "古い", [0.2])
+    threads.clear()
+    client = Mock()
+    client.embed = AsyncMock(return_value=[0.1] * 1024)
+    analyzer = RealtimeAnalyzer(client, Mock(), Mock(), Mock(), query_cache=cache)
+
+    async def run():
+        return threading.get_ident(), await analyzer._embed_diff("差分")
+
+    loop_thread, vector = asyncio.run(run())
+
+    assert vector == [0.1] * 1024
+    assert len(threads) == 2  # Spill lookup, then write of the evicted vector
+    assert loop_thread not in threads
+    assert cache.misses == 1
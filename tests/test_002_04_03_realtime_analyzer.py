@@ -0,0 +1,191 @@
+"""
+Test for Subtask 002-04-03: パフォーマンス最適化 - asyncioループ上のリアルタイム解析
+
+監視スレッドをブロックせずに解析し、入力が続いた場合は古い解析をキャンセルする。
+"""
+import asyncio
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from src.phase2_realtime_analysis.diff_extractor import DiffExtractor
+from src.phase2_realtime_analysis.realtime_analyzer import RealtimeAnalyzer
+
+
+@pytest.fixture
+def diary_file():
+    """テスト用の日記ファイルを作成"""
+    temp_dir = tempfile.mkdtemp()
+    path = Path(temp_dir) / "2026-01-01.md"
+    path.write_text("一行目。", encoding="utf-8")
+    yield path
+    shutil.rmtree(temp_dir)
+
+
+def _make_analyzer(embed=None, on_report=None):
+    client = Mock()
+    client.embed = embed or AsyncMock(return_value=[0.1] * 1024)
+    client.aclose = AsyncMock()
+    searcher = Mock()
+    searcher.search_level1.return_value = [{"id": "a", "distance": 0.1, "metadata": {}}]
+    searcher.search_level2.return_value = []
+    searcher.search_multilevel.side_effect = lambda vector: (
+        searcher.search_level1(vector), searcher.search_level2(vector)
+    )
+    integrator = Mock()
+    integrator.integrate.side_effect = lambda level1, level2: level1 + level2
+    report_generator = Mock()
+    report_generator.generate_report_async = AsyncMock(return_value="報告")
+    analyzer = RealtimeAnalyzer(
+        client, searcher, integrator, report_generator, on_report=on_report
+    )
+    return analyzer, client
+
+
+def test_analyze_embeds_only_text_added_since_last_analysis(diary_file):
+    """AC: 前回解析以降の追記分のみを埋め込み、レポートを生成すること"""
+    analyzer, client = _make_analyzer()
+
+    async def run():
+        first = await analyzer.analyze(str(diary_file))
+        diary_file.write_text("一行目。二行目。", encoding="utf-8")
+        second = await analyzer.analyze(str(diary_file))
+        third = await analyzer.analyze(str(diary_file))
+        return first, second, third
+
+    first, second, third = asyncio.run(run())
+
+    assert (first, second, third) == ("報告", "報告", None)
+    assert [call.kwargs["text"] for call in client.embed.call_args_list] == ["一行目。", "二行目。"]
+    assert analyzer.analyses_completed == 2
+
+
+def test_submit_cancels_stale_analysis(diary_file):
+    """AC: 同一ファイルの新しい変更で、実行中の古い解析をキャンセルすること"""
+    started = threading.Event()
+    reports = []
+    delivered = threading.Event()
+
+    async def slow_embed(model, text):
+        started.set()
+        await asyncio.sleep(0.2)
+        return [0.1] * 1024
+
+    def on_report(file_path, report):
+        reports.append(file_path)
+        delivered.set()
+
+    analyzer, _ = _make_analyzer(embed=AsyncMock(side_effect=slow_embed), on_report=on_report)
+    analyzer.start()
+    try:
+        analyzer.submit(str(diary_file))
+        assert started.wait(timeout=5)
+        diary_file.write_text("一行目。二行目。", encoding="utf-8")
+        analyzer.submit(str(diary_file))
+        assert delivered.wait(timeout=5)
+    finally:
+        analyzer.stop()
+
+    assert reports == [str(diary_file)]
+    assert analyzer.analyses_cancelled == 1
+    assert analyzer.analyses_completed == 1
+
+
+def test_submit_does_not_block_caller(diary_file):
+    """AC: イベント配信スレッドは解析完了を待たずに戻ること"""
+    release = threading.Event()
+
+    async def blocked_embed(model, text):
+        while not release.is_set():
+            await asyncio.sleep(0.01)
+        return [0.1] * 1024
+
+    analyzer, client = _make_analyzer(embed=AsyncMock(side_effect=blocked_embed))
+    analyzer.start()
+    try:
+        started = time.perf_counter()
+        analyzer.on_file_event(Mock(src_path=str(diary_file)))
+        assert time.perf_counter() - started < 0.1
+    finally:
+        release.set()
+        analyzer.stop()
+
+    client.aclose.assert_awaited_once()
+
+
+def test_analyze_streams_report_tokens(diary_file):
+    """AC: on_token指定時はレポートを断片ごとに通知すること"""
+    tokens = []
+    analyzer, _ = _make_analyzer()
+    analyzer.on_token = lambda file_path, fragment: tokens.append((file_path, fragment))
+
+    async def generate_report_async(results, on_token=None):
+        on_token("報告")
+        return "報告"
+
+    analyzer.report_generator.generate_report_async = generate_report_async
+
+    assert asyncio.run(analyzer.analyze(str(diary_file))) == "報告"
+    assert tokens == [(str(diary_file), "報告")]
+
+
+@pytest.mark.parametrize("previous_text, current_text, expected", [
+    # A break completed by the appended text counts
+    ("今日は晴れ。\n", "今日は晴れ。\n\n新しい段落", ["paragraph_break"]),
+    # Newlines joining separate spans are not breaks
+    ("A1\nB1\nC1", "A2\nB1\nC2", []),
+])
+def test_structural_signals_are_found_in_changed_spans(diary_file, previous_text, current_text, expected):
+    """AC: 構造シグナルは現在のテキストの変更箇所から検出すること"""
+    analyzer, _ = _make_analyzer()
+    signals = []
+
+    def should_trigger_lazy(sources):
+        signals.extend(signal.type for signal in sources[1][1])
+        return False
+
+    analyzer.trigger_engine = Mock()
+    analyzer.trigger_engine.should_trigger_lazy.side_effect = should_trigger_lazy
+    analyzer._analyzed_texts[str(diary_file)] = previous_text
+    diary_file.write_text(current_text, encoding="utf-8")
+
+    assert asyncio.run(analyzer.analyze(str(diary_file))) is None
+    assert signals == expected
+
+
+def test_appends_are_diffed_from_the_verified_tail(diary_file):
+    """AC: 追記のみの間はファイル読込で検証済みの追記分を差分とし、テキストを再比較しないこと"""
+    analyzer, client = _make_analyzer()
+    analyzer.diff_extractor = Mock(wraps=DiffExtractor())
+    analyzer.trigger_engine = Mock()
+    analyzer.trigger_engine.should_trigger_lazy.side_effect = [True, True, False, True, True]
+
+    def append(text):
+        with open(diary_file, 'a', encoding='utf-8') as f:
+            f.write(text)
+
+    async def run():
+        await analyzer.analyze(str(diary_file))
+        append("二行目。")
+        await analyzer.analyze(str(diary_file))
+        # An untriggered append is carried into the next diff
+        append("三行目。")
+        await analyzer.analyze(str(diary_file))
+        append("四行目。")
+        await analyzer.analyze(str(diary_file))
+        assert analyzer.diff_extractor.extract_spans.call_count == 1
+        # An edit before the end is diffed again
+        diary_file.write_text("一行目を直した。二行目。三行目。四行目。", encoding="utf-8")
+        await analyzer.analyze(str(diary_file))
+
+    asyncio.run(run())
+
+    assert analyzer.diff_extractor.extract_spans.call_count == 2
+    assert [call.kwargs["text"] for call in client.embed.call_args_list] == [
+        "一行目。", "二行目。", "三行目。四行目。", "を直した"
+    ]
@@ -0,0 +1,135 @@
+"""
+Test for Subtask 002-04-03: パフォーマンス最適化 - リアルタイム状態の永続化
+
+再起動後も解析済みの状態を復元し、ファイル全体を再度埋め込まないこと。
+"""
+import asyncio
+import shutil
+import tempfile
+from pathlib import Path
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from src.phase2_realtime_analysis.realtime_analyzer import RealtimeAnalyzer
+from src.phase2_realtime_analysis.realtime_state import RealtimeStateStore
+
+
+@pytest.fixture
+def temp_dir():
+    """一時ディレクトリを作成"""
+    path = tempfile.mkdtemp()
+    yield Path(path)
+    shutil.rmtree(path)
+
+
+def _make_analyzer(state_store):
+    client = Mock()
+    client.embed = AsyncMock(return_value=[0.1] * 1024)
+    searcher = Mock()
+    searcher.search_level1.return_value = [{"id": "a", "distance": 0.1, "metadata": {}}]
+    searcher.search_level2.return_value = []
+    searcher.search_multilevel.side_effect = lambda vector: (
+        searcher.search_level1(vector), searcher.search_level2(vector)
+    )
+    integrator = Mock()
+    integrator.integrate.side_effect = lambda level1, level2: level1 + level2
+    report_generator = Mock()
+    report_generator.generate_report_async = AsyncMock(return_value="報告")
+    analyzer = RealtimeAnalyzer(
+        client, searcher, integrator, report_generator, state_store=state_store
+    )
+    return analyzer, client
+
+
+def test_save_and_load_roundtrip(temp_dir):
+    """AC: 保存した状態を別インスタンスで読み込めること"""
+    state_path = str(temp_dir / ".pod201" / "realtime_state.json")
+    store = RealtimeStateStore(state_path)
+    store.update("a.md", "本文。", timestamp=100.0)
+    store.save()
+
+    loaded = RealtimeStateStore(state_path)
+    loaded.load()
+
+    assert loaded.get("a.md") == store.get("a.md")
+    assert loaded.get("a.md").size == len("本文。".encode("utf-8"))
+    assert loaded.get("a.md").timestamp == 100.0
+
+
+def test_corrupt_state_file_is_treated_as_empty(temp_dir):
+    """AC: 壊れた状態ファイルは空として扱うこと"""
+    state_path = temp_dir / "realtime_state.json"
+    state_path.write_text("{not json", encoding="utf-8")
+
+    store = RealtimeStateStore(str(state_path))
+    store.load()
+
+    assert store.entries == {}
+
+
+def test_entries_are_bounded(temp_dir):
+    """AC: 保持するファイル数がmax_entriesを超えないこと"""
+    store = RealtimeStateStore(str(temp_dir / "realtime_state.json"), max_entries=2)
+    store.update("a.md", "a", timestamp=1.0)
+    store.update("b.md", "b", timestamp=2.0)
+    store.update("c.md", "c", timestamp=3.0)
+
+    assert set(store.entries) == {"b.md", "c.md"}
+
+
+def test_restore_text_only_for_appended_files(temp_dir):
+    """AC: 追記のみの場合は解析済みテキストを復元し、途中が編集された場合はNoneを返すこと"""
+    store = RealtimeStateStore(str(temp_dir / "realtime_state.json"))
+    store.update("a.md", "一行目。", timestamp=1.0)
+
+    assert store.restore_text("a.md", "一行目。二行目。") == "一行目。"
+    assert store.restore_text("a.md", "一行め。二行目。") is None
+    assert store.restore_text("b.md", "一行目。") is None
+
+
+def test_analyzer_embeds_only_new_text_after_restart(temp_dir):
+    """AC: 再起動後の最初の解析で、前回終了時以降の追記分のみを埋め込むこと"""
+    diary = temp_dir / "2026-01-01.md"
+    diary.write_text("一行目。", encoding="utf-8")
+    state_path = str(temp_dir / ".pod201" / "realtime_state.json")
+
+    analyzer, _ = _make_analyzer(RealtimeStateStore(state_path))
+    asyncio.run(analyzer.analyze(str(diary)))
+
+    diary.write_text("一行目。二行目。", encoding="utf-8")
+    store = RealtimeStateStore(state_path)
+    store.load()
+    restarted, client = _make_analyzer(store)
+
+    assert asyncio.run(restarted.analyze(str(diary))) == "報告"
+    assert [call.kwargs["text"] for call in client.embed.call_args_list] == ["二行目。"]
+
+
+def test_analyzer_measures_first_pause_after_restart_from_stored_save(temp_dir):
+    """AC: 再起動後の最初の保存の間隔を、保存済みの最終解析時刻から測ること"""
+    diary = temp_dir / "2026-01-01.md"
+    diary.write_text("一行目。二行目。", encoding="utf-8")
+    store = RealtimeStateStore(str(temp_dir / "realtime_state.json"))
+    store.update(str(diary), "一行目。", timestamp=100.0)
+    analyzer, _ = _make_analyzer(store)
+
+    assert analyzer._record_save_time(str(diary), 160.0) == 100.0
+    assert analyzer._record_save_time(str(diary), 170.0) == 160.0
+
+    # The stored time is the analyzed save's, so the next restart resumes from it
+    assert asyncio.run(analyzer.analyze(str(diary))) == "報告"
+    assert store.get(str(diary)).timestamp == analyzer._save_times[str(diary)]
+
+
+def test_analyzer_resynchronizes_file_edited_while_stopped(temp_dir):
+    """AC: 停止中に途中が編集されたファイルは全体を埋め込まずに状態を更新すること"""
+    diary = temp_dir / "2026-01-01.md"
+    diary.write_text("一行目。", encoding="utf-8")
+    store = RealtimeStateStore(str(temp_dir / "realtime_state.json"))
+    store.update(str(diary), "別の内容。", timestamp=1.0)
+    analyzer, client = _make_analyzer(store)
+
+    assert asyncio.run(analyzer.analyze(str(diary))) is None
+    client.embed.assert_not_called()
+    assert store.restore_text(str(diary), "一行目。") == "一行目。"
@@ -0,0 +1,125 @@
+"""
+Test for Subtask 002-04-03: パフォーマンス最適化 - 意味的変化ゲート
+
+前回解析した差分と意味的に近い差分では、検索とレポート生成を省略すること。
+"""
+import asyncio
+import shutil
+import tempfile
+from pathlib import Path
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from src.phase2_realtime_analysis.realtime_analyzer import RealtimeAnalyzer
+from src.phase2_realtime_analysis.semantic_change_gate import SemanticChangeGate
+
+VECTOR_A = [1.0] + [0.0] * 1023
+VECTOR_A_NEAR = [1.0, 0.1] + [0.0] * 1022
+VECTOR_B = [0.0, 1.0] + [0.0] * 1022
+
+
+def test_similar_vector_skips_search():
+    """AC: コサイン類似度が閾値以上の場合、検索を省略すること"""
+    gate = SemanticChangeGate(similarity_threshold=0.95)
+
+    assert gate.should_search("a.md", VECTOR_A) is True
+    gate.record("a.md", VECTOR_A, ["x"])
+
+    assert gate.should_search("a.md", VECTOR_A_NEAR) is False
+    assert gate.should_search("a.md", VECTOR_B) is True
+    assert gate.should_search("b.md", VECTOR_A) is True
+    assert gate.searches_skipped == 1
+
+
+def test_same_result_ids_skip_report():
+    """AC: 上位結果のIDが前回と同じ場合、レポート生成を省略すること"""
+    gate = SemanticChangeGate()
+    gate.record("a.md", VECTOR_A, ["x", "y"])
+
+    assert gate.should_report("a.md", ["x", "y"]) is False
+    assert gate.should_report("a.md", ["y", "x"]) is True
+    assert gate.reports_skipped == 1
+
+
+def test_forget_resets_file():
+    """AC: forget()後は次の差分を必ず解析すること"""
+    gate = SemanticChangeGate()
+    gate.record("a.md", VECTOR_A, ["x"])
+    gate.forget("a.md")
+
+    assert gate.should_search("a.md", VECTOR_A) is True
+
+
+@pytest.fixture
+def diary_file():
+    """テスト用の日記ファイルを作成"""
+    temp_dir = tempfile.mkdtemp()
+    path = Path(temp_dir) / "2026-01-01.md"
+    path.write_text("一行目。", encoding="utf-8")
+    yield path
+    shutil.rmtree(temp_dir)
+
+
+def _make_analyzer(vectors, result_ids):
+    client = Mock()
+    client.embed = AsyncMock(side_effect=vectors)
+    searcher = Mock()
+    searcher.search_level1.side_effect = [
+        [{"id": result_id, "distance": 0.1, "metadata": {}} for result_id in ids]
+        for ids in result_ids
+    ]
+    searcher.search_level2.return_value = []
+    searcher.search_multilevel.side_effect = lambda vector: (
+        searcher.search_level1(vector), searcher.search_level2(vector)
+    )
+    integrator = Mock()
+    integrator.integrate.side_effect = lambda level1, level2: level1 + level2
+    report_generator = Mock()
+    report_generator.generate_report_async = AsyncMock(return_value="報告")
+    analyzer = RealtimeAnalyzer(
+        client, searcher, integrator, report_generator,
+        change_gate=SemanticChangeGate(similarity_threshold=0.95)
+    )
+    return analyzer, searcher, report_generator
+
+
+def _analyze_appends(analyzer, diary_file, appends):
+    async def run():
+        reports = [await analyzer.analyze(str(diary_file))]
+        for text in appends:
+            diary_file.write_text(diary_file.read_text(encoding="utf-8") + text, encoding="utf-8")
+            reports.append(await analyzer.analyze(str(diary_file)))
+        return reports
+
+    return asyncio.run(run())
+
+
+def test_analyzer_skips_search_for_similar_diff(diary_file):
+    """AC: 前回と近い差分では検索とレポート生成を行わず、差分は解析済みとすること"""
+    analyzer, searcher, report_generator = _make_analyzer(
+        [VECTOR_A, VECTOR_A_NEAR, VECTOR_B], [["x"], ["y"]]
+    )
+
+    reports = _analyze_appends(analyzer, diary_file, ["二行目。", "三行目。"])
+
+    assert reports == ["報告", None, "報告"]
+    assert searcher.search_level1.call_count == 2
+    assert report_generator.generate_report_async.await_count == 2
+    assert [call.kwargs["text"] for call in analyzer.ollama_client.embed.call_args_list] == [
+        "一行目。", "二行目。", "三行目。"
+    ]
+
+
+def test_analyzer_skips_report_for_same_results(diary_file):
+    """AC: 検索結果の上位IDが前回と同じ場合、レポートを生成しないこと"""
+    analyzer, searcher, report_generator = _make_analyzer(
+        [VECTOR_A, VECTOR_B], [["x", "y"], ["x", "y"]]
+    )
+
+    reports = _analyze_appends(analyzer, diary_file, ["二行目。"])
+
+    assert reports == ["報告", None]
+    assert searcher.search_level1.call_count == 2
+    assert report_generator.generate_report_async.await_count == 1
+    assert analyzer.change_gate.reports_skipped == 1
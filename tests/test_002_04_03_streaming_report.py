@@ -0,0 +1,121 @@
+"""
+Test for Subtask 002-04-03: パフォーマンス最適化 - Pod201レポートのストリーミング出力
+
+生成完了を待たずに最初のトークンから表示し、体感遅延を最初のトークンまでの時間に短縮する。
+"""
+import asyncio
+import json
+from io import StringIO
+from unittest.mock import Mock, patch, mock_open
+
+import requests
+from rich.console import Console
+
+from src.phase3_pod_report.pod201_report_generator import Pod201ReportGenerator
+from src.utils.ollama_client import OllamaClient
+
+
+def _generator(ollama_client):
+    with patch("builtins.open", mock_open(read_data="報告：Pod201")):
+        return Pod201ReportGenerator(ollama_client=ollama_client)
+
+
+def _stream_response(lines):
+    response = Mock()
+    response.__enter__ = Mock(return_value=response)
+    response.__exit__ = Mock(return_value=False)
+    response.iter_lines.return_value = [line.encode("utf-8") for line in lines]
+    return response
+
+
+def test_client_generate_stream_parses_ndjson():
+    """AC: ストリーミング応答のNDJSONを解析し、断片を順に返すこと"""
+    client = OllamaClient()
+    lines = [
+        json.dumps({"response": "報告", "done": False}),
+        "",
+        json.dumps({"response": "：当機", "done": False}),
+        json.dumps({"response": "", "done": True}),
+    ]
+
+    with patch.object(client.session, "post") as session_post:
+        session_post.return_value = _stream_response(lines)
+        fragments = list(client.generate_stream("llama3.1:8b", "prompt"))
+        text = client.generate("llama3.1:8b", "prompt", stream=True)
+
+    assert fragments == ["報告", "：当機"]
+    assert text == "報告：当機"
+    assert session_post.call_args.kwargs["stream"] is True
+    assert session_post.call_args.kwargs["json"]["stream"] is True
+
+
+def test_client_generate_stream_ends_on_error():
+    """AC: 通信エラー時は例外を送出せずストリームを終了すること"""
+    client = OllamaClient()
+
+    with patch.object(client.session, "post") as session_post:
+        session_post.side_effect = requests.exceptions.ConnectionError("down")
+        assert list(client.generate_stream("llama3.1:8b", "prompt")) == []
+        assert client.generate("llama3.1:8b", "prompt", stream=True) is None
+
+
+def test_generate_report_calls_on_token_per_fragment():
+    """AC: on_token指定時は断片ごとにコールバックし、全文を返すこと"""
+    ollama = Mock()
+    ollama.generate_stream.return_value = iter(["報告：", "類似", "記録あり"])
+    generator = _generator(ollama)
+    tokens = []
+
+    report = generator.generate_report([], on_token=tokens.append)
+
+    assert tokens == ["報告：", "類似", "記録あり"]
+    assert report == "報告：類似記録あり"
+    ollama.generate.assert_not_called()
+
+
+def test_generate_report_stream_falls_back_when_empty():
+    """AC: LLMが何も返さない場合はフォールバックレポートを返すこと"""
+    ollama = Mock()
+    ollama.generate_stream.return_value = iter([])
+    generator = _generator(ollama)
+
+    fragments = list(generator.generate_report_stream([]))
+
+    assert len(fragments) == 1
+    assert fragments[0].startswith("【警告】LLM生成失敗")
+
+
+def test_generate_report_async_streams_tokens():
+    """AC: 非同期経路でも断片ごとにコールバックすること"""
+    async def fake_stream(model, prompt):
+        for fragment in ["報告：", "完了"]:
+            yield fragment
+
+    ollama = Mock()
+    ollama.generate_stream = fake_stream
+    generator = _generator(ollama)
+    tokens = []
+
+    report = asyncio.run(generator.generate_report_async([], on_token=tokens.append))
+
+    assert tokens == ["報告：", "完了"]
+    assert report == "報告：完了"
+
+
+def test_render_report_stream_renders_incrementally():
+    """AC: Rich Liveで断片を逐次描画し、全文を返すこと"""
+    generator = _generator(Mock())
+    buffer = StringIO()
+    console = Console(file=buffer, width=80, force_terminal=True)
+    seen = []
+
+    def fragments():
+        for fragment in ["報告：", "当機は", "記録を発見した"]:
+            seen.append(fragment)
+            yield fragment
+
+    report = generator.render_report_stream(fragments(), console=console)
+
+    assert report == "報告：当機は記録を発見した"
+    assert seen == ["報告：", "当機は", "記録を発見した"]
+    assert "Pod201" in buffer.getvalue()
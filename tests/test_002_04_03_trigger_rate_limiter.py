@@ -0,0 +1,159 @@
+"""
+Test for Subtask 002-04-03: パフォーマンス最適化 - 解析トリガーのレート制限
+
+解析の開始頻度を全体とファイル単位で制限し、待機中の要求は最新のものだけを残すこと。
+"""
+import asyncio
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from src.phase2_realtime_analysis.realtime_analyzer import RealtimeAnalyzer
+from src.phase2_realtime_analysis.trigger_rate_limiter import TriggerRateLimiter
+
+
+class _Clock:
+    """手動で進める時計"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_global_bucket_limits_starts_per_minute():
+    """AC: 全体で1分あたりmax_per_minute回を超えて解析を開始しないこと"""
+    clock = _Clock()
+    limiter = TriggerRateLimiter(max_per_minute=6, burst=2, file_cooldown_seconds=0, clock=clock)
+
+    assert limiter.acquire("a.md") == 0.0
+    assert limiter.acquire("b.md") == 0.0
+    assert limiter.acquire("c.md") == pytest.approx(10.0)
+
+    clock.now = 10.0
+    assert limiter.acquire("c.md") == 0.0
+    assert (limiter.acquired, limiter.throttled) == (3, 1)
+
+
+def test_file_cooldown():
+    """AC: 同一ファイルはクールダウン中に再度開始しないこと"""
+    clock = _Clock()
+    limiter = TriggerRateLimiter(max_per_minute=600, burst=10, file_cooldown_seconds=30, clock=clock)
+
+    assert limiter.acquire("a.md") == 0.0
+    clock.now = 5.0
+    assert limiter.acquire("a.md") == pytest.approx(25.0)
+    assert limiter.acquire("b.md") == 0.0
+
+    clock.now = 30.0
+    assert limiter.acquire("a.md") == 0.0
+
+
+def test_invalid_configuration():
+    """AC: 不正な設定値はValueErrorとすること"""
+    with pytest.raises(ValueError):
+        TriggerRateLimiter(max_per_minute=0)
+    with pytest.raises(ValueError):
+        TriggerRateLimiter(burst=0)
+
+
+@pytest.fixture
+def diary_file():
+    """テスト用の日記ファイルを作成"""
+    temp_dir = tempfile.mkdtemp()
+    path = Path(temp_dir) / "2026-01-01.md"
+    path.write_text("一行目。", encoding="utf-8")
+    yield path
+    shutil.rmtree(temp_dir)
+
+
+def _make_analyzer(on_report, rate_limiter, trigger_engine=None):
+    client = Mock()
+    client.embed = AsyncMock(return_value=[0.1] * 1024)
+    client.aclose = AsyncMock()
+    searcher = Mock()
+    searcher.search_multilevel.return_value = ([], [])
+    integrator = Mock()
+    integrator.integrate.return_value = []
+    report_generator = Mock()
+    report_generator.generate_report_async = AsyncMock(side_effect=["一回目", "二回目"])
+    analyzer = RealtimeAnalyzer(
+        client, searcher, integrator, report_generator,
+        on_report=on_report,
+        rate_limiter=rate_limiter,
+        trigger_engine=trigger_engine
+    )
+    return analyzer, client
+
+
+def test_analyzer_defers_and_keeps_latest_request(diary_file):
+    """AC: 制限中の要求は待機し、同一ファイルの新しい要求が古い待機要求を置き換えること"""
+    reports = []
+    delivered = threading.Event()
+
+    def on_report(file_path, report):
+        reports.append(report)
+        if len(reports) == 2:
+            delivered.set()
+
+    analyzer, client = _make_analyzer(
+        on_report, TriggerRateLimiter(max_per_minute=120, burst=1, file_cooldown_seconds=0)
+    )
+
+    async def submit_all():
+        await analyzer._schedule(str(diary_file))
+        diary_file.write_text("一行目。二行目。", encoding="utf-8")
+        await analyzer._schedule(str(diary_file))
+        diary_file.write_text("一行目。二行目。三行目。", encoding="utf-8")
+        await analyzer._schedule(str(diary_file))
+
+    analyzer.start()
+    try:
+        asyncio.run_coroutine_threadsafe(submit_all(), analyzer._loop).result()
+        assert delivered.wait(timeout=5)
+    finally:
+        analyzer.stop()
+
+    assert reports == ["一回目", "二回目"]
+    assert analyzer.analyses_deferred == 2
+    assert analyzer.analyses_superseded == 1
+    assert analyzer.analyses_cancelled == 0
+    assert [call.kwargs["text"] for call in client.embed.call_args_list] == ["一行目。", "二行目。三行目。"]
+
+
+def test_untriggered_save_does_not_use_a_start_slot(diary_file):
+    """AC: トリガーされなかった保存はレート制限の枠もクールダウンも消費しないこと"""
+    reports = []
+    delivered = threading.Event()
+
+    def on_report(file_path, report):
+        reports.append(report)
+        delivered.set()
+
+    trigger_engine = Mock()
+    trigger_engine.should_trigger_lazy.side_effect = [False, True]
+    limiter = TriggerRateLimiter(max_per_minute=1, burst=1, file_cooldown_seconds=60)
+    analyzer, client = _make_analyzer(on_report, limiter, trigger_engine)
+
+    async def submit_all():
+        await analyzer._schedule(str(diary_file))
+        diary_file.write_text("一行目。二行目。", encoding="utf-8")
+        await analyzer._schedule(str(diary_file))
+
+    analyzer.start()
+    try:
+        asyncio.run_coroutine_threadsafe(submit_all(), analyzer._loop).result()
+        assert delivered.wait(timeout=5)
+    finally:
+        analyzer.stop()
+
+    assert reports == ["一回目"]
+    assert analyzer.analyses_not_triggered == 1
+    assert analyzer.analyses_deferred == 0
+    assert (limiter.acquired, limiter.throttled) == (1, 0)
+    assert [call.kwargs["text"] for call in client.embed.call_args_list] == ["一行目。二行目。"]
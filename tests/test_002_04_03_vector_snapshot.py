@@ -0,0 +1,129 @@
+"""
+Test for Subtask 002-04-03: パフォーマンス最適化 - メモリマップによるベクトルスナップショット
+
+ベクトルをメモリマップ可能な形式で書き出し、ストア全体を読み込まずに検索を開始できること。
+"""
+import os
+import random
+import shutil
+import tempfile
+
+import numpy as np
+import pytest
+
+from src.phase2_realtime_analysis.numpy_vector_index import NumpyVectorIndex
+from src.phase2_realtime_analysis.similarity_searcher import SimilaritySearcher
+
+
+@pytest.fixture
+def snapshot_root():
+    """一時的なスナップショットディレクトリを作成"""
+    temp_dir = tempfile.mkdtemp()
+    yield os.path.join(temp_dir, "snapshot")
+    shutil.rmtree(temp_dir)
+
+
+def _index(count=30, seed=0):
+    rng = random.Random(seed)
+    index = NumpyVectorIndex(dimension=8, initial_capacity=4)
+    index.upsert(
+        [f"id{i}" for i in range(count)],
+        [[rng.uniform(-1, 1) for _ in range(8)] for _ in range(count)],
+        [{"type": "summary" if i % 3 == 0 else "chunk", "file": f"note{i}.md"} for i in range(count)]
+    )
+    return index
+
+
+def test_snapshot_roundtrip_is_memory_mapped(snapshot_root):
+    """AC: スナップショットをメモリマップで開き、元のインデックスと同じ検索結果を返すこと"""
+    index = _index()
+    index.save_snapshot(snapshot_root)
+
+    loaded = NumpyVectorIndex.load_snapshot(snapshot_root)
+    query = [0.5] * 8
+
+    assert isinstance(loaded._vectors, np.memmap)
+    assert len(loaded) == len(index)
+    for level in (None, "summary", "chunk"):
+        assert loaded.search(query, top_k=5, level=level) == index.search(query, top_k=5, level=level)
+
+
+def test_float16_snapshot(snapshot_root):
+    """AC: float16形式で書き出した場合もほぼ同じ検索結果を返すこと"""
+    index = _index()
+    directory = index.save_snapshot(snapshot_root, dtype="float16")
+
+    loaded = NumpyVectorIndex.load_snapshot(snapshot_root)
+    query = [0.5] * 8
+
+    assert np.load(os.path.join(directory, "vectors.npy"), mmap_mode='r').dtype == np.float16
+    expected = index.search(query, top_k=3)
+    actual = loaded.search(query, top_k=3)
+    assert [r["id"] for r in actual] == [r["id"] for r in expected]
+    assert [r["distance"] for r in actual] == pytest.approx([r["distance"] for r in expected], rel=1e-2)
+
+
+def test_float16_snapshot_is_upcast_block_by_block(snapshot_root):
+    """AC: float16スナップショットの検索は行列全体を変換せず、ブロック単位で同じ結果を返すこと"""
+    _index().save_snapshot(snapshot_root, dtype="float16")
+    loaded = NumpyVectorIndex.load_snapshot(snapshot_root)
+    query = np.full(8, 0.5, dtype=np.float32)
+
+    loaded.UPCAST_BLOCK_ROWS = 7
+    products = loaded._products(len(loaded), query)
+
+    assert products.dtype == np.float32
+    np.testing.assert_allclose(products, np.asarray(loaded._vectors, dtype=np.float32) @ query, rtol=1e-6)
+    assert loaded.search(query, top_k=5, level="chunk")[0]["metadata"]["type"] == "chunk"
+
+
+def test_invalid_dtype_is_rejected(snapshot_root):
+    """AC: 未対応の型を指定した場合、ValueErrorとすること"""
+    with pytest.raises(ValueError):
+        _index().save_snapshot(snapshot_root, dtype="int8")
+
+
+def test_new_snapshot_is_swapped_in_atomically(snapshot_root):
+    """AC: 再構築したスナップショットへ切り替えても、開いている旧スナップショットで検索できること"""
+    first = _index(count=10).save_snapshot(snapshot_root)
+    searcher = SimilaritySearcher(None)
+
+    assert searcher.reload_snapshot(snapshot_root) is True
+    old_index = searcher.vector_index
+    second = _index(count=20, seed=1).save_snapshot(snapshot_root)
+
+    assert NumpyVectorIndex.current_snapshot(snapshot_root) == second != first
+    assert searcher.reload_snapshot(snapshot_root) is True
+    assert searcher.reload_snapshot(snapshot_root) is False
+    assert len(searcher.vector_index) == 20
+    assert len(old_index.search([0.1] * 8, top_k=3)) == 3
+    assert len(searcher.search_level2([0.1] * 8)) == 10
+
+
+def test_old_snapshots_are_pruned(snapshot_root):
+    """AC: keep個を超える古いスナップショットを削除すること"""
+    paths = [_index().save_snapshot(snapshot_root, keep=2) for _ in range(3)]
+
+    assert not os.path.exists(paths[0])
+    assert all(os.path.exists(path) for path in paths[1:])
+
+
+def test_writes_after_load_do_not_modify_snapshot(snapshot_root):
+    """AC: 読み込み後の更新はスナップショットファイルを変更しないこと"""
+    _index().save_snapshot(snapshot_root)
+    loaded = NumpyVectorIndex.load_snapshot(snapshot_root)
+
+    loaded.upsert(["id0", "new"], [[9.0] * 8, [8.0] * 8], [{"type": "chunk"}, {"type": "chunk"}])
+    loaded.delete(["id1"])
+
+    reopened = NumpyVectorIndex.load_snapshot(snapshot_root)
+    assert len(reopened) == 30
+    assert reopened.search([9.0] * 8, top_k=1)[0]["id"] != "id0"
+    assert loaded.search([9.0] * 8, top_k=1)[0]["id"] == "id0"
+
+
+def test_missing_snapshot(snapshot_root):
+    """AC: スナップショットがない場合、FileNotFoundErrorとすること"""
+    assert NumpyVectorIndex.current_snapshot(snapshot_root) is None
+    with pytest.raises(FileNotFoundError):
+        NumpyVectorIndex.load_snapshot(snapshot_root)